@@ -1,13 +1,15 @@
 #!/bin/sh
 set -e
 
-# Start embedded Redis for task persistence
+# Start embedded Redis for task persistence. Under memory pressure evict only expiring keys,
+# shortest TTL first: cached responses (minutes) go before task state (an hour), and the
+# response cache's generation counters are never evicted
 mkdir -p "${REDIS_DATA_DIR:-/app/data/redis}"
 redis-server --daemonize yes \
   --dir "${REDIS_DATA_DIR:-/app/data/redis}" \
   --save "60 1" \
   --maxmemory 128mb \
-  --maxmemory-policy allkeys-lru \
+  --maxmemory-policy volatile-ttl \
   --loglevel warning
 
 # Wait for Redis to be ready (max 5s)
@@ -18,4 +20,7 @@ done
 
 export REDIS_URL="${REDIS_URL:-redis://localhost:6379}"
 
-exec uvicorn webapp.main:app --host 0.0.0.0 --port 8000 --proxy-headers --forwarded-allow-ips '*'
+# uvloop + httptools (from uvicorn[standard]) pinned rather than auto-detected; request
+# logging is left to the ingress in front of the container
+exec uvicorn webapp.main:app --host 0.0.0.0 --port 8000 --proxy-headers --forwarded-allow-ips '*' \
+  --loop uvloop --http httptools --no-access-log --no-server-header
@@ -24,6 +24,14 @@ function sleep(ms: number): Promise<void> {
   return new Promise((resolve) => setTimeout(resolve, ms));
 }
 
+/** Open a WebSocket to an API path; the token rides in the query string since browsers can't set headers. */
+export function apiWebSocket(path: string): WebSocket {
+  const token = localStorage.getItem('token') ?? '';
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+  const sep = path.includes('?') ? '&' : '?';
+  return new WebSocket(`${protocol}//${window.location.host}${API_BASE}${path}${sep}token=${encodeURIComponent(token)}`);
+}
+
 export async function apiFetch<T>(path: string, options: ApiFetchOptions = {}): Promise<T> {
   const token = localStorage.getItem('token');
   const headers: Record<string, string> = { ...(options.headers as Record<string, string>) };
@@ -1,8 +1,9 @@
 import { useState, useEffect, useRef, useCallback } from 'react';
-import { apiFetch } from '../api';
+import { apiFetch, apiWebSocket } from '../api';
 import { TaskStatusResponse } from '../types';
 
 const TASK_TIMEOUT_MS = 15 * 60 * 1000; // 15 minutes
+const POLL_INTERVAL_MS = 2000; // fallback when the status socket is unavailable
 
 interface TaskProgressProps {
   taskId: string | null;
@@ -14,6 +15,7 @@ export default function TaskProgress({ taskId, onComplete, onError }: TaskProgre
   const [status, setStatus] = useState<TaskStatusResponse | null>(null);
   const [pollCount, setPollCount] = useState(0);
   const intervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
+  const socketRef = useRef<WebSocket | null>(null);
   const timeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const onCompleteRef = useRef(onComplete);
   const onErrorRef = useRef(onError);
@@ -22,6 +24,11 @@ export default function TaskProgress({ taskId, onComplete, onError }: TaskProgre
   onErrorRef.current = onError;
 
   const cleanup = useCallback(() => {
+    if (socketRef.current) {
+      socketRef.current.onclose = null;
+      socketRef.current.close();
+      socketRef.current = null;
+    }
     if (intervalRef.current) {
       clearInterval(intervalRef.current);
       intervalRef.current = null;
@@ -35,32 +42,50 @@ export default function TaskProgress({ taskId, onComplete, onError }: TaskProgre
   useEffect(() => {
     if (!taskId) return;
 
+    const handleStatus = (data: TaskStatusResponse) => {
+      setStatus(data);
+      setPollCount((c) => c + 1);
+
+      if (data.status === 'completed') {
+        cleanup();
+        const result = data.result as Record<string, unknown> | null;
+        if (result?.status === 'failed') {
+          onErrorRef.current?.((result.error as string) || 'Task failed');
+        } else {
+          onCompleteRef.current?.(result ?? {});
+        }
+      } else if (data.status === 'failed') {
+        cleanup();
+        onErrorRef.current?.(data.message ?? 'Task failed');
+      }
+    };
+
     const poll = async () => {
       try {
-        const data: TaskStatusResponse = await apiFetch(`/stories/tasks/${taskId}`);
-        setStatus(data);
-        setPollCount((c) => c + 1);
-
-        if (data.status === 'completed') {
-          cleanup();
-          const result = data.result as Record<string, unknown> | null;
-          if (result?.status === 'failed') {
-            onErrorRef.current?.((result.error as string) || 'Task failed');
-          } else {
-            onCompleteRef.current?.(result ?? {});
-          }
-        } else if (data.status === 'failed') {
-          cleanup();
-          onErrorRef.current?.(data.message ?? 'Task failed');
-        }
+        handleStatus(await apiFetch<TaskStatusResponse>(`/stories/tasks/${taskId}`));
       } catch (err) {
         cleanup();
         onErrorRef.current?.((err as Error).message);
       }
     };
 
+    const startPolling = () => {
+      if (!intervalRef.current) intervalRef.current = setInterval(poll, POLL_INTERVAL_MS);
+    };
+
+    // Fetch the current state once, then let the server push each update
     poll();
-    intervalRef.current = setInterval(poll, 2000);
+    try {
+      const socket = apiWebSocket(`/stories/tasks/${taskId}/ws`);
+      socketRef.current = socket;
+      socket.onmessage = (event) => handleStatus(JSON.parse(event.data) as TaskStatusResponse);
+      socket.onclose = (event) => {
+        socketRef.current = null;
+        if (event.code !== 1000) startPolling();
+      };
+    } catch {
+      startPolling();
+    }
 
     timeoutRef.current = setTimeout(() => {
       cleanup();
@@ -5,6 +5,7 @@ Bookmark API endpoints.
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from webapp.models.database import Bookmark, User, get_db
@@ -23,14 +24,14 @@ async def toggle_bookmark(
     db: Session = Depends(get_db),
 ) -> BookmarkResponse:
     """Toggle bookmark on a public or link-only story."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only"):
-        story = None
-
+    story = _get_story_by_identifier(db, story_id, visibilities=("public", "link_only"))
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    existing = db.query(Bookmark).filter(Bookmark.story_id == story.id, Bookmark.user_id == current_user.id).first()
+    story_pk, user_id = story.id, current_user.id
+    existing = db.scalars(
+        lambda_stmt(lambda: select(Bookmark).where(Bookmark.story_id == story_pk, Bookmark.user_id == user_id))
+    ).first()
 
     if existing:
         db.delete(existing)
@@ -4,13 +4,18 @@ Follow system API endpoints — follow/unfollow, followers list, timeline feed,
 
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Sequence
 from datetime import UTC, datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import and_, func, lambda_stmt, or_, select
+from sqlalchemy.orm import InstrumentedAttribute, Session, joinedload, raiseload
+from sqlalchemy.sql.expression import Exists
 
-from webapp.models.database import Block, Follow, Story, User, World, get_db
+from webapp.models.database import Block, Chapter, Follow, Story, User, World, get_db
 from webapp.models.schemas import (
     FollowResponse,
     FollowUserItem,
@@ -22,30 +27,49 @@ from webapp.models.schemas import (
     WorldListItem,
 )
 from webapp.services.auth import get_current_user
+from webapp.services.pagination import decode_cursor, page_headers, reject_skip, seek
+
+from .worlds import _STORY_COUNT
 
 router = APIRouter(prefix="/api/follows", tags=["Follows"])
 
+# Hot feed endpoints serialize straight to JSON bytes via pydantic-core
+_TIMELINE_STORY_LIST = TypeAdapter(list[TimelineStoryItem])
+_TIMELINE_WORLD_LIST = TypeAdapter(list[TimelineWorldItem])
+_PUBLIC_STORY_LIST = TypeAdapter(list[PublicStoryListItem])
+
+
+def _json_response(adapter: TypeAdapter[Any], items: list[Any], headers: dict[str, str] | None = None) -> Response:
+    """Render items as a JSON response without going through FastAPI's encoder."""
+    return Response(content=adapter.dump_json(items), media_type="application/json", headers=headers)
+
 
 def is_following(db: Session, follower_id: int, following_id: int) -> bool:
     """Check whether follower_id follows following_id."""
-    return (
-        db.query(Follow).filter(Follow.follower_id == follower_id, Follow.following_id == following_id).first()
-        is not None
-    )
+    return bool(db.scalar(select(_follow_exists(follower_id, following_id))))
+
+
+def _follow_exists(follower_id: int, following_id: int | InstrumentedAttribute[Any]) -> Exists:
+    """Return an EXISTS clause that is true when follower_id follows following_id."""
+    return select(Follow.id).where(Follow.follower_id == follower_id, Follow.following_id == following_id).exists()
 
 
 def is_blocked(db: Session, user_a: int, user_b: int) -> bool:
     """Check whether a block exists in either direction between two users."""
+    return bool(db.scalar(select(_block_exists(user_a, user_b))))
+
+
+def _block_exists(user_a: int | InstrumentedAttribute[Any], user_b: int | InstrumentedAttribute[Any]) -> Exists:
+    """Return an EXISTS clause that is true when a block exists in either direction between two users."""
     return (
-        db.query(Block)
-        .filter(
+        select(Block.id)
+        .where(
             or_(
                 (Block.blocker_id == user_a) & (Block.blocked_id == user_b),
                 (Block.blocker_id == user_b) & (Block.blocked_id == user_a),
             )
         )
-        .first()
-        is not None
+        .exists()
     )
 
 
@@ -60,6 +84,38 @@ def _blocked_user_ids(db: Session, user_id: int) -> set[int]:
     return ids
 
 
+def _timeline_etag(followed_ids: list[int], cursor: str | None, limit: int, version: Sequence[object]) -> str:
+    """Build a weak ETag for a timeline page from the feed's version key."""
+    key = f"{followed_ids}:{cursor or ''}:{limit}:{version!r}"
+    return f'W/"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def _following_page(db: Session, user_id: int, position: tuple[datetime, int] | None, limit: int) -> list[Follow]:
+    """Return a page of follows made by user_id, newest first, after the keyset position.
+
+    Built with lambda_stmt so the compiled SQL is cached across requests.
+    """
+    stmt = lambda_stmt(lambda: select(Follow).where(Follow.follower_id == user_id))
+    if position:
+        ts, row_id = position
+        stmt += lambda s: s.where(or_(Follow.created_at < ts, and_(Follow.created_at == ts, Follow.id < row_id)))
+    stmt += lambda s: s.order_by(Follow.created_at.desc(), Follow.id.desc()).limit(limit)
+    return list(db.scalars(stmt))
+
+
+def _followers_page(db: Session, user_id: int, position: tuple[datetime, int] | None, limit: int) -> list[Follow]:
+    """Return a page of follows targeting user_id, newest first, after the keyset position.
+
+    Built with lambda_stmt so the compiled SQL is cached across requests.
+    """
+    stmt = lambda_stmt(lambda: select(Follow).where(Follow.following_id == user_id))
+    if position:
+        ts, row_id = position
+        stmt += lambda s: s.where(or_(Follow.created_at < ts, and_(Follow.created_at == ts, Follow.id < row_id)))
+    stmt += lambda s: s.order_by(Follow.created_at.desc(), Follow.id.desc()).limit(limit)
+    return list(db.scalars(stmt))
+
+
 @router.post("/users/{user_id}", response_model=FollowResponse)
 async def toggle_follow(
     user_id: int,
@@ -89,23 +145,18 @@ async def toggle_follow(
     return FollowResponse(following=True)
 
 
-@router.get("/following", response_model=list[FollowUserItem])
+@router.get("/following", response_model=list[FollowUserItem], dependencies=[Depends(reject_skip)])
 async def list_following(
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[FollowUserItem]:
     """List users the current user follows."""
     blocked_ids = _blocked_user_ids(db, current_user.id)
-    follows = (
-        db.query(Follow)
-        .filter(Follow.follower_id == current_user.id)
-        .order_by(Follow.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    follows = _following_page(db, current_user.id, decode_cursor(cursor), limit)
+    response.headers.update(page_headers(follows, limit))
 
     result: list[FollowUserItem] = []
     for f in follows:
@@ -125,23 +176,18 @@ async def list_following(
     return result
 
 
-@router.get("/followers", response_model=list[FollowUserItem])
+@router.get("/followers", response_model=list[FollowUserItem], dependencies=[Depends(reject_skip)])
 async def list_followers(
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[FollowUserItem]:
     """List the current user's followers."""
     blocked_ids = _blocked_user_ids(db, current_user.id)
-    follows = (
-        db.query(Follow)
-        .filter(Follow.following_id == current_user.id)
-        .order_by(Follow.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    follows = _followers_page(db, current_user.id, decode_cursor(cursor), limit)
+    response.headers.update(page_headers(follows, limit))
 
     result: list[FollowUserItem] = []
     for f in follows:
@@ -161,10 +207,11 @@ async def list_followers(
     return result
 
 
-@router.get("/users/{user_id}/followers", response_model=list[FollowUserItem])
+@router.get("/users/{user_id}/followers", response_model=list[FollowUserItem], dependencies=[Depends(reject_skip)])
 async def list_user_followers(
     user_id: int,
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -178,14 +225,8 @@ async def list_user_followers(
         raise HTTPException(status_code=404, detail="User not found")
 
     blocked_ids = _blocked_user_ids(db, current_user.id)
-    follows = (
-        db.query(Follow)
-        .filter(Follow.following_id == user_id)
-        .order_by(Follow.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    follows = _followers_page(db, user_id, decode_cursor(cursor), limit)
+    response.headers.update(page_headers(follows, limit))
 
     result: list[FollowUserItem] = []
     for f in follows:
@@ -205,10 +246,11 @@ async def list_user_followers(
     return result
 
 
-@router.get("/users/{user_id}/following", response_model=list[FollowUserItem])
+@router.get("/users/{user_id}/following", response_model=list[FollowUserItem], dependencies=[Depends(reject_skip)])
 async def list_user_following(
     user_id: int,
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -222,14 +264,8 @@ async def list_user_following(
         raise HTTPException(status_code=404, detail="User not found")
 
     blocked_ids = _blocked_user_ids(db, current_user.id)
-    follows = (
-        db.query(Follow)
-        .filter(Follow.follower_id == user_id)
-        .order_by(Follow.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    follows = _following_page(db, user_id, decode_cursor(cursor), limit)
+    response.headers.update(page_headers(follows, limit))
 
     result: list[FollowUserItem] = []
     for f in follows:
@@ -256,11 +292,14 @@ async def get_new_followers(
 ) -> NewFollowersResponse:
     """Get followers since last_followers_seen_at."""
     blocked_ids = _blocked_user_ids(db, current_user.id)
-    query = db.query(Follow).filter(Follow.following_id == current_user.id)
-    if current_user.last_followers_seen_at:
-        query = query.filter(Follow.created_at > current_user.last_followers_seen_at)
+    user_id = current_user.id
+    seen_at = current_user.last_followers_seen_at
+    stmt = lambda_stmt(lambda: select(Follow).where(Follow.following_id == user_id))
+    if seen_at:
+        stmt += lambda s: s.where(Follow.created_at > seen_at)
+    stmt += lambda s: s.order_by(Follow.created_at.desc())
 
-    new_follows = query.order_by(Follow.created_at.desc()).all()
+    new_follows = list(db.scalars(stmt))
 
     result: list[FollowUserItem] = []
     for f in new_follows:
@@ -292,13 +331,14 @@ async def mark_new_followers_seen(
     return {"status": "ok"}
 
 
-@router.get("/timeline", response_model=list[TimelineStoryItem])
+@router.get("/timeline", response_model=list[TimelineStoryItem], dependencies=[Depends(reject_skip)])
 async def get_timeline(
-    skip: int = 0,
+    request: Request,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[TimelineStoryItem]:
+) -> list[TimelineStoryItem] | Response:
     """Get stories from followed users (public + followers visibility, completed only)."""
     blocked_ids = _blocked_user_ids(db, current_user.id)
     followed_ids = [
@@ -310,20 +350,35 @@ async def get_timeline(
     if not followed_ids:
         return []
 
-    stories = (
-        db.query(Story)
-        .filter(
-            Story.user_id.in_(followed_ids),
-            Story.status == "completed",
-            or_(Story.visibility == "public", Story.visibility == "followers"),
-        )
-        .order_by(Story.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = db.query(Story).filter(
+        Story.user_id.in_(followed_ids),
+        Story.status == "completed",
+        or_(Story.visibility == "public", Story.visibility == "followers"),
     )
 
-    return [
+    position = decode_cursor(cursor)
+
+    # Cheap version probe: answer 304 before loading and serializing the page. Besides the
+    # stories it covers everything the items render from them: world names, chapter counts
+    # and owner names (users carry no updated_at, so their names are part of the key)
+    story_ids = query.with_entities(Story.id).scalar_subquery()
+    version = query.with_entities(
+        func.count(Story.id),
+        func.max(Story.updated_at),
+        select(func.max(World.updated_at))
+        .where(World.id.in_(query.with_entities(Story.world_id).scalar_subquery()))
+        .scalar_subquery(),
+        select(func.count(Chapter.id)).where(Chapter.story_id.in_(story_ids)).scalar_subquery(),
+        select(func.max(Chapter.updated_at)).where(Chapter.story_id.in_(story_ids)).scalar_subquery(),
+    ).one()
+    owner_names = db.query(User.display_name, User.username).filter(User.id.in_(followed_ids)).order_by(User.id).all()
+    etag = _timeline_etag(sorted(followed_ids), cursor, limit, (*version, *owner_names))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    stories = seek(query, Story, position).limit(limit).all()
+
+    items = [
         TimelineStoryItem(
             id=s.slug,
             title=s.title,
@@ -342,61 +397,56 @@ async def get_timeline(
         )
         for s in stories
     ]
+    return _json_response(_TIMELINE_STORY_LIST, items, headers={"ETag": etag, **page_headers(stories, limit)})
 
 
-@router.get("/timeline/worlds", response_model=list[TimelineWorldItem])
+@router.get("/timeline/worlds", response_model=list[TimelineWorldItem], dependencies=[Depends(reject_skip)])
 async def get_timeline_worlds(
-    skip: int = 0,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[TimelineWorldItem]:
+) -> list[TimelineWorldItem] | Response:
     """Get worlds from followed users (public + followers visibility)."""
-    blocked_ids = _blocked_user_ids(db, current_user.id)
-    followed_ids = [
-        f.following_id
-        for f in db.query(Follow).filter(Follow.follower_id == current_user.id).all()
-        if f.following_id not in blocked_ids
-    ]
-
-    if not followed_ids:
-        return []
-
-    worlds = (
-        db.query(World)
+    user_id = current_user.id
+    # Follow and block rules are correlated EXISTS clauses on the world's owner, so the
+    # page is one statement: no prefetch of followed or blocked ids, no per-world loads
+    query = (
+        db.query(World, _STORY_COUNT.label("story_count"))
+        .options(joinedload(World.owner).load_only(User.username, User.display_name), raiseload("*"))
         .filter(
-            World.user_id.in_(followed_ids),
-            or_(World.visibility == "public", World.visibility == "followers"),
+            World.visibility.in_(("public", "followers")),
+            _follow_exists(user_id, World.user_id),
+            ~_block_exists(user_id, World.user_id),
         )
-        .order_by(World.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    rows = seek(query, World, decode_cursor(cursor)).limit(limit).all()
+    worlds = [w for w, _ in rows]
 
-    return [
+    items = [
         TimelineWorldItem(
             id=w.id,
             name=w.name,
             description=w.description,
             visibility=w.visibility,
-            story_count=len(w.stories),
+            story_count=story_count,
             owner_name=(w.owner.display_name or w.owner.username) if w.owner else "Unknown",
             owner_id=w.user_id or 0,
             created_at=w.created_at,
         )
-        for w in worlds
+        for w, story_count in rows
     ]
+    return _json_response(_TIMELINE_WORLD_LIST, items, headers=page_headers(worlds, limit))
 
 
-@router.get("/users/{user_id}/stories", response_model=list[PublicStoryListItem])
+@router.get("/users/{user_id}/stories", response_model=list[PublicStoryListItem], dependencies=[Depends(reject_skip)])
 async def list_user_stories(
     user_id: int,
-    skip: int = 0,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[PublicStoryListItem]:
+) -> list[PublicStoryListItem] | Response:
     """List a user's stories with visibility gating."""
     target = db.query(User).filter(User.id == user_id).first()
     if not target:
@@ -407,20 +457,19 @@ async def list_user_stories(
 
     query = db.query(Story).filter(Story.user_id == user_id)
 
-    if user_id == current_user.id:
-        # Own profile: all stories
-        pass
-    elif is_following(db, current_user.id, user_id):
+    if user_id != current_user.id:
+        # Follow check is inlined as EXISTS so visibility gating costs no extra round trip
         query = query.filter(
             Story.status == "completed",
-            or_(Story.visibility == "public", Story.visibility == "followers"),
+            or_(
+                Story.visibility == "public",
+                and_(Story.visibility == "followers", _follow_exists(current_user.id, user_id)),
+            ),
         )
-    else:
-        query = query.filter(Story.status == "completed", Story.visibility == "public")
 
-    stories = query.order_by(Story.created_at.desc()).offset(skip).limit(limit).all()
+    stories = seek(query, Story, decode_cursor(cursor)).limit(limit).all()
 
-    return [
+    items = [
         PublicStoryListItem(
             id=s.slug,
             title=s.title,
@@ -438,12 +487,14 @@ async def list_user_stories(
         )
         for s in stories
     ]
+    return _json_response(_PUBLIC_STORY_LIST, items, headers=page_headers(stories, limit))
 
 
-@router.get("/users/{user_id}/worlds", response_model=list[WorldListItem])
+@router.get("/users/{user_id}/worlds", response_model=list[WorldListItem], dependencies=[Depends(reject_skip)])
 async def list_user_worlds(
     user_id: int,
-    skip: int = 0,
+    response: Response,
+    cursor: str | None = None,
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -458,15 +509,16 @@ async def list_user_worlds(
 
     query = db.query(World).filter(World.user_id == user_id)
 
-    if user_id == current_user.id:
-        # Own profile: all worlds
-        pass
-    elif is_following(db, current_user.id, user_id):
-        query = query.filter(or_(World.visibility == "public", World.visibility == "followers"))
-    else:
-        query = query.filter(World.visibility == "public")
-
-    worlds = query.order_by(World.created_at.desc()).offset(skip).limit(limit).all()
+    if user_id != current_user.id:
+        query = query.filter(
+            or_(
+                World.visibility == "public",
+                and_(World.visibility == "followers", _follow_exists(current_user.id, user_id)),
+            )
+        )
+
+    worlds = seek(query, World, decode_cursor(cursor)).limit(limit).all()
+    response.headers.update(page_headers(worlds, limit))
 
     return [
         WorldListItem(
@@ -11,6 +11,8 @@ from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import RedirectResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -23,11 +25,52 @@ from webapp.models.database import User, get_db
 from webapp.services.auth import create_access_token
 from webapp.services.oauth import oauth
 
-router = APIRouter(prefix="/api/auth/oauth", tags=["oauth"])
+# Mounted as a sub-application at PREFIX (see main.py), so the routes themselves are unprefixed
+PREFIX = "/api/auth/oauth"
+router = APIRouter(tags=["oauth"])
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
 
+_USERNAME_ATTEMPTS = 3
+
+
+def _pick_username(db: Session, base: str) -> str:
+    """Return *base*, or *base* plus the smallest numeric suffix not already taken."""
+    taken: set[str] = set(db.scalars(select(User.username).where(User.username.startswith(base, autoescape=True))))
+    username = base
+    counter = 1
+    while username in taken:
+        username = f"{base}{counter}"
+        counter += 1
+    return username
+
+
+def _is_username_conflict(exc: IntegrityError) -> bool:
+    """Whether *exc* is a violation of the unique username constraint.
+
+    SQLite names the column ("users.username"), PostgreSQL the index ("ix_users_username").
+    """
+    return "username" in str(exc.orig)
+
+
+def _create_oauth_user(db: Session, provider: str, oauth_id: str, email: str, name: str | None) -> User:
+    """Insert a new OAuth user with a free username derived from the email."""
+    username = _pick_username(db, email.split("@", maxsplit=1)[0])
+    user = User(
+        email=email,
+        username=username,
+        display_name=name or username,
+        hashed_password=None,
+        oauth_provider=provider,
+        oauth_id=oauth_id,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 def _get_or_create_oauth_user(
     db: Session,
     provider: str,
@@ -36,8 +79,12 @@ def _get_or_create_oauth_user(
     name: str | None,
 ) -> User | None:
     """Find existing OAuth user, link to email match, or create new user."""
+    # Match by (provider, oauth_id) and by email in a single query (0-2 rows)
+    oauth_match = and_(User.oauth_provider == provider, User.oauth_id == oauth_id)
+    candidates = db.query(User).filter(or_(oauth_match, User.email == email) if email else oauth_match).all()
+
     # 1. Match by (provider, oauth_id)
-    user = db.query(User).filter(User.oauth_provider == provider, User.oauth_id == oauth_id).first()
+    user = next((u for u in candidates if u.oauth_provider == provider and u.oauth_id == oauth_id), None)
     if user:
         return user
 
@@ -45,7 +92,7 @@ def _get_or_create_oauth_user(
         return None
 
     # 2. Match by email — link OAuth identity to existing account
-    user = db.query(User).filter(User.email == email).first()
+    user = next((u for u in candidates if u.email == email), None)
     if user:
         user.oauth_provider = provider
         user.oauth_id = oauth_id
@@ -54,27 +101,16 @@ def _get_or_create_oauth_user(
         db.commit()
         return user
 
-    # 3. No match — create new user
-    username = email.split("@")[0]
-    # Ensure unique username
-    base_username = username
-    counter = 1
-    while db.query(User).filter(User.username == username).first():
-        username = f"{base_username}{counter}"
-        counter += 1
-
-    user = User(
-        email=email,
-        username=username,
-        display_name=name or username,
-        hashed_password=None,
-        oauth_provider=provider,
-        oauth_id=oauth_id,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    # 3. No match — create new user, retrying if a concurrent signup grabs the username
+    for _ in range(_USERNAME_ATTEMPTS - 1):
+        try:
+            return _create_oauth_user(db, provider, oauth_id, email, name)
+        except IntegrityError as exc:
+            db.rollback()
+            # Any other conflict (e.g. the same email signing up twice) won't clear on retry
+            if not _is_username_conflict(exc):
+                raise
+    return _create_oauth_user(db, provider, oauth_id, email, name)
 
 
 def _redirect_with_token(user: User, db: Session) -> RedirectResponse:
@@ -4,21 +4,19 @@ Public (unauthenticated) API endpoints for shared stories.
 
 from __future__ import annotations
 
-import json
-import os
-import subprocess
-import tempfile
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import ColumnElement, exists, func, insert, lambda_stmt, literal, or_, select
+from sqlalchemy.orm import Session, joinedload, load_only
 
+from webapp.middleware.etag import not_modified, version_etag
 from webapp.models.database import (
     FREE_STORIES_PER_USER,
-    Block,
     Bookmark,
     Chapter,
-    Follow,
     PlatformBudget,
     Story,
     User,
@@ -28,6 +26,7 @@ from webapp.models.database import (
 )
 from webapp.models.schemas import (
     BudgetStatus,
+    ChapterResponse,
     PublicStoryListItem,
     PublicStoryResponse,
     StoryResponse,
@@ -35,30 +34,110 @@ from webapp.models.schemas import (
     WorldResponse,
 )
 from webapp.services.auth import get_current_user, get_current_user_optional
+from webapp.services.combined_audio import combined_audio_response
 from webapp.services.mnemonic import generate as generate_mnemonic
+from webapp.services.response_cache import PUBLIC_PREFIX, get_response_cache
 from webapp.services.storage import get_storage
 
-from .stories import _get_story_by_identifier
+from .follows import is_blocked, is_following
+from .stories import _CHAPTER_COUNT, _CHAPTER_SUMMARIES, _get_story_by_identifier, _get_story_ref
+from .worlds import _STORY_COUNT
 
 router = APIRouter(prefix="/api/public", tags=["Public"])
 
+# Visibilities reachable through the public endpoints (followers also requires a follow)
+_VIEWABLE = ("public", "link_only", "followers")
+_LINK_VISIBLE = ("public", "link_only")
+
+# Response cache TTLs (seconds) — writes that change public content also invalidate
+_BUDGET_TTL = 5
+_LIST_TTL = 30
+_DETAIL_TTL = 60
+_WORLDS_TTL = 600  # Built-in worlds are static; world and story writes invalidate
+
+# Browser/CDN freshness — anything carrying viewer state or followers-only content stays private
+_PUBLIC_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=300"
+_BUDGET_CACHE_CONTROL = "public, max-age=5"
+_WORLDS_CACHE_CONTROL = "public, max-age=300"
+_PRIVATE_CACHE_CONTROL = "private, no-cache"
+# Bodies that differ for signed-in viewers must not be reused across Authorization headers
+_VARY_AUTH = {"Vary": "Authorization"}
+
+_PUBLIC_STORY_LIST = TypeAdapter(list[PublicStoryListItem])
+_WORLD_LIST = TypeAdapter(list[WorldListItem])
+
+
+def _cached_response(key: str | None, headers: dict[str, str]) -> Response | None:
+    """Return the cached JSON body for key as a response, or None on a miss."""
+    body = get_response_cache().get(key) if key else None
+    return Response(content=body, media_type="application/json", headers=headers) if body is not None else None
+
+
+def _cache_and_respond(key: str | None, body: bytes, ttl: int, headers: dict[str, str]) -> Response:
+    """Cache a serialized JSON body under key (when given) and return it as a response."""
+    if key:
+        get_response_cache().set(key, body, ttl)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _get_chapter(db: Session, story_pk: int, chapter_number: int) -> Chapter | None:
+    """Fetch one chapter directly instead of loading the story's whole chapter list."""
+    return db.scalars(
+        lambda_stmt(
+            lambda: select(Chapter).where(Chapter.story_id == story_pk, Chapter.chapter_number == chapter_number)
+        )
+    ).first()
+
+
+def _resolve_story(
+    db: Session, where: ColumnElement[bool], current_user: User | None
+) -> tuple[Story, str | None, bool] | None:
+    """Load the story matching where, plus the viewer's vote type and bookmark flag, in one query.
+
+    Shared by the slug and share-code detail endpoints. Anonymous viewers skip the viewer columns.
+    """
+    stmt = select(Story).where(where).options(joinedload(Story.owner), _CHAPTER_SUMMARIES)
+    if current_user is None:
+        story = db.scalars(stmt).first()
+        return (story, None, False) if story else None
+
+    user_id = current_user.id
+    vote_type = (
+        select(Vote.vote_type)
+        .where(Vote.story_id == Story.id, Vote.user_id == user_id)
+        .correlate(Story)
+        .scalar_subquery()
+        .label("vote_type")
+    )
+    bookmarked = exists().where(Bookmark.story_id == Story.id, Bookmark.user_id == user_id).correlate(Story)
+    row = db.execute(stmt.add_columns(vote_type, bookmarked.label("bookmarked"))).first()
+    return (row[0], row.vote_type, bool(row.bookmarked)) if row else None
+
 
 @router.get("/budget", response_model=BudgetStatus)
-async def get_budget_status(db: Session = Depends(get_db)) -> BudgetStatus:
+async def get_budget_status(db: Session = Depends(get_db)) -> BudgetStatus | Response:
     """Get platform free-tier budget status (public, unauthenticated)."""
+    cache_key = f"{PUBLIC_PREFIX}budget"
+    if cached := _cached_response(cache_key, {"Cache-Control": _BUDGET_CACHE_CONTROL}):
+        return cached
+
     budget = db.query(PlatformBudget).first()
     if not budget:
-        return BudgetStatus(
+        status = BudgetStatus(
             total_budget=50.0,
             total_spent=0.0,
             free_stories_generated=0,
             free_stories_per_user=FREE_STORIES_PER_USER,
         )
-    return BudgetStatus(
-        total_budget=budget.total_budget,
-        total_spent=round(budget.total_spent, 2),
-        free_stories_generated=budget.free_stories_generated,
-        free_stories_per_user=FREE_STORIES_PER_USER,
+    else:
+        status = BudgetStatus(
+            total_budget=budget.total_budget,
+            total_spent=round(budget.total_spent, 2),
+            free_stories_generated=budget.free_stories_generated,
+            free_stories_per_user=FREE_STORIES_PER_USER,
+        )
+    return _cache_and_respond(
+        cache_key, status.model_dump_json().encode(), _BUDGET_TTL, {"Cache-Control": _BUDGET_CACHE_CONTROL}
     )
 
 
@@ -68,19 +147,39 @@ async def list_public_stories(
     limit: int = 20,
     language: str | None = None,
     db: Session = Depends(get_db),
-) -> list[PublicStoryListItem]:
+) -> list[PublicStoryListItem] | Response:
     """List all public completed stories, ordered by net score."""
-    query = db.query(Story).filter(Story.visibility == "public", Story.status == "completed")
+    cache_key = f"{PUBLIC_PREFIX}stories:{skip}:{limit}:{language or ''}"
+    if cached := _cached_response(cache_key, {"Cache-Control": _PUBLIC_CACHE_CONTROL}):
+        return cached
+
+    query = (
+        db.query(Story, _CHAPTER_COUNT.label("chapter_count"))
+        .options(
+            # Only the columns a list item shows — skips prompt/config_json and other large TEXT
+            load_only(
+                Story.slug,
+                Story.title,
+                Story.description,
+                Story.language,
+                Story.language_level,
+                Story.world_id,
+                Story.status,
+                Story.upvotes,
+                Story.downvotes,
+                Story.created_at,
+                Story.user_id,
+            ),
+            joinedload(Story.owner).load_only(User.username, User.display_name),
+            joinedload(Story.world).load_only(World.name),
+        )
+        .filter(Story.visibility == "public", Story.status == "completed")
+    )
     if language:
         query = query.filter(Story.language == language)
-    stories = (
-        query.order_by((Story.upvotes - Story.downvotes).desc(), Story.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    rows = query.order_by(Story.net_score.desc(), Story.created_at.desc()).offset(skip).limit(limit).all()
 
-    return [
+    items = [
         PublicStoryListItem(
             id=s.slug,
             title=s.title,
@@ -90,70 +189,47 @@ async def list_public_stories(
             world_id=s.world_id,
             world_name=s.world.name if s.world else None,
             status=s.status,
-            chapter_count=len(s.chapters),
+            chapter_count=chapter_count,
             upvotes=s.upvotes,
             downvotes=s.downvotes,
             created_at=s.created_at,
             owner_name=s.owner.display_name or s.owner.username,
             owner_id=s.user_id,
         )
-        for s in stories
+        for s, chapter_count in rows
     ]
+    return _cache_and_respond(
+        cache_key, _PUBLIC_STORY_LIST.dump_json(items), _LIST_TTL, {"Cache-Control": _PUBLIC_CACHE_CONTROL}
+    )
 
 
-@router.get("/stories/{story_id}", response_model=PublicStoryResponse)
-async def get_public_story(
-    story_id: str,
-    db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_current_user_optional),
-) -> PublicStoryResponse:
-    """Get a public, link-only, or followers-visible story with its chapters."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only", "followers"):
-        story = None
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
-    # Block enforcement: hide story if viewer and owner have a block relationship
-    if current_user and current_user.id != story.user_id:
-        block_exists = (
-            db.query(Block)
-            .filter(
-                ((Block.blocker_id == current_user.id) & (Block.blocked_id == story.user_id))
-                | ((Block.blocker_id == story.user_id) & (Block.blocked_id == current_user.id))
-            )
-            .first()
-        )
-        if block_exists:
-            raise HTTPException(status_code=404, detail="Story not found")
-
-    # Followers-visibility stories require the viewer to be a follower
-    if story.visibility == "followers":
-        if not current_user:
-            raise HTTPException(status_code=404, detail="Story not found")
-        if current_user.id != story.user_id:
-            is_follower = (
-                db.query(Follow)
-                .filter(Follow.follower_id == current_user.id, Follow.following_id == story.user_id)
-                .first()
-                is not None
-            )
-            if not is_follower:
-                raise HTTPException(status_code=404, detail="Story not found")
-
-    user_vote = None
-    is_bookmarked = False
-    if current_user:
-        vote = db.query(Vote).filter(Vote.story_id == story.id, Vote.user_id == current_user.id).first()
-        if vote:
-            user_vote = vote.vote_type
-        is_bookmarked = (
-            db.query(Bookmark).filter(Bookmark.story_id == story.id, Bookmark.user_id == current_user.id).first()
-            is not None
-        )
-
-    return PublicStoryResponse(
+def _story_detail_response(
+    request: Request,
+    story: Story,
+    user_vote: str | None,
+    is_bookmarked: bool,
+    current_user: User | None,
+    cache_key: str | None,
+) -> Response:
+    """Render a visible story as PublicStoryResponse, answering 304 when the client's copy is current."""
+    owner_name = story.owner.display_name or story.owner.username
+    etag = version_etag(
+        story.id,
+        story.updated_at,
+        max((c.updated_at for c in story.chapters if c.updated_at), default=""),
+        owner_name,
+        current_user.id if current_user else "",
+        user_vote or "",
+        is_bookmarked,
+    )
+    # Signed-in bodies carry the viewer's vote/bookmark, so they must not land in a shared cache
+    cache_control = _PUBLIC_CACHE_CONTROL if current_user is None else _PRIVATE_CACHE_CONTROL
+    headers = {"ETag": etag, "Cache-Control": cache_control, **_VARY_AUTH}
+    if unchanged := not_modified(request, headers):
+        return unchanged
+
+    # Every field comes straight from typed ORM columns, so top-level validation is skipped
+    response = PublicStoryResponse.model_construct(
         id=story.slug,
         title=story.title,
         description=story.description,
@@ -168,61 +244,65 @@ async def get_public_story(
         user_vote=user_vote,
         is_bookmarked=is_bookmarked,
         created_at=story.created_at,
-        chapters=story.chapters,
-        owner_name=story.owner.display_name or story.owner.username,
+        chapters=[ChapterResponse.model_validate(c) for c in story.chapters],
+        owner_name=owner_name,
         owner_id=story.user_id,
     )
+    return _cache_and_respond(cache_key, response.model_dump_json().encode(), _DETAIL_TTL, headers)
+
+
+@router.get("/stories/{story_id}", response_model=PublicStoryResponse)
+async def get_public_story(
+    story_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User | None = Depends(get_current_user_optional),
+) -> PublicStoryResponse | Response:
+    """Get a public, link-only, or followers-visible story with its chapters."""
+    # Only anonymous views are cached — signed-in responses carry the viewer's vote/bookmark
+    cache_key = f"{PUBLIC_PREFIX}story:{story_id}" if current_user is None else None
+    if cached := _cached_response(cache_key, {"Cache-Control": _PUBLIC_CACHE_CONTROL, **_VARY_AUTH}):
+        return cached
+
+    resolved = _resolve_story(
+        db, ((Story.slug == story_id) | (Story.public_id == story_id)) & Story.visibility.in_(_VIEWABLE), current_user
+    )
+    if not resolved:
+        raise HTTPException(status_code=404, detail="Story not found")
+    story, user_vote, is_bookmarked = resolved
+
+    # Block enforcement: hide story if viewer and owner have a block relationship
+    if current_user and current_user.id != story.user_id and is_blocked(db, current_user.id, story.user_id):
+        raise HTTPException(status_code=404, detail="Story not found")
+
+    # Followers-visibility stories require the viewer to be a follower
+    if story.visibility == "followers":
+        if not current_user:
+            raise HTTPException(status_code=404, detail="Story not found")
+        if current_user.id != story.user_id and not is_following(db, current_user.id, story.user_id):
+            raise HTTPException(status_code=404, detail="Story not found")
+
+    return _story_detail_response(request, story, user_vote, is_bookmarked, current_user, cache_key)
 
 
 @router.get("/share/{share_code}", response_model=PublicStoryResponse)
 async def get_shared_story(
     share_code: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> PublicStoryResponse:
+) -> PublicStoryResponse | Response:
     """Get a story by its share code (link-only or public)."""
-    story = (
-        db.query(Story)
-        .filter(
-            Story.share_code == share_code,
-            Story.visibility.in_(["public", "link_only"]),
-        )
-        .first()
-    )
+    cache_key = f"{PUBLIC_PREFIX}share:{share_code}" if current_user is None else None
+    if cached := _cached_response(cache_key, {"Cache-Control": _PUBLIC_CACHE_CONTROL, **_VARY_AUTH}):
+        return cached
 
-    if not story:
+    resolved = _resolve_story(db, (Story.share_code == share_code) & Story.visibility.in_(_LINK_VISIBLE), current_user)
+    if not resolved:
         raise HTTPException(status_code=404, detail="Story not found")
+    story, user_vote, is_bookmarked = resolved
 
-    user_vote = None
-    is_bookmarked = False
-    if current_user:
-        vote = db.query(Vote).filter(Vote.story_id == story.id, Vote.user_id == current_user.id).first()
-        if vote:
-            user_vote = vote.vote_type
-        is_bookmarked = (
-            db.query(Bookmark).filter(Bookmark.story_id == story.id, Bookmark.user_id == current_user.id).first()
-            is not None
-        )
-
-    return PublicStoryResponse(
-        id=story.slug,
-        title=story.title,
-        description=story.description,
-        prompt=story.prompt,
-        language=story.language,
-        language_level=story.language_level or 3,
-        status=story.status,
-        visibility=story.visibility,
-        share_code=story.share_code,
-        upvotes=story.upvotes,
-        downvotes=story.downvotes,
-        user_vote=user_vote,
-        is_bookmarked=is_bookmarked,
-        created_at=story.created_at,
-        chapters=story.chapters,
-        owner_name=story.owner.display_name or story.owner.username,
-        owner_id=story.user_id,
-    )
+    return _story_detail_response(request, story, user_vote, is_bookmarked, current_user, cache_key)
 
 
 @router.post("/stories/{story_id}/fork", response_model=StoryResponse, status_code=201)
@@ -232,10 +312,7 @@ async def fork_story(
     current_user: User = Depends(get_current_user),
 ) -> StoryResponse:
     """Fork a public/link-only story into the current user's collection."""
-    source = _get_story_by_identifier(db, story_id)
-    if source and source.visibility not in ("public", "link_only"):
-        source = None
-
+    source = _get_story_by_identifier(db, story_id, visibilities=_LINK_VISIBLE)
     if not source:
         raise HTTPException(status_code=404, detail="Story not found")
 
@@ -260,23 +337,44 @@ async def fork_story(
     db.add(new_story)
     db.flush()
 
-    for src_ch in sorted(source.chapters, key=lambda c: c.chapter_number):
-        new_ch = Chapter(
-            story_id=new_story.id,
-            chapter_number=src_ch.chapter_number,
-            title=src_ch.title,
-            script_json=src_ch.script_json,
-            enhanced_json=src_ch.enhanced_json,
-            status="completed",
-            audio_path=None,
-            audio_duration=None,
+    # Copy chapters with one INSERT ... SELECT — the source chapters are never loaded into Python,
+    # and RETURNING hands back the new rows so the response needs no follow-up SELECT.
+    # from_select skips callable column defaults, so the timestamps are set explicitly.
+    now = datetime.now(UTC)
+    chapters = db.scalars(
+        insert(Chapter)
+        .from_select(
+            [
+                "story_id",
+                "chapter_number",
+                "title",
+                "script_json",
+                "enhanced_json",
+                "speakers_json",
+                "status",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                literal(new_story.id),
+                Chapter.chapter_number,
+                Chapter.title,
+                Chapter.script_json,
+                Chapter.enhanced_json,
+                Chapter.speakers_json,
+                literal("completed"),
+                literal(now),
+                literal(now),
+            )
+            .where(Chapter.story_id == source.id)
+            .order_by(Chapter.chapter_number),
         )
-        db.add(new_ch)
-
-    db.commit()
-    db.refresh(new_story)
+        .returning(Chapter)
+    ).all()
 
-    return StoryResponse(
+    # Built before commit: every value is already in memory (flush populated id and timestamps),
+    # whereas commit would expire new_story and force a refresh.
+    response = StoryResponse(
         id=new_story.slug,
         title=new_story.title,
         description=new_story.description,
@@ -284,7 +382,7 @@ async def fork_story(
         language=new_story.language,
         language_level=new_story.language_level or 3,
         world_id=new_story.world_id,
-        world_name=new_story.world.name if new_story.world else None,
+        world_name=source.world.name if source.world else None,
         status=new_story.status,
         visibility=new_story.visibility,
         share_code=new_story.share_code,
@@ -292,42 +390,32 @@ async def fork_story(
         downvotes=new_story.downvotes,
         created_at=new_story.created_at,
         updated_at=new_story.updated_at,
-        chapters=new_story.chapters,
+        chapters=sorted(chapters, key=lambda c: c.chapter_number),
     )
+    db.commit()
+    return response
 
 
 @router.get("/stories/{story_id}/chapters/{chapter_number}/script")
 async def get_public_chapter_script(
     story_id: str,
     chapter_number: int,
+    request: Request,
     enhanced: bool = True,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> list:
+) -> Response:
     """Get the JSON script for a chapter of a public/link-only/followers story."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only", "followers"):
-        story = None
-
+    story = _get_story_ref(db, story_id, _VIEWABLE)
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
     if story.visibility == "followers" and (
-        not current_user
-        or (
-            current_user.id != story.user_id
-            and not db.query(Follow)
-            .filter(Follow.follower_id == current_user.id, Follow.following_id == story.user_id)
-            .first()
-        )
+        not current_user or (current_user.id != story.user_id and not is_following(db, current_user.id, story.user_id))
     ):
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next(
-        (c for c in story.chapters if c.chapter_number == chapter_number),
-        None,
-    )
-
+    chapter = _get_chapter(db, story.id, chapter_number)
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
@@ -336,106 +424,133 @@ async def get_public_chapter_script(
     if not script:
         raise HTTPException(status_code=404, detail="Script not generated yet")
 
-    return json.loads(script)
+    headers = {
+        "ETag": version_etag(chapter.id, chapter.updated_at, enhanced),
+        "Cache-Control": _PRIVATE_CACHE_CONTROL if story.visibility == "followers" else _PUBLIC_CACHE_CONTROL,
+        **_VARY_AUTH,
+    }
+    if unchanged := not_modified(request, headers):
+        return unchanged
+
+    # Stored column is already serialized JSON — send it as-is instead of parsing and re-encoding
+    return Response(content=script, media_type="application/json", headers=headers)
 
 
 @router.get("/worlds", response_model=list[WorldListItem])
 async def list_public_worlds(
     db: Session = Depends(get_db),
-) -> list[WorldListItem]:
+) -> list[WorldListItem] | Response:
     """List public and built-in worlds."""
-    from sqlalchemy import or_
-
-    worlds = (
-        db.query(World)
+    cache_key = f"{PUBLIC_PREFIX}worlds"
+    if cached := _cached_response(cache_key, {"Cache-Control": _WORLDS_CACHE_CONTROL}):
+        return cached
+
+    rows = (
+        db.query(World, _STORY_COUNT.label("story_count"))
+        .options(
+            # Skips the prompt template and the characters/speakers/voice JSON blobs
+            load_only(World.name, World.description, World.is_builtin, World.visibility, World.created_at),
+            joinedload(World.owner).load_only(User.username, User.display_name),
+        )
         .filter(or_(World.visibility == "public", World.is_builtin.is_(True)))
         .order_by(World.is_builtin.desc(), World.created_at.desc())
         .all()
     )
-    return [
+    items = [
         WorldListItem(
             id=w.id,
             name=w.name,
             description=w.description,
             is_builtin=w.is_builtin,
             visibility=w.visibility,
-            story_count=len(w.stories),
+            story_count=story_count,
             owner_name=(w.owner.display_name or w.owner.username) if w.owner else None,
             created_at=w.created_at,
         )
-        for w in worlds
+        for w, story_count in rows
     ]
+    return _cache_and_respond(
+        cache_key, _WORLD_LIST.dump_json(items), _WORLDS_TTL, {"Cache-Control": _WORLDS_CACHE_CONTROL}
+    )
 
 
-@router.get("/worlds/{world_id}", response_model=WorldResponse)
-async def get_public_world(
-    world_id: int,
-    db: Session = Depends(get_db),
-) -> WorldResponse:
-    """Get a public or built-in world."""
-    from sqlalchemy import or_
-
-    world = (
-        db.query(World)
-        .filter(World.id == world_id, or_(World.visibility == "public", World.is_builtin.is_(True)))
-        .first()
-    )
-    if not world:
-        raise HTTPException(status_code=404, detail="World not found")
+def _world_detail_response(request: Request, db: Session, world: World, cache_key: str) -> Response:
+    """Render a visible world as WorldResponse, answering 304 when the client's copy is current."""
+    story_count = db.scalar(select(func.count(Story.id)).where(Story.world_id == world.id)) or 0
+    owner_name = world.owner.username if world.owner else None
+    headers = {
+        "ETag": version_etag(world.id, world.updated_at, story_count, owner_name),
+        "Cache-Control": _PUBLIC_CACHE_CONTROL,
+    }
+    if unchanged := not_modified(request, headers):
+        return unchanged
 
-    return WorldResponse(
+    response = WorldResponse(
         id=world.id,
         name=world.name,
         description=world.description,
         is_builtin=world.is_builtin,
         prompt_template=world.prompt_template,
-        characters=json.loads(world.characters_json) if world.characters_json else None,
-        valid_speakers=json.loads(world.valid_speakers_json) if world.valid_speakers_json else None,
-        voice_config=json.loads(world.voice_config_json) if world.voice_config_json else None,
+        characters=orjson.loads(world.characters_json) if world.characters_json else None,
+        valid_speakers=orjson.loads(world.valid_speakers_json) if world.valid_speakers_json else None,
+        voice_config=orjson.loads(world.voice_config_json) if world.voice_config_json else None,
         visibility=world.visibility,
         share_code=world.share_code,
-        story_count=len(world.stories),
-        owner_name=world.owner.username if world.owner else None,
+        story_count=story_count,
+        owner_name=owner_name,
         created_at=world.created_at,
         updated_at=world.updated_at,
     )
+    return _cache_and_respond(cache_key, response.model_dump_json().encode(), _DETAIL_TTL, headers)
+
+
+@router.get("/worlds/{world_id}", response_model=WorldResponse)
+async def get_public_world(
+    world_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> WorldResponse | Response:
+    """Get a public or built-in world."""
+    cache_key = f"{PUBLIC_PREFIX}world:{world_id}"
+    if cached := _cached_response(cache_key, {"Cache-Control": _PUBLIC_CACHE_CONTROL}):
+        return cached
+
+    world = db.scalars(
+        lambda_stmt(
+            lambda: select(World).where(
+                World.id == world_id, or_(World.visibility == "public", World.is_builtin.is_(True))
+            )
+        )
+    ).first()
+    if not world:
+        raise HTTPException(status_code=404, detail="World not found")
+
+    return _world_detail_response(request, db, world, cache_key)
 
 
 @router.get("/share/world/{share_code}", response_model=WorldResponse)
 async def get_shared_world(
     share_code: str,
+    request: Request,
     db: Session = Depends(get_db),
-) -> WorldResponse:
+) -> WorldResponse | Response:
     """Get a world by its share code."""
-    from sqlalchemy import or_
-
-    world = (
-        db.query(World)
-        .filter(
-            World.share_code == share_code,
-            or_(World.visibility.in_(["public", "link_only"]), World.is_builtin.is_(True)),
+    cache_key = f"{PUBLIC_PREFIX}share-world:{share_code}"
+    if cached := _cached_response(cache_key, {"Cache-Control": _PUBLIC_CACHE_CONTROL}):
+        return cached
+
+    world = db.scalars(
+        lambda_stmt(
+            lambda: select(World).where(
+                World.share_code == share_code,
+                or_(World.visibility.in_(["public", "link_only"]), World.is_builtin.is_(True)),
+            )
         )
-        .first()
-    )
+    ).first()
     if not world:
         raise HTTPException(status_code=404, detail="World not found")
 
-    return WorldResponse(
-        id=world.id,
-        name=world.name,
-        description=world.description,
-        is_builtin=world.is_builtin,
-        prompt_template=world.prompt_template,
-        characters=json.loads(world.characters_json) if world.characters_json else None,
-        valid_speakers=json.loads(world.valid_speakers_json) if world.valid_speakers_json else None,
-        voice_config=json.loads(world.voice_config_json) if world.voice_config_json else None,
-        visibility=world.visibility,
-        share_code=world.share_code,
-        story_count=len(world.stories),
-        owner_name=world.owner.username if world.owner else None,
-        created_at=world.created_at,
-        updated_at=world.updated_at,
-    )
+    return _world_detail_response(request, db, world, cache_key)
 
 
 @router.get("/stories/{story_id}/chapters/{chapter_number}/audio")
@@ -446,25 +561,16 @@ async def get_public_chapter_audio(
     current_user: User | None = Depends(get_current_user_optional),
 ) -> dict[str, str]:
     """Get a signed URL for a chapter's audio file (public/link-only/followers stories)."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only", "followers"):
-        story = None
-
+    story = _get_story_ref(db, story_id, _VIEWABLE)
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
     if story.visibility == "followers" and (
-        not current_user
-        or (
-            current_user.id != story.user_id
-            and not db.query(Follow)
-            .filter(Follow.follower_id == current_user.id, Follow.following_id == story.user_id)
-            .first()
-        )
+        not current_user or (current_user.id != story.user_id and not is_following(db, current_user.id, story.user_id))
     ):
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    chapter = _get_chapter(db, story.id, chapter_number)
     if not chapter or not chapter.audio_path:
         raise HTTPException(status_code=404, detail="Audio not found")
 
@@ -477,77 +583,24 @@ async def download_public_combined_audio(
     story_id: str,
     db: Session = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
-) -> FileResponse:
+) -> Response:
     """Download combined audio for a public/link-only/followers story."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only", "followers"):
-        story = None
-
+    story = _get_story_ref(db, story_id, _VIEWABLE)
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
     if story.visibility == "followers" and (
-        not current_user
-        or (
-            current_user.id != story.user_id
-            and not db.query(Follow)
-            .filter(Follow.follower_id == current_user.id, Follow.following_id == story.user_id)
-            .first()
-        )
+        not current_user or (current_user.id != story.user_id and not is_following(db, current_user.id, story.user_id))
     ):
         raise HTTPException(status_code=404, detail="Story not found")
 
-    storage = get_storage()
-    chapters_with_audio = sorted(
-        [c for c in story.chapters if c.audio_path],
-        key=lambda c: c.chapter_number,
-    )
+    chapters_with_audio = db.scalars(
+        select(Chapter)
+        .where(Chapter.story_id == story.id, Chapter.audio_path.is_not(None))
+        .order_by(Chapter.chapter_number)
+    ).all()
 
     if not chapters_with_audio:
         raise HTTPException(status_code=404, detail="No audio files available")
 
-    # Use internal integer ID for storage keys
-    int_id = story.id
-    if len(chapters_with_audio) == 1:
-        key = f"{int_id}/ch{chapters_with_audio[0].chapter_number}.mp3"
-        with storage.get_path(key) as single:
-            if not single:
-                raise HTTPException(status_code=404, detail="Audio file not found")
-            return FileResponse(
-                str(single),
-                media_type="audio/mpeg",
-                filename=f"{story.title}.mp3",
-            )
-
-    # Build ffmpeg concat file — use get_path to get local files for each chapter
-    concat_list_path = None
-    output_path = None
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            for ch in chapters_with_audio:
-                key = f"{int_id}/ch{ch.chapter_number}.mp3"
-                with storage.get_path(key) as ch_path:
-                    if ch_path:
-                        f.write(f"file '{ch_path}'\n")
-            concat_list_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            output_path = tmp.name
-
-        result = subprocess.run(  # noqa: S603
-            ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list_path, "-c", "copy", output_path],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if result.returncode != 0:
-            raise HTTPException(status_code=500, detail="Failed to combine audio files")
-
-        return FileResponse(
-            output_path,
-            media_type="audio/mpeg",
-            filename=f"{story.title}.mp3",
-        )
-    finally:
-        if concat_list_path:
-            os.unlink(concat_list_path)
+    return await combined_audio_response(story.id, chapters_with_audio, f"{story.title}.mp3")
@@ -5,13 +5,14 @@ Report API endpoints.
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import exists, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from webapp.models.database import Report, User, get_db
 from webapp.models.schemas import ReportRequest
 from webapp.services.auth import get_current_active_user
 
-from .stories import _get_story_by_identifier
+from .stories import _get_story_ref
 
 router = APIRouter(prefix="/api/reports", tags=["Reports"])
 
@@ -24,10 +25,7 @@ async def report_story(
     db: Session = Depends(get_db),
 ) -> dict[str, str]:
     """Report a story as inappropriate."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only"):
-        story = None
-
+    story = _get_story_ref(db, story_id, ("public", "link_only"))
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
@@ -37,9 +35,12 @@ async def report_story(
     if len(request.reason.strip()) < 10:
         raise HTTPException(status_code=400, detail="Reason must be at least 10 characters")
 
-    existing = db.query(Report).filter(Report.story_id == story.id, Report.user_id == current_user.id).first()
+    story_pk, user_id = story.id, current_user.id
+    already_reported = db.scalar(
+        lambda_stmt(lambda: select(exists().where(Report.story_id == story_pk, Report.user_id == user_id)))
+    )
 
-    if existing:
+    if already_reported:
         raise HTTPException(status_code=400, detail="You have already reported this story")
 
     db.add(
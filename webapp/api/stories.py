@@ -4,19 +4,46 @@ Stories API endpoints.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os
-import subprocess
-import tempfile
+import secrets
 import time
-import uuid
+from collections.abc import Sequence
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Request, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    status,
+)
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import QueryableAttribute, Session, joinedload, load_only, raiseload, selectinload
 
+from webapp.middleware.etag import not_modified, version_etag
 from webapp.models.database import (
     FREE_AUDIO_PER_USER,
     FREE_STORIES_PER_USER,
@@ -26,6 +53,7 @@ from webapp.models.database import (
     User,
     World,
     get_db,
+    upsert_insert,
 )
 from webapp.models.schemas import (
     ChapterResponse,
@@ -38,22 +66,111 @@ from webapp.models.schemas import (
     StoryUpdate,
     TaskStatusResponse,
 )
-from webapp.services.auth import get_current_active_user
+from webapp.services.auth import get_current_active_user, get_user_from_token
+from webapp.services.combined_audio import combined_audio_response
+from webapp.services.config_cache import load_json_cached, load_json_versioned
 from webapp.services.crypto import decrypt_key
-from webapp.services.generation import generate_audio, generate_story
+from webapp.services.generation import generate_audio, generate_story, run_in_generation_pool, script_speakers
 from webapp.services.mnemonic import generate as generate_mnemonic
+from webapp.services.pagination import decode_cursor, page_headers, reject_skip
+from webapp.services.response_cache import invalidate_public_responses
 from webapp.services.storage import get_storage
 from webapp.services.task_store import get_task_backend
 
 router = APIRouter(prefix="/api/stories", tags=["Stories"])
 
+# Near-static per-user config (story defaults, voice list): browsers reuse it briefly, then revalidate
+_STATIC_CONFIG_CACHE_CONTROL = "private, max-age=60"
+# The owner's own stories change under their edits and background generation: always revalidate
+_OWNER_CACHE_CONTROL = "private, no-cache"
+# Task status is polled every second or two; a client may reuse a poll for one tick
+_TASK_STATUS_CACHE_CONTROL = "private, max-age=1"
+# Application close code (4000-4999 range) for watching a task that does not exist
+_WS_TASK_NOT_FOUND = 4404
+
+# Chapter count projected as a scalar subquery so list pages never load the collection
+_CHAPTER_COUNT = select(func.count(Chapter.id)).where(Chapter.story_id == Story.id).correlate(Story).scalar_subquery()
+
+# Chapter rows as ChapterResponse needs them: the script bodies stay in the database,
+# line_audio_json is kept because has_line_audio reads it
+_CHAPTER_SUMMARIES = (
+    selectinload(Story.chapters).defer(Chapter.script_json).defer(Chapter.enhanced_json).defer(Chapter.speakers_json)
+)
 
-def _get_story_by_identifier(db: Session, identifier: str, *, user_id: int | None = None) -> Story | None:
-    """Look up a story by slug or public_id, optionally filtered by owner."""
-    query = db.query(Story).filter((Story.slug == identifier) | (Story.public_id == identifier))
+
+def _get_story_by_identifier(
+    db: Session,
+    identifier: str,
+    *,
+    user_id: int | None = None,
+    visibilities: Sequence[str] | None = None,
+    with_chapters: bool = False,
+) -> Story | None:
+    """Look up a story by slug or public_id, optionally filtered by owner and/or visibility.
+
+    ``with_chapters`` selectin-loads the chapters (without their script bodies) with
+    the story, for callers that walk ``story.chapters``. Built with lambda_stmt so the compiled SQL is cached
+    across requests.
+    """
+    stmt = lambda_stmt(lambda: select(Story).where((Story.slug == identifier) | (Story.public_id == identifier)))
     if user_id is not None:
-        query = query.filter(Story.user_id == user_id)
-    return query.first()
+        stmt += lambda s: s.where(Story.user_id == user_id)
+    if visibilities is not None:
+        stmt += lambda s: s.where(Story.visibility.in_(visibilities))
+    if with_chapters:
+        stmt += lambda s: s.options(_CHAPTER_SUMMARIES)
+    return db.scalars(stmt).first()
+
+
+async def get_owned_story(
+    story_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+) -> Story:
+    """Dependency resolving the ``story_id`` path parameter to a story the current user owns, or 404.
+
+    Handlers that need the user or session as well declare them alongside; FastAPI
+    resolves each dependency once per request, so they share this lookup's.
+    """
+    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
+    if not story:
+        raise HTTPException(status_code=404, detail="Story not found")
+    return story
+
+
+def _get_story_ref(db: Session, identifier: str, visibilities: Sequence[str]) -> Row[Any] | None:
+    """Return (id, user_id, visibility, title) of a story with one of the given visibilities.
+
+    A narrow projection for endpoints that only need to authorize and key off the
+    story, so misses and sub-resource lookups never hydrate a full Story row.
+    """
+    return db.execute(
+        lambda_stmt(
+            lambda: select(Story.id, Story.user_id, Story.visibility, Story.title).where(
+                (Story.slug == identifier) | (Story.public_id == identifier), Story.visibility.in_(visibilities)
+            )
+        )
+    ).first()
+
+
+def _get_owned_chapter(
+    db: Session, identifier: str, user_id: int, chapter_number: int, *only: QueryableAttribute[Any]
+) -> tuple[int, Chapter | None] | None:
+    """Look up an owned story and one of its chapters in a single indexed query.
+
+    Returns None if the user has no such story, otherwise (story pk, chapter or
+    None). ``only`` limits the chapter columns loaded. Built with lambda_stmt so the
+    compiled SQL is cached across requests, one entry per ``only`` column set.
+    """
+    stmt = lambda_stmt(
+        lambda: (
+            select(Story.id, Chapter)
+            .outerjoin(Chapter, (Chapter.story_id == Story.id) & (Chapter.chapter_number == chapter_number))
+            .where((Story.slug == identifier) | (Story.public_id == identifier), Story.user_id == user_id)
+        )
+    )
+    if only:
+        stmt += lambda s: s.options(load_only(*only))
+    row = db.execute(stmt).first()
+    return (row[0], row[1]) if row else None
 
 
 def refresh_audio_urls(chapters: list[Chapter]) -> None:
@@ -65,47 +182,77 @@ def refresh_audio_urls(chapters: list[Chapter]) -> None:
 
 
 @router.get("/defaults")
-async def get_story_defaults(current_user: User = Depends(get_current_active_user)) -> dict:
+async def get_story_defaults(request: Request, current_user: User = Depends(get_current_active_user)) -> Response:
     """Get default story generation config."""
-    config_path = Path(__file__).parent.parent.parent / "story_config.json"
-    if not config_path.exists():
+    loaded = await load_json_versioned(Path(__file__).parent.parent.parent / "story_config.json")
+    if loaded is None:
         raise HTTPException(status_code=404, detail="Config file not found")
-    with open(config_path) as f:
-        config = json.load(f)
-    return {
+    version, config = loaded
+
+    # Versioned by the config file's mtime, so repeat loads are answered before building the body
+    headers = {"ETag": version_etag("defaults", version), "Cache-Control": _STATIC_CONFIG_CACHE_CONTROL}
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    payload = {
         "default_prompt": config.get("default_prompt", ""),
         "characters": config.get("characters", {}),
         "target_language": config.get("target_language", {}),
         "num_chapters": config.get("generation_settings", {}).get("default_chapters", 3),
     }
+    return Response(content=orjson.dumps(payload), media_type="application/json", headers=headers)
 
 
 @router.get("/voices")
-async def get_available_voices(current_user: User = Depends(get_current_active_user)) -> list[dict]:
+async def get_available_voices(request: Request, current_user: User = Depends(get_current_active_user)) -> Response:
     """Fetch available voices from ElevenLabs API (cached, non-blocking)."""
-    from webapp.services.voices_cache import get_voices
+    from webapp.services.voices_cache import cache_version, get_voices
 
     api_key = os.environ.get("ELEVENLABS_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="ElevenLabs API key not configured")
 
-    voices = get_voices()
-    return voices
+    voices = await get_voices()
+    if not voices:
+        # Cold cache with ElevenLabs unreachable — don't let clients hold on to the empty list
+        return Response(content=b"[]", media_type="application/json", headers={"Cache-Control": "no-store"})
+
+    # Versioned by the cache's last refresh
+    headers = {"ETag": version_etag("voices", cache_version()), "Cache-Control": _STATIC_CONFIG_CACHE_CONTROL}
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    return Response(content=orjson.dumps(voices), media_type="application/json", headers=headers)
 
 
-@router.get("/", response_model=list[StoryListResponse])
+@router.get("/", response_model=list[StoryListResponse], dependencies=[Depends(reject_skip)])
 async def list_stories(
-    skip: int = 0, limit: int = 20, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 20,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ) -> list[StoryListResponse]:
-    """List all stories for the current user."""
-    stories = (
-        db.query(Story)
-        .filter(Story.user_id == current_user.id)
-        .order_by(Story.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    """List the current user's stories, newest first.
+
+    Keyset-paginated like the follows lists: a full page sets X-Next-Cursor, which
+    is passed back as ``cursor`` to seek to the next page instead of re-reading
+    and discarding the rows before it. The old offset parameter ``skip`` is rejected
+    rather than ignored, so a client still using it doesn't get page one again.
+    """
+    # Same keyset seek as pagination.seek, as a lambda_stmt so the compiled SQL is cached across requests
+    user_id = current_user.id
+    stmt = lambda_stmt(
+        lambda: (
+            select(Story, _CHAPTER_COUNT.label("chapter_count"))
+            .options(joinedload(Story.world), raiseload("*"))
+            .where(Story.user_id == user_id)
+        )
     )
+    if position := decode_cursor(cursor):
+        ts, row_id = position
+        stmt += lambda s: s.where(or_(Story.created_at < ts, and_(Story.created_at == ts, Story.id < row_id)))
+    stmt += lambda s: s.order_by(Story.created_at.desc(), Story.id.desc()).limit(limit)
+    rows = db.execute(stmt).all()
+    response.headers.update(page_headers([s for s, _ in rows], limit))
 
     return [
         StoryListResponse(
@@ -118,10 +265,10 @@ async def list_stories(
             world_name=s.world.name if s.world else None,
             status=s.status,
             visibility=s.visibility,
-            chapter_count=len(s.chapters),
+            chapter_count=chapter_count,
             created_at=s.created_at,
         )
-        for s in stories
+        for s, chapter_count in rows
     ]
 
 
@@ -130,10 +277,11 @@ async def create_story(
     story: StoryCreate, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
 ) -> StoryResponse:
     """Create a new story (without generating content yet)."""
-    # Validate world_id if provided
+    # Validate world_id if provided — only the name is read, and it doubles as the response's world_name
+    world_name = None
     if story.world_id:
-        world = db.query(World).filter(World.id == story.world_id).first()
-        if not world:
+        world_name = db.scalar(select(World.name).where(World.id == story.world_id))
+        if world_name is None:
             raise HTTPException(status_code=404, detail="World not found")
 
     public_id, slug = generate_mnemonic()
@@ -148,20 +296,26 @@ async def create_story(
         prompt=story.prompt,
         language=story.language,
         language_level=story.language_level,
-        config_json=json.dumps(story.config_override) if story.config_override else None,
+        config_json=orjson.dumps(story.config_override).decode() if story.config_override else None,
         status="created",
     )
     db.add(db_story)
-    db.commit()
-    db.refresh(db_story)
-
-    # Create empty chapters
-    for i in range(1, story.num_chapters + 1):
-        chapter = Chapter(story_id=db_story.id, chapter_number=i, status="pending")
-        db.add(chapter)
-    db.commit()
-    db.refresh(db_story)
+    db.flush()  # Assigns the PK and column defaults without reloading the row
+
+    # Create empty chapters in one INSERT; RETURNING hands back the rows for the response
+    # (in no guaranteed order, hence the sort)
+    chapters = sorted(
+        db.scalars(
+            insert(Chapter).returning(Chapter),
+            [
+                {"story_id": db_story.id, "chapter_number": i, "status": "pending"}
+                for i in range(1, story.num_chapters + 1)
+            ],
+        ),
+        key=lambda ch: ch.chapter_number,
+    )
 
+    # Built from the in-memory objects before commit expires them, so no refresh SELECT is needed
     response = StoryResponse(
         id=db_story.slug,
         title=db_story.title,
@@ -170,7 +324,7 @@ async def create_story(
         language=db_story.language,
         language_level=db_story.language_level or 3,
         world_id=db_story.world_id,
-        world_name=db_story.world.name if db_story.world else None,
+        world_name=world_name,
         status=db_story.status,
         visibility=db_story.visibility,
         share_code=db_story.share_code,
@@ -178,23 +332,71 @@ async def create_story(
         downvotes=db_story.downvotes,
         created_at=db_story.created_at,
         updated_at=db_story.updated_at,
-        chapters=db_story.chapters,
+        chapters=chapters,
     )
+    db.commit()
+    if story.world_id:
+        invalidate_public_responses()  # World story counts changed
     return response
 
 
 # Task routes must be defined before /{story_id} to avoid route conflicts
 @router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_generation_status(
-    task_id: str, current_user: User = Depends(get_current_active_user)
-) -> TaskStatusResponse:
+    task_id: str, request: Request, response: Response, current_user: User = Depends(get_current_active_user)
+) -> TaskStatusResponse | Response:
     """Get status of a generation task."""
     status_info = get_task_backend().get(task_id)
     if not status_info:
         raise HTTPException(status_code=404, detail="Task not found")
+
+    # Polls between progress updates get a bodyless 304
+    headers = {
+        "ETag": version_etag(
+            task_id, status_info["status"], status_info["progress"], status_info["message"], status_info["updated_at"]
+        ),
+        "Cache-Control": _TASK_STATUS_CACHE_CONTROL,
+    }
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    response.headers.update(headers)
     return TaskStatusResponse(**status_info)
 
 
+@router.websocket("/tasks/{task_id}/ws")
+async def watch_generation_status(
+    websocket: WebSocket, task_id: str, token: str = Query(""), db: Session = Depends(get_db)
+) -> None:
+    """Push a generation task's status on connect and after every update, until it finishes.
+
+    Browsers cannot set an Authorization header on a WebSocket, so the access
+    token comes in the ``token`` query parameter.
+    """
+    user = get_user_from_token(db, token)
+    # Release the pooled connection before the long-lived stream
+    db.close()
+    if user is None or not user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    async def push() -> bool:
+        sent = False
+        async for entry in get_task_backend().watch(task_id):
+            await websocket.send_text(TaskStatusResponse(**entry).model_dump_json())
+            sent = True
+        return sent
+
+    # Stop on whichever comes first: the task finishing or the client going away
+    pusher = asyncio.create_task(push())
+    listener = asyncio.create_task(websocket.receive())
+    done, pending = await asyncio.wait({pusher, listener}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    if pusher in done:
+        await websocket.close(code=status.WS_1000_NORMAL_CLOSURE if pusher.result() else _WS_TASK_NOT_FOUND)
+
+
 @router.delete("/tasks/{task_id}")
 async def cancel_generation_task(task_id: str, current_user: User = Depends(get_current_active_user)) -> dict[str, str]:
     """Cancel a running task."""
@@ -210,58 +412,86 @@ async def cancel_generation_task(task_id: str, current_user: User = Depends(get_
 
 @router.get("/{story_id}/voice-config")
 async def get_voice_config(
-    story_id: str,
-    current_user: User = Depends(get_current_active_user),
+    story: Story = Depends(get_owned_story),
     db: Session = Depends(get_db),
-) -> dict:
+) -> Response:
     """Get effective voice config and speakers for a story."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
     # Get voice config from world or disk fallback
     voice_config: dict = {}
     if story.world_id:
-        world = db.query(World).filter(World.id == story.world_id).first()
-        if world and world.voice_config_json:
-            voice_config = json.loads(world.voice_config_json)
+        world_voice_config = db.scalar(select(World.voice_config_json).where(World.id == story.world_id))
+        if world_voice_config:
+            voice_config = orjson.loads(world_voice_config)
 
     if not voice_config:
-        voices_path = Path(os.environ.get("VOICES_CONFIG_PATH", "./data/voices_config.json"))
-        if voices_path.exists():
-            with open(voices_path) as f:
-                raw = json.load(f)
-            # voices_config.json has {"voices": {"SPEAKER": {...}}} or flat format
-            voice_config = raw.get("voices", raw) if isinstance(raw, dict) else {}
-
-    # Extract unique speakers from chapter scripts
-    speakers: list[str] = []
-    seen: set[str] = set()
-    for chapter in sorted(story.chapters, key=lambda c: c.chapter_number):
-        script_json = chapter.enhanced_json or chapter.script_json
-        if not script_json:
-            continue
-        script = json.loads(script_json)
-        for entry in script:
-            speaker = entry.get("speaker")
-            if speaker and speaker not in seen:
-                speakers.append(speaker)
-                seen.add(speaker)
-
-    return {"speakers": speakers, "voice_config": voice_config}
+        raw = await load_json_cached(Path(os.environ.get("VOICES_CONFIG_PATH", "./data/voices_config.json")))
+        # voices_config.json has {"voices": {"SPEAKER": {...}}} or flat format
+        if isinstance(raw, dict):
+            voice_config = raw.get("voices", raw)
+
+    # Union each chapter's stored speaker list, in chapter order. The script itself is only
+    # sent for chapters written before speakers_json existed.
+    rows = db.execute(
+        select(
+            Chapter.speakers_json,
+            case((Chapter.speakers_json.is_(None), func.coalesce(Chapter.enhanced_json, Chapter.script_json))),
+        )
+        .where(Chapter.story_id == story.id)
+        .order_by(Chapter.chapter_number)
+    )
+    speakers: dict[str, None] = {}
+    for speakers_json, script_json in rows:
+        if speakers_json:
+            speakers.update(dict.fromkeys(orjson.loads(speakers_json)))
+        elif script_json:
+            speakers.update(dict.fromkeys(script_speakers(orjson.loads(script_json))))
+
+    # Free-form config with no response model: encode with orjson rather than jsonable_encoder's per-value walk
+    payload = {"speakers": list(speakers), "voice_config": voice_config}
+    return Response(content=orjson.dumps(payload), media_type="application/json")
 
 
 @router.get("/{story_id}", response_model=StoryResponse)
 async def get_story(
-    story_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
-) -> StoryResponse:
+    story_id: str,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+) -> StoryResponse | Response:
     """Get a specific story with all chapters."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
+    user_id = current_user.id
+    # Everything the response reads is loaded here; any other relationship access raises
+    story = db.scalars(
+        lambda_stmt(
+            lambda: (
+                select(Story)
+                .where((Story.slug == story_id) | (Story.public_id == story_id), Story.user_id == user_id)
+                .options(joinedload(Story.world).load_only(World.name), _CHAPTER_SUMMARIES, raiseload("*"))
+            )
+        )
+    ).first()
 
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    response = StoryResponse(
+    # A generating story also reports live task progress, so only settled stories get a version ETag
+    if story.status != "generating":
+        headers = {
+            "ETag": version_etag(
+                story.id,
+                story.updated_at,
+                story.world.name if story.world else "",
+                len(story.chapters),
+                max((c.updated_at for c in story.chapters if c.updated_at), default=""),
+            ),
+            "Cache-Control": _OWNER_CACHE_CONTROL,
+        }
+        if unchanged := not_modified(request, headers):
+            return unchanged
+        response.headers.update(headers)
+
+    story_response = StoryResponse(
         id=story.slug,
         title=story.title,
         description=story.description,
@@ -284,9 +514,9 @@ async def get_story(
     if story.status == "generating":
         active = get_task_backend().find_active_for_story(story.id)
         if active:
-            response.active_task = TaskStatusResponse(**active)
+            story_response.active_task = TaskStatusResponse(**active)
 
-    return response
+    return story_response
 
 
 @router.patch("/{story_id}", response_model=StoryResponse)
@@ -297,25 +527,38 @@ async def update_story(
     db: Session = Depends(get_db),
 ) -> StoryResponse:
     """Update story metadata."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
+    if story_update.visibility is not None and story_update.visibility not in (
+        "private",
+        "link_only",
+        "public",
+        "followers",
+    ):
+        raise HTTPException(status_code=400, detail="Invalid visibility value")
+
+    values: dict[str, Any] = {}
     if story_update.title:
-        story.title = story_update.title
+        values["title"] = story_update.title
     if story_update.description:
-        story.description = story_update.description
+        values["description"] = story_update.description
     if story_update.visibility is not None:
-        if story_update.visibility not in ("private", "link_only", "public", "followers"):
-            raise HTTPException(status_code=400, detail="Invalid visibility value")
-        story.visibility = story_update.visibility
-        if story_update.visibility in ("link_only", "public") and not story.share_code:
-            story.share_code = str(uuid.uuid4())
+        values["visibility"] = story_update.visibility
+        if story_update.visibility in ("link_only", "public"):
+            values["share_code"] = func.coalesce(Story.share_code, secrets.token_urlsafe(16))
+
+    # UPDATE ... RETURNING hands back the written row, so there is no load before
+    # the write and no refresh after it; an empty patch just reads the story
+    stmt = update(Story).values(**values).returning(Story) if values else select(Story)
+    story = db.scalars(
+        stmt.where((Story.slug == story_id) | (Story.public_id == story_id), Story.user_id == current_user.id)
+        .options(selectinload(Story.world).load_only(World.name), _CHAPTER_SUMMARIES)
+        .execution_options(populate_existing=True)
+    ).first()
 
-    db.commit()
-    db.refresh(story)
-    return StoryResponse(
+    if not story:
+        raise HTTPException(status_code=404, detail="Story not found")
+
+    # Built before commit expires the row
+    response = StoryResponse(
         id=story.slug,
         title=story.title,
         description=story.description,
@@ -333,42 +576,36 @@ async def update_story(
         updated_at=story.updated_at,
         chapters=story.chapters,
     )
+    db.commit()
+    invalidate_public_responses()
+    return response
 
 
 @router.post("/{story_id}/generate-share-link", response_model=ShareLinkResponse)
 async def generate_share_link(
-    story_id: str,
     request: Request,
-    current_user: User = Depends(get_current_active_user),
+    story: Story = Depends(get_owned_story),
     db: Session = Depends(get_db),
 ) -> ShareLinkResponse:
     """Generate or return a share link for a story."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
-    if not story.share_code:
-        story.share_code = str(uuid.uuid4())
+    share_code = story.share_code
+    if not share_code:
+        share_code = story.share_code = secrets.token_urlsafe(16)
         db.commit()
-        db.refresh(story)
 
     frontend_url = os.environ.get("FRONTEND_URL", "http://localhost:5173")
-    return ShareLinkResponse(share_code=story.share_code, share_url=f"{frontend_url}/share/{story.share_code}")
+    return ShareLinkResponse(share_code=share_code, share_url=f"{frontend_url}/share/{share_code}")
 
 
 @router.post("/{story_id}/duplicate", response_model=StoryResponse, status_code=201)
 async def duplicate_story(
-    story_id: str,
+    story: Story = Depends(get_owned_story),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> StoryResponse:
     """Duplicate a story the current user owns (copies scripts, no audio)."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
+    has_script: ColumnElement[bool] = Chapter.script_json.is_not(None) | Chapter.enhanced_json.is_not(None)
+    any_script = db.scalar(select(exists().where(Chapter.story_id == story.id, has_script)))
     new_public_id, new_slug = generate_mnemonic()
 
     new_story = Story(
@@ -382,7 +619,7 @@ async def duplicate_story(
         language_level=story.language_level,
         world_id=story.world_id,
         config_json=story.config_json,
-        status="completed" if any(ch.script_json or ch.enhanced_json for ch in story.chapters) else "created",
+        status="completed" if any_script else "created",
         visibility="private",
         upvotes=0,
         downvotes=0,
@@ -390,24 +627,40 @@ async def duplicate_story(
     db.add(new_story)
     db.flush()
 
-    for src_ch in sorted(story.chapters, key=lambda c: c.chapter_number):
-        has_script = src_ch.script_json or src_ch.enhanced_json
-        new_ch = Chapter(
-            story_id=new_story.id,
-            chapter_number=src_ch.chapter_number,
-            title=src_ch.title,
-            script_json=src_ch.script_json,
-            enhanced_json=src_ch.enhanced_json,
-            status="completed" if has_script else "pending",
-            audio_path=None,
-            audio_duration=None,
+    # Copy chapters with one INSERT ... SELECT, as fork_story does — the scripts never pass
+    # through Python. from_select skips callable column defaults, so timestamps are explicit.
+    now = datetime.now(UTC)
+    chapters = db.scalars(
+        insert(Chapter)
+        .from_select(
+            [
+                "story_id",
+                "chapter_number",
+                "title",
+                "script_json",
+                "enhanced_json",
+                "speakers_json",
+                "status",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                literal(new_story.id),
+                Chapter.chapter_number,
+                Chapter.title,
+                Chapter.script_json,
+                Chapter.enhanced_json,
+                Chapter.speakers_json,
+                case((has_script, "completed"), else_="pending"),
+                literal(now),
+                literal(now),
+            ).where(Chapter.story_id == story.id),
         )
-        db.add(new_ch)
+        .returning(Chapter)
+    ).all()
 
-    db.commit()
-    db.refresh(new_story)
-
-    return StoryResponse(
+    # Built before commit, which would expire new_story and force a refresh
+    response = StoryResponse(
         id=new_story.slug,
         title=new_story.title,
         description=new_story.description,
@@ -415,7 +668,7 @@ async def duplicate_story(
         language=new_story.language,
         language_level=new_story.language_level or 3,
         world_id=new_story.world_id,
-        world_name=new_story.world.name if new_story.world else None,
+        world_name=story.world.name if story.world else None,
         status=new_story.status,
         visibility=new_story.visibility,
         share_code=new_story.share_code,
@@ -423,71 +676,71 @@ async def duplicate_story(
         downvotes=new_story.downvotes,
         created_at=new_story.created_at,
         updated_at=new_story.updated_at,
-        chapters=new_story.chapters,
+        chapters=sorted(chapters, key=lambda c: c.chapter_number),
     )
+    db.commit()
+    return response
 
 
 @router.delete("/{story_id}")
-async def delete_story(
-    story_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
-) -> dict[str, str]:
+async def delete_story(story: Story = Depends(get_owned_story), db: Session = Depends(get_db)) -> dict[str, str]:
     """Delete a story and all its chapters."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
     # Delete audio files from storage (uses internal integer ID)
     get_storage().delete_dir(str(story.id))
 
     db.delete(story)
     db.commit()
+    invalidate_public_responses()
     return {"message": "Story deleted"}
 
 
 @router.post("/{story_id}/generate", response_model=TaskStatusResponse)
 async def generate_story_content(
-    story_id: str,
     request: GenerateStoryRequest,
     background_tasks: BackgroundTasks,
+    story: Story = Depends(get_owned_story),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> TaskStatusResponse:
     """Start story script generation (async background task)."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
-    if story.status == "generating":
+    # Claim the story with a conditional UPDATE so only one request can flip it to "generating";
+    # a double-click or retry gets the in-flight task back instead of starting a second run
+    claimed = db.execute(
+        update(Story)
+        .where(Story.id == story.id, Story.status != "generating")
+        .values(status="generating", prompt=request.prompt)
+    ).rowcount
+    if not claimed:
+        if active := get_task_backend().find_active_for_story(story.id, "story"):
+            return TaskStatusResponse(**active)
         raise HTTPException(status_code=400, detail="Story is already being generated")
 
-    # Update story with request data
-    story.prompt = request.prompt
-    story.status = "generating"
-
-    # Reset existing chapters for regeneration and adjust count
-    existing_chapters = sorted(story.chapters, key=lambda c: c.chapter_number)
-
-    for ch in existing_chapters:
-        if ch.chapter_number <= request.num_chapters:
-            ch.script_json = None
-            ch.enhanced_json = None
-            ch.audio_path = None
-            ch.audio_duration = None
-            ch.line_audio_json = None
-            ch.status = "pending"
-        else:
-            db.delete(ch)
+    # Reset existing chapters for regeneration and drop any beyond the new count — one UPDATE
+    # and one DELETE, without loading the chapters
+    db.execute(
+        update(Chapter)
+        .where(Chapter.story_id == story.id, Chapter.chapter_number <= request.num_chapters)
+        .values(
+            script_json=None,
+            enhanced_json=None,
+            speakers_json=None,
+            audio_path=None,
+            audio_duration=None,
+            line_audio_json=None,
+            status="pending",
+        )
+    )
+    db.execute(delete(Chapter).where(Chapter.story_id == story.id, Chapter.chapter_number > request.num_chapters))
 
     # Delete old audio files from storage (uses internal integer ID)
     get_storage().delete_dir(str(story.id))
 
-    # Create any missing chapters if count was increased
-    existing_nums = {ch.chapter_number for ch in existing_chapters}
-    for i in range(1, request.num_chapters + 1):
-        if i not in existing_nums:
-            db.add(Chapter(story_id=story.id, chapter_number=i, status="pending"))
+    # Create any missing chapters if count was increased — existing numbers are skipped by the
+    # (story_id, chapter_number) unique index, so concurrent requests cannot duplicate a chapter
+    db.execute(
+        upsert_insert(db, Chapter).on_conflict_do_nothing(index_elements=["story_id", "chapter_number"]),
+        [{"story_id": story.id, "chapter_number": i, "status": "pending"} for i in range(1, request.num_chapters + 1)],
+    )
 
     db.commit()
 
@@ -522,6 +775,7 @@ async def generate_story_content(
     task_id = f"story_{internal_id}_{int(time.time())}"
     get_task_backend().update(task_id, "pending", 0, "Task queued, waiting to start...")
     background_tasks.add_task(
+        run_in_generation_pool,
         generate_story,
         task_id=task_id,
         story_id=internal_id,
@@ -545,23 +799,38 @@ async def generate_story_audio(
     db: Session = Depends(get_db),
 ) -> TaskStatusResponse:
     """Start audio generation for chapters (async background task)."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
+    # Ownership, chapter selection and the script check in one indexed query; the
+    # script bodies themselves are never loaded here
+    chapter_filter: ColumnElement[bool] = Chapter.story_id == Story.id
+    if request.chapter_numbers:
+        chapter_filter &= Chapter.chapter_number.in_(request.chapter_numbers)
+    rows: Sequence[Row[tuple[int, int | None, int | None, bool]]] = db.execute(
+        select(
+            Story.id,
+            Chapter.id,
+            Chapter.chapter_number,
+            (Chapter.enhanced_json.is_not(None) | Chapter.script_json.is_not(None)).label("has_script"),
+        )
+        .outerjoin(Chapter, chapter_filter)
+        .where((Story.slug == story_id) | (Story.public_id == story_id), Story.user_id == current_user.id)
+        .order_by(Chapter.chapter_number)
+    ).all()
 
-    if not story:
+    if not rows:
         raise HTTPException(status_code=404, detail="Story not found")
+    internal_id = rows[0][0]
 
-    # Get chapters to generate
-    if request.chapter_numbers:
-        chapters = [c for c in story.chapters if c.chapter_number in request.chapter_numbers]
-    else:
-        chapters = story.chapters
+    # One audio run per story: a repeated request joins the in-flight task (and is not charged again)
+    if active := get_task_backend().find_active_for_story(internal_id, "audio"):
+        return TaskStatusResponse(**active)
 
+    # Outer join yields a single chapterless row when nothing matched
+    chapters = [row for row in rows if row[1] is not None]
     if not chapters:
         raise HTTPException(status_code=400, detail="No chapters to generate")
 
-    # Check chapters have scripts
     for chapter in chapters:
-        if not chapter.enhanced_json and not chapter.script_json:
+        if not chapter.has_script:
             raise HTTPException(status_code=400, detail=f"Chapter {chapter.chapter_number} has no script")
 
     # Resolve ElevenLabs API key
@@ -593,11 +862,11 @@ async def generate_story_audio(
         db.commit()
 
     # Start background task (uses internal integer ID)
-    internal_id = story.id
-    chapter_ids = [c.id for c in chapters]
+    chapter_ids = [row[1] for row in chapters]
     task_id = f"audio_{internal_id}_{int(time.time())}"
     get_task_backend().update(task_id, "pending", 0, "Task queued, waiting to start...")
     background_tasks.add_task(
+        run_in_generation_pool,
         generate_audio,
         task_id=task_id,
         story_id=internal_id,
@@ -613,62 +882,18 @@ async def generate_story_audio(
 
 
 @router.get("/{story_id}/audio/combined")
-async def download_combined_audio(
-    story_id: str, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
-) -> FileResponse:
-    """Combine all chapter audio files into a single MP3 download."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
-        raise HTTPException(status_code=404, detail="Story not found")
-
-    storage = get_storage()
-    chapters_with_audio = sorted([c for c in story.chapters if c.audio_path], key=lambda c: c.chapter_number)
+async def download_combined_audio(story: Story = Depends(get_owned_story), db: Session = Depends(get_db)) -> Response:
+    """Combine all chapter audio files into a single MP3 download, streamed as ffmpeg produces it."""
+    chapters_with_audio = db.scalars(
+        select(Chapter)
+        .where(Chapter.story_id == story.id, Chapter.audio_path.is_not(None))
+        .order_by(Chapter.chapter_number)
+    ).all()
 
     if not chapters_with_audio:
         raise HTTPException(status_code=404, detail="No audio files available")
 
-    # Use internal integer ID for storage keys
-    int_id = story.id
-    if len(chapters_with_audio) == 1:
-        key = f"{int_id}/ch{chapters_with_audio[0].chapter_number}.mp3"
-        with storage.get_path(key) as single:
-            if not single:
-                raise HTTPException(status_code=404, detail="Audio file not found")
-            return FileResponse(str(single), media_type="audio/mpeg", filename=f"{story.title}.mp3")
-
-    # Build ffmpeg concat file — use get_path to get local files for each chapter
-    concat_list_path = None
-    output_path = None
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            for ch in chapters_with_audio:
-                key = f"{int_id}/ch{ch.chapter_number}.mp3"
-                with storage.get_path(key) as ch_path:
-                    if ch_path:
-                        f.write(f"file '{ch_path}'\n")
-            concat_list_path = f.name
-
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            output_path = tmp.name
-
-        result = subprocess.run(  # noqa: S603
-            ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list_path, "-c", "copy", output_path],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if result.returncode != 0:
-            raise HTTPException(status_code=500, detail="Failed to combine audio files")
-
-        return FileResponse(
-            output_path,
-            media_type="audio/mpeg",
-            filename=f"{story.title}.mp3",
-        )
-    finally:
-        if concat_list_path:
-            os.unlink(concat_list_path)
+    return await combined_audio_response(story.id, chapters_with_audio, f"{story.title}.mp3")
 
 
 @router.get("/{story_id}/chapters/{chapter_number}/audio")
@@ -679,11 +904,11 @@ async def get_chapter_audio(
     db: Session = Depends(get_db),
 ) -> dict[str, str]:
     """Get a signed URL for a chapter's audio file."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-    if not story:
+    found = _get_owned_chapter(db, story_id, current_user.id, chapter_number)
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    _, chapter = found
     if not chapter or not chapter.audio_path:
         raise HTTPException(status_code=404, detail="Audio not found")
 
@@ -695,20 +920,25 @@ async def get_chapter_audio(
 async def get_chapter(
     story_id: str,
     chapter_number: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-) -> Chapter:
+) -> Chapter | Response:
     """Get a specific chapter."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
+    found = _get_owned_chapter(db, story_id, current_user.id, chapter_number)
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    _, chapter = found
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
+    headers = {"ETag": version_etag(chapter.id, chapter.updated_at), "Cache-Control": _OWNER_CACHE_CONTROL}
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    response.headers.update(headers)
     return chapter
 
 
@@ -716,17 +946,19 @@ async def get_chapter(
 async def get_chapter_script(
     story_id: str,
     chapter_number: int,
+    request: Request,
     enhanced: bool = True,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-) -> list:
+) -> Response:
     """Get the JSON script for a chapter."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
+    found = _get_owned_chapter(
+        db, story_id, current_user.id, chapter_number, Chapter.script_json, Chapter.enhanced_json, Chapter.updated_at
+    )
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    _, chapter = found
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
@@ -736,7 +968,11 @@ async def get_chapter_script(
     if not script:
         raise HTTPException(status_code=404, detail="Script not generated yet")
 
-    return json.loads(script)
+    headers = {"ETag": version_etag(chapter.id, chapter.updated_at, enhanced), "Cache-Control": _OWNER_CACHE_CONTROL}
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    # Stored column is already serialized JSON — send it as-is instead of parsing and re-encoding
+    return Response(content=script, media_type="application/json", headers=headers)
 
 
 @router.put("/{story_id}/chapters/{chapter_number}/script")
@@ -748,23 +984,24 @@ async def update_chapter_script(
     db: Session = Depends(get_db),
 ) -> dict[str, str]:
     """Update the JSON script for a chapter."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-
-    if not story:
+    found = _get_owned_chapter(db, story_id, current_user.id, chapter_number)
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    _, chapter = found
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    script_str = json.dumps(script, ensure_ascii=False)
+    script_str = orjson.dumps(script).decode()
     # Save to enhanced_json if it existed, otherwise script_json
     if chapter.enhanced_json:
         chapter.enhanced_json = script_str
     else:
         chapter.script_json = script_str
+    chapter.speakers_json = orjson.dumps(script_speakers(script)).decode()
     db.commit()
+    invalidate_public_responses()
 
     return {"message": "Script updated"}
 
@@ -778,18 +1015,18 @@ async def get_line_audio(
     db: Session = Depends(get_db),
 ) -> dict[str, str]:
     """Get a URL for an individual line's audio segment."""
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-    if not story:
+    found = _get_owned_chapter(db, story_id, current_user.id, chapter_number)
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    _, chapter = found
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
     if not chapter.line_audio_json:
         raise HTTPException(status_code=404, detail="No per-line audio available")
 
-    line_map: dict[str, str] = json.loads(chapter.line_audio_json)
+    line_map: dict[str, str] = orjson.loads(chapter.line_audio_json)
     seg_key = line_map.get(str(line_index))
     if not seg_key:
         raise HTTPException(status_code=404, detail="Line audio not found for this index")
@@ -810,11 +1047,11 @@ async def regenerate_line_audio(
     """Regenerate audio for a single script line and rebuild the combined chapter MP3."""
     from webapp.services.generation import regenerate_single_line
 
-    story = _get_story_by_identifier(db, story_id, user_id=current_user.id)
-    if not story:
+    found = _get_owned_chapter(db, story_id, current_user.id, chapter_number)
+    if not found:
         raise HTTPException(status_code=404, detail="Story not found")
 
-    chapter = next((c for c in story.chapters if c.chapter_number == chapter_number), None)
+    story_pk, chapter = found
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
@@ -826,7 +1063,7 @@ async def regenerate_line_audio(
     if not script_json:
         raise HTTPException(status_code=400, detail="Chapter has no script")
 
-    script = json.loads(script_json)
+    script = orjson.loads(script_json)
     if line_index < 0 or line_index >= len(script):
         raise HTTPException(status_code=400, detail="Line index out of range")
     if script[line_index].get("type") != "line":
@@ -844,12 +1081,12 @@ async def regenerate_line_audio(
             detail="ElevenLabs API key required to regenerate audio.",
         )
 
-    task_id = f"regen_{story.id}_{chapter.chapter_number}_{line_index}_{int(time.time())}"
+    task_id = f"regen_{story_pk}_{chapter.chapter_number}_{line_index}_{int(time.time())}"
     get_task_backend().update(task_id, "pending", 0, "Queued line regeneration...")
     background_tasks.add_task(
         regenerate_single_line,
         task_id=task_id,
-        story_id=story.id,
+        story_id=story_pk,
         chapter_id=chapter.id,
         line_index=line_index,
         elevenlabs_api_key=elevenlabs_api_key,
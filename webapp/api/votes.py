@@ -5,13 +5,15 @@ Vote API endpoints.
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
-from webapp.models.database import User, Vote, get_db
+from webapp.models.database import Story, User, Vote, get_db, upsert_insert
 from webapp.models.schemas import VoteRequest
 from webapp.services.auth import get_current_active_user
+from webapp.services.response_cache import invalidate_public_responses
 
-from .stories import _get_story_by_identifier
+from .stories import _get_story_ref
 
 router = APIRouter(prefix="/api/votes", tags=["Votes"])
 
@@ -24,10 +26,7 @@ async def vote_on_story(
     db: Session = Depends(get_db),
 ) -> dict[str, str | int | None]:
     """Vote on a story. Send vote_type=null to remove vote."""
-    story = _get_story_by_identifier(db, story_id)
-    if story and story.visibility not in ("public", "link_only"):
-        story = None
-
+    story = _get_story_ref(db, story_id, ("public", "link_only"))
     if not story:
         raise HTTPException(status_code=404, detail="Story not found")
 
@@ -37,45 +36,49 @@ async def vote_on_story(
     if request.vote_type is not None and request.vote_type not in ("up", "down"):
         raise HTTPException(status_code=400, detail="vote_type must be 'up', 'down', or null")
 
-    existing = db.query(Vote).filter(Vote.story_id == story.id, Vote.user_id == current_user.id).first()
-
-    if request.vote_type is None:
-        # Remove vote
-        if existing:
-            if existing.vote_type == "up":
-                story.upvotes = max(0, story.upvotes - 1)
-            else:
-                story.downvotes = max(0, story.downvotes - 1)
-            db.delete(existing)
-    elif existing:
-        # Update vote
-        if existing.vote_type != request.vote_type:
-            if existing.vote_type == "up":
-                story.upvotes = max(0, story.upvotes - 1)
-                story.downvotes += 1
-            else:
-                story.downvotes = max(0, story.downvotes - 1)
-                story.upvotes += 1
-            existing.vote_type = request.vote_type
+    story_pk, user_id, new_type = story.id, current_user.id, request.vote_type
+    # Each step is a single statement whose RETURNING reveals the previous vote, so
+    # concurrent requests from the same user can't double-count
+    if new_type is None:
+        old_type = db.scalar(
+            delete(Vote).where(Vote.story_id == story_pk, Vote.user_id == user_id).returning(Vote.vote_type)
+        )
+    elif db.scalar(
+        # A vote is either up or down, so flipping a differing vote means the old one was the opposite
+        update(Vote)
+        .where(Vote.story_id == story_pk, Vote.user_id == user_id, Vote.vote_type != new_type)
+        .values(vote_type=new_type)
+        .returning(Vote.id)
+    ):
+        old_type = "down" if new_type == "up" else "up"
     else:
-        # New vote
-        db.add(
-            Vote(
-                user_id=current_user.id,
-                story_id=story.id,
-                vote_type=request.vote_type,
-            )
+        # No vote yet, or already this vote — the unique constraint tells them apart
+        inserted = db.scalar(
+            upsert_insert(db, Vote)
+            .values(user_id=user_id, story_id=story_pk, vote_type=new_type)
+            .on_conflict_do_nothing(index_elements=["user_id", "story_id"])
+            .returning(Vote.id)
         )
-        if request.vote_type == "up":
-            story.upvotes += 1
-        else:
-            story.downvotes += 1
+        old_type = None if inserted else new_type
 
-    db.commit()
-    db.refresh(story)
+    up_delta = (new_type == "up") - (old_type == "up")
+    down_delta = (new_type == "down") - (old_type == "down")
+    upvotes: int
+    downvotes: int
+    if up_delta or down_delta:
+        upvotes, downvotes = db.execute(
+            update(Story)
+            .where(Story.id == story_pk)
+            .values(upvotes=Story.upvotes + up_delta, downvotes=Story.downvotes + down_delta)
+            .returning(Story.upvotes, Story.downvotes)
+        ).one()
+        db.commit()
+        invalidate_public_responses()
+    else:
+        upvotes, downvotes = db.execute(select(Story.upvotes, Story.downvotes).where(Story.id == story_pk)).one()
 
     return {
-        "upvotes": story.upvotes,
-        "downvotes": story.downvotes,
-        "user_vote": request.vote_type,
+        "upvotes": upvotes,
+        "downvotes": downvotes,
+        "user_vote": new_type,
     }
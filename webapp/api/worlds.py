@@ -4,50 +4,59 @@ World CRUD API endpoints.
 
 from __future__ import annotations
 
-import json
 import os
-import uuid
+import secrets
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import CompoundSelect, func, or_, select, union, update
+from sqlalchemy.orm import Session, joinedload, raiseload
 
+from webapp.middleware.etag import not_modified, version_etag
 from webapp.models.database import Follow, Story, User, World, get_db
 from webapp.models.schemas import ShareLinkResponse, WorldCreate, WorldListItem, WorldResponse, WorldUpdate
 from webapp.services.auth import get_current_active_user
+from webapp.services.response_cache import invalidate_public_responses
 
 router = APIRouter(prefix="/api/worlds", tags=["Worlds"])
 
+# Worlds change under their owner's edits: browsers keep a copy but always revalidate
+_WORLD_CACHE_CONTROL = "private, no-cache"
 
-def _world_to_response(world: World) -> WorldResponse:
-    """Convert a World model to a WorldResponse schema."""
+# Story count projected as a scalar subquery so list pages never load the collection
+_STORY_COUNT = select(func.count(Story.id)).where(Story.world_id == World.id).correlate(World).scalar_subquery()
+
+
+def _world_to_response(world: World, story_count: int) -> WorldResponse:
+    """Convert a World model and its story count to a WorldResponse schema."""
     return WorldResponse(
         id=world.id,
         name=world.name,
         description=world.description,
         is_builtin=world.is_builtin,
         prompt_template=world.prompt_template,
-        characters=json.loads(world.characters_json) if world.characters_json else None,
-        valid_speakers=json.loads(world.valid_speakers_json) if world.valid_speakers_json else None,
-        voice_config=json.loads(world.voice_config_json) if world.voice_config_json else None,
+        characters=orjson.loads(world.characters_json) if world.characters_json else None,
+        valid_speakers=orjson.loads(world.valid_speakers_json) if world.valid_speakers_json else None,
+        voice_config=orjson.loads(world.voice_config_json) if world.voice_config_json else None,
         visibility=world.visibility,
         share_code=world.share_code,
-        story_count=len(world.stories),
+        story_count=story_count,
         owner_name=(world.owner.display_name or world.owner.username) if world.owner else None,
         created_at=world.created_at,
         updated_at=world.updated_at,
     )
 
 
-def _world_to_list_item(world: World) -> WorldListItem:
-    """Convert a World model to a WorldListItem schema."""
+def _world_to_list_item(world: World, story_count: int) -> WorldListItem:
+    """Convert a World model and its story count to a WorldListItem schema."""
     return WorldListItem(
         id=world.id,
         name=world.name,
         description=world.description,
         is_builtin=world.is_builtin,
         visibility=world.visibility,
-        story_count=len(world.stories),
+        story_count=story_count,
         owner_name=(world.owner.display_name or world.owner.username) if world.owner else None,
         created_at=world.created_at,
     )
@@ -59,21 +68,25 @@ async def list_worlds(
     db: Session = Depends(get_db),
 ) -> list[WorldListItem]:
     """List user's own worlds plus public, built-in, and followed users' worlds."""
-    followed_ids = [f.following_id for f in db.query(Follow).filter(Follow.follower_id == current_user.id).all()]
-    worlds = (
-        db.query(World)
-        .filter(
-            or_(
-                World.user_id == current_user.id,
-                World.visibility == "public",
-                World.is_builtin.is_(True),
-                (World.visibility == "followers") & (World.user_id.in_(followed_ids)) if followed_ids else False,
-            )
-        )
+    user_id = current_user.id
+    # One id-only branch per visibility rule, each served by its own index (the middle one
+    # matches ix_worlds_public's predicate). UNION drops worlds matched by several branches.
+    visible_ids: CompoundSelect = union(
+        select(World.id).where(World.user_id == user_id),
+        select(World.id).where(or_(World.visibility == "public", World.is_builtin.is_(True))),
+        select(World.id).where(
+            World.visibility == "followers",
+            World.user_id.in_(select(Follow.following_id).where(Follow.follower_id == user_id)),
+        ),
+    )
+    rows = (
+        db.query(World, _STORY_COUNT.label("story_count"))
+        .options(joinedload(World.owner).load_only(User.username, User.display_name), raiseload("*"))
+        .filter(World.id.in_(visible_ids))
         .order_by(World.is_builtin.desc(), World.created_at.desc())
         .all()
     )
-    return [_world_to_list_item(w) for w in worlds]
+    return [_world_to_list_item(w, story_count) for w, story_count in rows]
 
 
 @router.post("/", response_model=WorldResponse, status_code=201)
@@ -91,27 +104,39 @@ async def create_world(
         name=world_data.name,
         description=world_data.description,
         prompt_template=world_data.prompt_template,
-        characters_json=json.dumps(world_data.characters) if world_data.characters else None,
-        valid_speakers_json=json.dumps(world_data.valid_speakers) if world_data.valid_speakers else None,
-        voice_config_json=json.dumps(world_data.voice_config) if world_data.voice_config else None,
+        characters_json=orjson.dumps(world_data.characters).decode() if world_data.characters else None,
+        valid_speakers_json=orjson.dumps(world_data.valid_speakers).decode() if world_data.valid_speakers else None,
+        voice_config_json=orjson.dumps(world_data.voice_config).decode() if world_data.voice_config else None,
         visibility=world_data.visibility,
     )
     db.add(world)
+    db.flush()  # Assigns the PK and column defaults without reloading the row
+    # Built before commit expires the row, so no refresh SELECT is needed
+    response = _world_to_response(world, 0)
     db.commit()
-    db.refresh(world)
-    return _world_to_response(world)
+    if world_data.visibility == "public":
+        invalidate_public_responses()
+    return response
 
 
 @router.get("/{world_id}", response_model=WorldResponse)
 async def get_world(
     world_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-) -> WorldResponse:
+) -> WorldResponse | Response:
     """Get a world by ID (owner, public, or built-in)."""
-    world = db.query(World).filter(World.id == world_id).first()
-    if not world:
+    row = (
+        db.query(World, _STORY_COUNT.label("story_count"))
+        .options(joinedload(World.owner).load_only(User.username, User.display_name), raiseload("*"))
+        .filter(World.id == world_id)
+        .first()
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="World not found")
+    world, story_count = row
 
     if world.user_id != current_user.id and world.visibility != "public" and not world.is_builtin:
         # Allow followers-visibility worlds if user follows the owner
@@ -120,7 +145,15 @@ async def get_world(
         if world.visibility != "followers" or not check_following(db, current_user.id, world.user_id):
             raise HTTPException(status_code=404, detail="World not found")
 
-    return _world_to_response(world)
+    owner_name = (world.owner.display_name or world.owner.username) if world.owner else ""
+    headers = {
+        "ETag": version_etag(world.id, world.updated_at, story_count, owner_name),
+        "Cache-Control": _WORLD_CACHE_CONTROL,
+    }
+    if unchanged := not_modified(request, headers):
+        return unchanged
+    response.headers.update(headers)
+    return _world_to_response(world, story_count)
 
 
 @router.patch("/{world_id}", response_model=WorldResponse)
@@ -131,34 +164,50 @@ async def update_world(
     db: Session = Depends(get_db),
 ) -> WorldResponse:
     """Update a world (owner only, not built-in)."""
-    world = db.query(World).filter(World.id == world_id, World.user_id == current_user.id).first()
-    if not world:
-        raise HTTPException(status_code=404, detail="World not found")
-    if world.is_builtin:
-        raise HTTPException(status_code=403, detail="Cannot modify built-in worlds")
+    if world_update.visibility is not None and world_update.visibility not in (
+        "private",
+        "link_only",
+        "public",
+        "followers",
+    ):
+        raise HTTPException(status_code=400, detail="Invalid visibility value")
 
+    values: dict[str, Any] = {}
     if world_update.name is not None:
-        world.name = world_update.name
+        values["name"] = world_update.name
     if world_update.description is not None:
-        world.description = world_update.description
+        values["description"] = world_update.description
     if world_update.prompt_template is not None:
-        world.prompt_template = world_update.prompt_template
+        values["prompt_template"] = world_update.prompt_template
     if world_update.characters is not None:
-        world.characters_json = json.dumps(world_update.characters)
+        values["characters_json"] = orjson.dumps(world_update.characters).decode()
     if world_update.valid_speakers is not None:
-        world.valid_speakers_json = json.dumps(world_update.valid_speakers)
+        values["valid_speakers_json"] = orjson.dumps(world_update.valid_speakers).decode()
     if world_update.voice_config is not None:
-        world.voice_config_json = json.dumps(world_update.voice_config)
+        values["voice_config_json"] = orjson.dumps(world_update.voice_config).decode()
     if world_update.visibility is not None:
-        if world_update.visibility not in ("private", "link_only", "public", "followers"):
-            raise HTTPException(status_code=400, detail="Invalid visibility value")
-        world.visibility = world_update.visibility
-        if world_update.visibility in ("link_only", "public") and not world.share_code:
-            world.share_code = str(uuid.uuid4())
+        values["visibility"] = world_update.visibility
+        if world_update.visibility in ("link_only", "public"):
+            values["share_code"] = func.coalesce(World.share_code, secrets.token_urlsafe(16))
 
+    # UPDATE ... RETURNING hands back the written row, so there is no load before
+    # the write and no refresh after it; an empty patch just reads the world
+    owned = (World.id == world_id, World.user_id == current_user.id)
+    stmt = update(World).values(**values).returning(World) if values else select(World)
+    world = db.scalars(
+        stmt.where(*owned, World.is_builtin.is_(False)).execution_options(populate_existing=True)
+    ).first()
+    if not world:
+        # Only a miss pays for telling "not yours" apart from "built-in"
+        if db.scalar(select(World.id).where(*owned)) is None:
+            raise HTTPException(status_code=404, detail="World not found")
+        raise HTTPException(status_code=403, detail="Cannot modify built-in worlds")
+
+    # Built before commit expires the row
+    response = _world_to_response(world, db.scalar(select(func.count(Story.id)).where(Story.world_id == world_id)) or 0)
     db.commit()
-    db.refresh(world)
-    return _world_to_response(world)
+    invalidate_public_responses()
+    return response
 
 
 @router.delete("/{world_id}")
@@ -183,6 +232,7 @@ async def delete_world(
 
     db.delete(world)
     db.commit()
+    invalidate_public_responses()
     return {"message": "World deleted"}
 
 
@@ -198,13 +248,13 @@ async def generate_world_share_link(
     if not world:
         raise HTTPException(status_code=404, detail="World not found")
 
-    if not world.share_code:
-        world.share_code = str(uuid.uuid4())
+    share_code = world.share_code
+    if not share_code:
+        share_code = world.share_code = secrets.token_urlsafe(16)
         db.commit()
-        db.refresh(world)
 
     frontend_url = os.environ.get("FRONTEND_URL", "http://localhost:5173")
     return ShareLinkResponse(
-        share_code=world.share_code,
-        share_url=f"{frontend_url}/worlds/share/{world.share_code}",
+        share_code=share_code,
+        share_url=f"{frontend_url}/worlds/share/{share_code}",
     )
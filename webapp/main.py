@@ -4,8 +4,12 @@ Main FastAPI application for Lingolou.
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import hashlib
+import logging
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from dotenv import load_dotenv
 
@@ -14,15 +18,65 @@ load_dotenv()  # Load .env before any module reads os.getenv
 import os
 from pathlib import Path
 
+import orjson
+from anyio import to_thread
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, JSONResponse, Response
 from starlette.middleware.sessions import SessionMiddleware
 
 from webapp.api import auth, blocks, bookmarks, follows, oauth, public, reports, stories, votes, worlds
-from webapp.middleware.etag import ETagMiddleware
-from webapp.models.database import init_db
+from webapp.middleware.etag import ETagMiddleware, not_modified
+from webapp.middleware.static import PrecompressedStaticFiles
+from webapp.models.database import alembic_head, init_db
+from webapp.services.task_store import RedisNotReadyError, RedisTaskBackend, get_task_backend
+
+logger = logging.getLogger(__name__)
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for responses built by hand below.
+
+    Not set as the app's default_response_class: routes with a return type are
+    already serialized straight to bytes by Pydantic, and any explicit default
+    turns that fast path off.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Serialize content with orjson."""
+        return orjson.dumps(content)
+
+
+def _scan_frontend(frontend: Path) -> dict[str, str]:
+    """Map each built frontend file's URL path to its location, skipping assets/ (mounted) and index.html."""
+    files = {}
+    for root, dirs, names in os.walk(frontend):
+        rel_root = os.path.relpath(root, frontend)
+        if rel_root == ".":
+            dirs[:] = [d for d in dirs if d != "assets"]
+        for name in names:
+            rel = name if rel_root == "." else f"{rel_root.replace(os.sep, '/')}/{name}"
+            files[rel] = os.path.join(root, name)
+    files.pop("index.html", None)
+    return files
+
+
+def _load_index(app: FastAPI, index: Path) -> None:
+    """Read the SPA index into app.state with its ETag, or leave None if the frontend isn't built."""
+    app.state.index_bytes = index.read_bytes() if index.is_file() else None
+    if app.state.index_bytes is not None:
+        # Weak, so ETagMiddleware keeps it rather than re-hashing the body
+        app.state.index_etag = f'W/"{hashlib.blake2b(app.state.index_bytes, digest_size=8).hexdigest()}"'
+
+
+def _index_response(request: Request) -> Response | None:
+    """Serve the cached SPA index, or a 304 when the client holds it; None if the frontend isn't built."""
+    if request.app.state.index_bytes is None:
+        return None
+    headers = {"ETag": request.app.state.index_etag, "Cache-Control": "no-cache"}
+    return not_modified(request, headers) or Response(
+        request.app.state.index_bytes, media_type="text/html", headers=headers
+    )
 
 
 @contextlib.asynccontextmanager
@@ -37,14 +91,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     import threading
 
+    from webapp.services import mnemonic
     from webapp.services.generation import resume_incomplete_stories
-    from webapp.services.voices_cache import warm_cache
+    from webapp.services.voices_cache import close_client, warm_cache
+
+    # Sync dependencies (get_db) and quick background tasks share anyio's worker threads,
+    # which spend nearly all their time waiting on the database and external APIs
+    to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREADPOOL_SIZE", "64"))
+
+    # Start Up — migrations and seeding are blocking I/O, so keep them off the event loop
+    await asyncio.to_thread(init_db)
 
-    # Start Up
-    init_db()
+    # The migration head only changes with a deploy, so /health reports this one
+    app.state.alembic_head = await asyncio.to_thread(alembic_head)
 
-    # Warm the voices cache in a daemon thread (non-blocking startup)
-    threading.Thread(target=warm_cache, daemon=True).start()
+    # Serve the built SPA index from memory rather than the disk
+    _load_index(app, frontend_dir / "index.html")
+    app.state.frontend_files = _scan_frontend(frontend_dir)
+
+    # Load the slug word lists off the event loop; create_story uses them on every call
+    await asyncio.to_thread(mnemonic.preload)
+
+    # Warm the voices cache in the background (non-blocking startup)
+    warm_task = asyncio.create_task(warm_cache())
 
     # Resume any stories stuck in 'generating' from a previous shutdown
     threading.Thread(target=resume_incomplete_stories, daemon=True).start()
@@ -52,123 +121,151 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Server
     yield
     # Shut Down
+    warm_task.cancel()
+    await close_client()
+
+
+_production = os.getenv("LINGOLOU_ENV") == "production"
 
+# The interactive docs and OpenAPI schema are for development; production registers neither route
+_docs_enabled = not _production
 
 # Initialize FastAPI app
 app = FastAPI(
-    title="Lingolou API", description="Language Learning Audiobook Generator API", version="1.1.0", lifespan=lifespan
+    title="Lingolou API",
+    description="Language Learning Audiobook Generator API",
+    version="1.1.0",
+    lifespan=lifespan,
+    docs_url="/docs" if _docs_enabled else None,
+    redoc_url="/redoc" if _docs_enabled else None,
+    openapi_url="/openapi.json" if _docs_enabled else None,
 )
 
-# Session middleware (required by authlib for OAuth state/CSRF)
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=os.getenv("SESSION_SECRET_KEY", "change-me-to-a-random-secret-at-least-32-chars"),
-)
-
-# CORS middleware — set CORS_ORIGINS env var for production (comma-separated)
-_cors_origins = os.getenv("CORS_ORIGINS", "*").split(",")
+# CORS middleware — set CORS_ORIGINS env var for production (comma-separated).
+# Already pure ASGI, and requests without an Origin header pass straight through.
+# A set turns its per-request origin check into a hash lookup.
+_cors_origins = frozenset(o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip())
+if _production and "*" in _cors_origins:
+    # Still serves, but any origin may read responses; credentials stay off below
+    logger.error("CORS_ORIGINS allows any origin in production; set it to the explicit frontend origins")
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[o.strip() for o in _cors_origins],
-    allow_credentials=True,
+    allow_origins=_cors_origins,
+    # Browsers refuse credentialed requests answered with a wildcard origin
+    allow_credentials="*" not in _cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cross-origin scripts can only read response headers listed here
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ETag middleware for GET /api/* JSON responses (after CORS so headers are present)
 app.add_middleware(ETagMiddleware)
 
+
+# Health check — routes match in registration order, so this and the SPA root,
+# the most-hit routes, are registered before the routers
+@app.get("/health")
+async def health_check(request: Request) -> dict[str, str | None]:
+    """Health check endpoint."""
+    # Check Redis status
+    backend = get_task_backend()
+    if isinstance(backend, RedisTaskBackend):
+        redis_status = "connected" if backend.ping() else "error"
+    else:
+        redis_status = "not_configured"
+
+    return {
+        "status": "healthy",
+        "version": app.version,
+        "alembic_head": request.app.state.alembic_head,
+        "redis": redis_status,
+    }
+
+
+# Root endpoint — serve SPA if built, otherwise API info
+@app.get("/", response_model=None)
+async def root(request: Request) -> Response:
+    """Serve SPA index or API info."""
+    if index := _index_response(request):
+        return index
+    return _ORJSONResponse({"name": "Lingolou API", "version": "1.0.0", "docs": app.docs_url})
+
+
 # Mount static files
 static_dir = Path(__file__).parent / "static"
 static_dir.mkdir(exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory=str(static_dir)), name="static")
 
 # Mount frontend SPA assets (built by Vite into static/frontend/)
 frontend_dir = static_dir / "frontend"
 frontend_dir.mkdir(exist_ok=True)
 frontend_assets = frontend_dir / "assets"
-if frontend_assets.exists():
-    app.mount("/assets", StaticFiles(directory=str(frontend_assets)), name="frontend-assets")
-
-# Include routers
-app.include_router(auth.router)
+# SERVE_STATIC=0 leaves /assets to a reverse proxy or CDN in front of the app
+if frontend_assets.exists() and os.getenv("SERVE_STATIC", "1") == "1":
+    # Content-hashed by Vite, so safe to cache for good
+    app.mount(
+        "/assets",
+        PrecompressedStaticFiles(directory=str(frontend_assets), immutable=True),
+        name="frontend-assets",
+    )
+
+# Include routers, most-hit first
 app.include_router(stories.router)
-app.include_router(oauth.router)
 app.include_router(public.router)
+app.include_router(worlds.router)
 app.include_router(votes.router)
-app.include_router(reports.router)
 app.include_router(bookmarks.router)
-app.include_router(blocks.router)
+app.include_router(auth.router)
 app.include_router(follows.router)
-app.include_router(worlds.router)
+# OAuth is its own app carrying the session middleware authlib needs for OAuth
+# state/CSRF, so no other request passes through it or pays for the cookie signing
+oauth_app = FastAPI(openapi_url=None)
+oauth_app.include_router(oauth.router)
+oauth_app.add_middleware(
+    SessionMiddleware,
+    secret_key=os.getenv("SESSION_SECRET_KEY", "change-me-to-a-random-secret-at-least-32-chars"),
+    path=oauth.PREFIX,
+)
+app.mount(oauth.PREFIX, oauth_app)
+app.include_router(reports.router)
+app.include_router(blocks.router)
 
 
 # Redis-not-ready handler — returns 503 with Retry-After so clients can retry
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Return JSON error response for unhandled exceptions."""
-    from webapp.services.task_store import RedisNotReadyError
-
     if isinstance(exc, RedisNotReadyError):
-        return JSONResponse(
+        return _ORJSONResponse(
             status_code=503,
             content={"detail": "Service starting up, please retry"},
             headers={"Retry-After": "2"},
         )
-    return JSONResponse(status_code=500, content={"detail": str(exc)})
+    return _ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 
-# Health check
-@app.get("/health")
-async def health_check() -> dict[str, str | None]:
-    """Health check endpoint."""
-    from alembic.config import Config
-    from alembic.script import ScriptDirectory
-
-    from webapp.services.task_store import RedisTaskBackend, get_task_backend
-
-    alembic_cfg = Config(str(Path(__file__).parent.parent / "alembic.ini"))
-    script = ScriptDirectory.from_config(alembic_cfg)
-    head = script.get_current_head()
-
-    # Check Redis status
-    backend = get_task_backend()
-    if isinstance(backend, RedisTaskBackend):
-        redis_status = "connected" if backend.ping() else "error"
-    else:
-        redis_status = "not_configured"
-
-    return {"status": "healthy", "version": app.version, "alembic_head": head, "redis": redis_status}
-
-
-# Root endpoint — serve SPA if built, otherwise API info
-@app.get("/", response_model=None)
-async def root() -> FileResponse | dict[str, str]:
-    """Serve SPA index or API info."""
-    index = Path(__file__).parent / "static" / "frontend" / "index.html"
-    if index.exists():
-        return FileResponse(str(index))
-    return {"name": "Lingolou API", "version": "1.0.0", "docs": "/docs"}
+# Paths the SPA never owns; unknown URLs under them 404 without touching the disk
+_NON_SPA_PREFIXES = ("api/", "static/", "assets/", "docs", "redoc", "openapi.json", "health")
 
 
 # SPA catch-all: serve index.html for any non-API, non-static path
 @app.get("/{full_path:path}", response_model=None)
-async def serve_spa(request: Request, full_path: str) -> FileResponse | JSONResponse:
+async def serve_spa(request: Request, full_path: str) -> Response:
     """Catch-all route to serve SPA for non-API paths."""
-    if full_path.startswith("api/"):
-        return JSONResponse({"detail": "Not found"}, status_code=404)
-    # Serve static files from the frontend build directory if they exist
-    static_file = Path(__file__).parent / "static" / "frontend" / full_path
-    if static_file.is_file():
-        return FileResponse(str(static_file))
-    index = Path(__file__).parent / "static" / "frontend" / "index.html"
-    if index.exists():
-        return FileResponse(str(index))
-    return JSONResponse({"detail": "Frontend not built. Run: cd frontend && npm run build"}, status_code=404)
+    if full_path.startswith(_NON_SPA_PREFIXES):
+        return _ORJSONResponse({"detail": "Not found"}, status_code=404)
+    # Other build files (favicon etc.), looked up in the startup scan rather than on disk
+    if static_file := request.app.state.frontend_files.get(full_path):
+        return FileResponse(static_file)
+    if index := _index_response(request):
+        return index
+    return _ORJSONResponse({"detail": "Frontend not built. Run: cd frontend && npm run build"}, status_code=404)
 
 
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Same server settings as entrypoint.sh
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools", access_log=False, server_header=False)
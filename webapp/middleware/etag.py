@@ -3,55 +3,114 @@ ETag middleware for all GET responses.
 
 Adds ETag headers and returns 304 Not Modified when the client sends
 a matching If-None-Match header, saving bandwidth on unchanged responses.
-Covers API JSON, index.html, and static assets.
+Covers API JSON and HTML pages. Everything else — audio downloads, static
+files, streamed bodies — passes straight through, so it is never buffered;
+FileResponse and StaticFiles already send their own ETag.
+
+Handlers that compute their own weak ETag (``W/"..."``) from a cheap version
+key are left untouched, so they can answer 304 before doing any real work;
+``version_etag`` and ``not_modified`` are the helpers for that.
 """
 
 from __future__ import annotations
 
 import hashlib
+from datetime import datetime
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Content types whose bodies are hashed; anything else is passed through untouched
+_HASHED_TYPES = (b"application/json", b"text/html")
 
-class ETagMiddleware(BaseHTTPMiddleware):
-    """Add ETag / 304 support for all GET 200 responses."""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """Process the request and add ETag if applicable."""
-        if request.method != "GET":
-            return await call_next(request)
+def version_etag(*parts: object) -> str:
+    """Build a weak ETag from a cheap version key (ids, updated_at stamps, viewer state)."""
+    key = ":".join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return f'W/"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def not_modified(request: Request, headers: dict[str, str]) -> Response | None:
+    """Return a 304 if the client already holds the version in headers["ETag"], else None."""
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+class ETagMiddleware:
+    """Add ETag / 304 support for GET 200 JSON and HTML responses.
+
+    Pure ASGI rather than BaseHTTPMiddleware, so requests it doesn't touch pass
+    straight through and the rest skip the extra task and stream plumbing.
+    """
 
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap *app*."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the request and add ETag if applicable."""
         # Task status endpoints need fresh responses every poll
-        if "/tasks/" in request.url.path:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["method"] != "GET" or "/tasks/" in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        body: list[bytes] = []
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
 
-        response = await call_next(request)
+            if message["type"] == "http.response.start":
+                passthrough = not self._hashable(message)
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
 
-        if response.status_code != 200:
-            return response
+            # Buffer the body until the last chunk, then hash it
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            assert start is not None
+            await self._send_tagged(scope, send, start, b"".join(body))
 
-        # Read the streaming response body
-        body = b""
-        async for chunk in response.body_iterator:  # type: ignore[attr-defined]
-            body += chunk if isinstance(chunk, bytes) else chunk.encode()
+        await self.app(scope, receive, send_with_etag)
 
-        # Compute ETag from body hash
-        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    @staticmethod
+    def _hashable(start: Message) -> bool:
+        """Whether the response is worth buffering to hash.
+
+        Only fixed-length JSON/HTML 200s qualify. Responses without a content-length
+        are streamed, and a handler's version-based ETag (``W/``) is kept as-is.
+        """
+        if start["status"] != 200:
+            return False
+        headers = dict(start["headers"])
+        if headers.get(b"etag", b"").startswith(b"W/") or b"content-length" not in headers:
+            return False
+        return headers.get(b"content-type", b"").startswith(_HASHED_TYPES)
+
+    @staticmethod
+    async def _send_tagged(scope: Scope, send: Send, start: Message, body: bytes) -> None:
+        """Send the buffered response with an ETag, or a 304 if the client already holds it."""
+        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'.encode()
+        headers = [(k, v) for k, v in start["headers"] if k != b"etag"]
 
         # Check If-None-Match
-        if_none_match = request.headers.get("if-none-match")
-        if if_none_match and if_none_match == etag:
-            return Response(status_code=304, headers={"ETag": etag})
-
-        # Return original response with ETag header added
-        headers = dict(response.headers)
-        headers.pop("etag", None)  # remove FileResponse's own ETag to avoid duplicates
-        headers["ETag"] = etag
-        return Response(
-            content=body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type,
-        )
+        if_none_match = next((v for k, v in scope["headers"] if k == b"if-none-match"), None)
+        if if_none_match == etag:
+            not_modified_headers = [(b"etag", etag), *((k, v) for k, v in headers if k == b"cache-control")]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers.append((b"etag", etag))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
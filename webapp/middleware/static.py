@@ -0,0 +1,64 @@
+"""
+Static file serving with long-lived caching and precompressed siblings.
+
+Vite content-hashes everything under assets/, so those files never change under
+the same URL and can be cached for a year. When the build left ``.br`` / ``.gz``
+copies next to a file, clients that accept them get the compressed copy as-is.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Preferred first
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves precompressed siblings and, if ``immutable``, a year-long Cache-Control."""
+
+    def __init__(self, *, immutable: bool = False, **kwargs: Any) -> None:
+        """Create the app; ``kwargs`` are passed to StaticFiles."""
+        super().__init__(**kwargs)
+        self.immutable = immutable
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Serve path, swapping in a precompressed copy the client accepts."""
+        response = await super().get_response(path, scope)
+        if response.status_code == 200 and isinstance(response, FileResponse):
+            response = await self._precompressed(path, scope, response)
+        if self.immutable and response.status_code in {200, 304}:
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    async def _precompressed(self, path: str, scope: Scope, response: FileResponse) -> FileResponse:
+        """Return a FileResponse for the best precompressed sibling of path, or response if none fits.
+
+        Either way the response varies on Accept-Encoding, so a shared cache never hands
+        the identity copy to a client that could have had a compressed one, or vice versa.
+        """
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        accepted = {encoding.split(";")[0].strip() for encoding in accept.split(",")}
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            # stat() off the event loop, as StaticFiles does for the file itself
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None:
+                continue
+            return FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=response.media_type,
+                headers={"content-encoding": encoding, "vary": "Accept-Encoding"},
+            )
+        response.headers["vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,39 @@
+"""add generated net_score and public feed index to stories
+
+Revision ID: 5c7e2a9d4b10
+Revises: 9274db3a1fbc
+Create Date: 2026-10-16 10:12:03.114207
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7e2a9d4b10"
+down_revision: str | None = "9274db3a1fbc"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the virtual net_score column and a partial index for the public feed ordering."""
+    # SQLite can only ADD virtual (not stored) generated columns; virtual columns are still indexable
+    op.add_column(
+        "stories",
+        sa.Column("net_score", sa.Integer(), sa.Computed("upvotes - downvotes", persisted=False)),
+    )
+    op.create_index(
+        "ix_stories_public_feed",
+        "stories",
+        ["net_score", "created_at"],
+        sqlite_where=sa.text("visibility = 'public' AND status = 'completed'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the public feed index and net_score column."""
+    op.drop_index("ix_stories_public_feed", table_name="stories")
+    op.drop_column("stories", "net_score")
@@ -0,0 +1,37 @@
+"""drop single-column indexes covered by a unique constraint's leading column
+
+Revision ID: 5d2e8b4c7a19
+Revises: 9e3c7a1f5d28
+Create Date: 2026-10-16 21:04:37.582913
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e8b4c7a19"
+down_revision: str | None = "9e3c7a1f5d28"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (index, table, column); each column leads its table's unique constraint
+_REDUNDANT_INDEXES = (
+    ("ix_reports_user_id", "reports", "user_id"),
+    ("ix_bookmarks_user_id", "bookmarks", "user_id"),
+    ("ix_follows_follower_id", "follows", "follower_id"),
+    ("ix_blocks_blocker_id", "blocks", "blocker_id"),
+)
+
+
+def upgrade() -> None:
+    """Drop indexes whose lookups the unique constraints' leading column already serves."""
+    for index, table, _column in _REDUNDANT_INDEXES:
+        op.drop_index(index, table_name=table)
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes."""
+    for index, table, column in _REDUNDANT_INDEXES:
+        op.create_index(index, table, [column])
@@ -0,0 +1,27 @@
+"""add index on stories (user_id, created_at) for the owner's story list
+
+Revision ID: 7d2b5e8a1c04
+Revises: e4a7c2f9b813
+Create Date: 2026-10-16 17:24:40.381902
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2b5e8a1c04"
+down_revision: str | None = "e4a7c2f9b813"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index stories by owner and creation time so list pages need no sort."""
+    op.create_index("ix_stories_user_created", "stories", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    """Drop the owner story-list index."""
+    op.drop_index("ix_stories_user_created", table_name="stories")
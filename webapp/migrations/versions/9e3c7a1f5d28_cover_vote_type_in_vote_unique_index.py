@@ -0,0 +1,35 @@
+"""cover vote_type in the votes (user_id, story_id) unique index
+
+Revision ID: 9e3c7a1f5d28
+Revises: c81f4d6a2e97
+Create Date: 2026-10-16 18:21:06.114530
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3c7a1f5d28"
+down_revision: str | None = "c81f4d6a2e97"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """INCLUDE vote_type in the unique index on PostgreSQL; drop the redundant user_id index."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("uq_user_story_vote", "votes", type_="unique")
+        op.create_unique_constraint(
+            "uq_user_story_vote", "votes", ["user_id", "story_id"], postgresql_include=["vote_type"]
+        )
+    op.drop_index("ix_votes_user_id", table_name="votes")
+
+
+def downgrade() -> None:
+    """Restore the user_id index and the plain unique constraint."""
+    op.create_index("ix_votes_user_id", "votes", ["user_id"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("uq_user_story_vote", "votes", type_="unique")
+        op.create_unique_constraint("uq_user_story_vote", "votes", ["user_id", "story_id"])
@@ -0,0 +1,40 @@
+"""add partial indexes for the language feed and public world list
+
+Revision ID: b3f9d1c6e2a7
+Revises: 5c7e2a9d4b10
+Create Date: 2026-10-16 14:31:47.502918
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f9d1c6e2a7"
+down_revision: str | None = "5c7e2a9d4b10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add partial indexes covering the language-filtered feed and the public world list."""
+    op.create_index(
+        "ix_stories_language_feed",
+        "stories",
+        ["language", "net_score", "created_at"],
+        sqlite_where=sa.text("visibility = 'public' AND status = 'completed'"),
+    )
+    op.create_index(
+        "ix_worlds_public",
+        "worlds",
+        ["is_builtin", "created_at"],
+        sqlite_where=sa.text("visibility = 'public' OR is_builtin IS 1"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the public listing partial indexes."""
+    op.drop_index("ix_worlds_public", table_name="worlds")
+    op.drop_index("ix_stories_language_feed", table_name="stories")
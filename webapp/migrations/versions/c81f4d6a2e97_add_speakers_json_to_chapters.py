@@ -0,0 +1,28 @@
+"""add speakers_json to chapters
+
+Revision ID: c81f4d6a2e97
+Revises: 7d2b5e8a1c04
+Create Date: 2026-10-16 17:52:19.640215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f4d6a2e97"
+down_revision: str | None = "7d2b5e8a1c04"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add speakers_json column to chapters table; existing rows stay NULL until their script is rewritten."""
+    op.add_column("chapters", sa.Column("speakers_json", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove speakers_json column from chapters table."""
+    op.drop_column("chapters", "speakers_json")
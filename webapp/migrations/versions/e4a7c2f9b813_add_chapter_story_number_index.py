@@ -0,0 +1,33 @@
+"""add unique index on chapters (story_id, chapter_number)
+
+Revision ID: e4a7c2f9b813
+Revises: b3f9d1c6e2a7
+Create Date: 2026-10-16 17:08:12.114530
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2f9b813"
+down_revision: str | None = "b3f9d1c6e2a7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index chapters by story and number so single-chapter lookups hit one row."""
+    # Concurrent generate/regenerate runs could insert the same chapter twice; keep the
+    # oldest row of each pair so the unique index can be built
+    op.execute(
+        "DELETE FROM chapters WHERE id NOT IN "
+        "(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM chapters GROUP BY story_id, chapter_number) AS keep)"
+    )
+    op.create_index("ix_chapter_story_number", "chapters", ["story_id", "chapter_number"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the chapter lookup index."""
+    op.drop_index("ix_chapter_story_number", table_name="chapters")
@@ -4,41 +4,99 @@ Database models and setup for Lingolou webapp.
 
 from __future__ import annotations
 
+import functools
+import json
 import os
 import sqlite3
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from collections.abc import Set as AbstractSet
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from sqlalchemy import (
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    Select,
     String,
     Text,
     UniqueConstraint,
     create_engine,
     event,
+    select,
+    text,
 )
+from sqlalchemy.dialects.postgresql import Insert as PostgresInsert
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.sql import operators
+
+if TYPE_CHECKING:
+    from alembic.config import Config
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./lingolou.db")
 
-_engine_kwargs: dict[str, object] = {}
+# Compiled SQL is cached per engine, keyed on statement structure; sized above the
+# library default of 500 so the ORM's per-entity loader variants don't evict each other.
+_engine_kwargs: dict[str, object] = {"query_cache_size": int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))}
+
+
+def _server_pool_kwargs() -> dict[str, object]:
+    """Explicit QueuePool settings for server databases (Postgres, MySQL).
+
+    Sized well above the library default of 5 so concurrent requests don't queue
+    on the pool; pre-ping and recycle drop connections the server closed.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "5")),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+
+# With SQLite file locking (local disks only) each session gets its own connection from a
+# pool and the database runs in WAL mode, so reads proceed alongside the single writer.
+# Without it (the default, for SMB) locks are no-ops and every session must share one
+# connection, since a second one could read half-written pages or roll back a live journal.
+SQLITE_FILE_LOCKING = os.getenv("SQLITE_FILE_LOCKING", "false").lower() in {"1", "true", "yes"}
+
+
+def _sqlite_pool_kwargs() -> dict[str, object]:
+    """Pool settings for the SQLite engine: a real pool with file locking, one shared connection without."""
+    if not SQLITE_FILE_LOCKING:
+        return {"poolclass": StaticPool}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("SQLITE_POOL_SIZE", "8")),
+        "max_overflow": 0,
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "5")),
+    }
+
 
 if DATABASE_URL.startswith("sqlite"):
     # Extract the file path from the SQLAlchemy URL
     _db_path = DATABASE_URL.replace("sqlite:///", "", 1)
 
     def _sqlite_creator() -> sqlite3.Connection:
-        """Create a SQLite connection with unix-none VFS (no file locking).
+        """Create a SQLite connection, with unix-none VFS (no file locking) unless SQLITE_FILE_LOCKING is set.
 
-        Safe because we run a single replica (maxReplicas=1). Avoids POSIX
-        locking which fails on network filesystems like Azure Files (SMB).
+        unix-none is safe because we run a single replica (maxReplicas=1) on one
+        shared connection. Avoids POSIX locking which fails on network filesystems
+        like Azure Files (SMB).
         """
+        if SQLITE_FILE_LOCKING:
+            # Lock waits are set by the busy_timeout pragma on connect
+            return sqlite3.connect(f"file:{_db_path}", uri=True, check_same_thread=False)
         return sqlite3.connect(
             f"file:{_db_path}?vfs=unix-none",
             uri=True,
@@ -46,18 +104,33 @@ if DATABASE_URL.startswith("sqlite"):
         )
 
     _engine_kwargs["creator"] = _sqlite_creator
-    _engine_kwargs["poolclass"] = StaticPool
-    engine = create_engine("sqlite://", **_engine_kwargs)
+    engine = create_engine("sqlite://", **_engine_kwargs, **_sqlite_pool_kwargs())
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **_engine_kwargs, **_server_pool_kwargs())
 
 if DATABASE_URL.startswith("sqlite"):
+    # synchronous=NORMAL still syncs at the critical points of each commit, just less often
+    # than FULL; set SQLITE_SYNCHRONOUS=FULL for the strictest durability. SQLITE_MMAP_SIZE=0
+    # turns memory-mapped reads off where the filesystem can't support them. Writers that
+    # find the database locked retry for SQLITE_BUSY_TIMEOUT_MS instead of failing at once
+    # with "database is locked".
+    _SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    if _SQLITE_SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {_SQLITE_SYNCHRONOUS}")
+    _SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    _SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
     @event.listens_for(engine, "connect")
     def _set_sqlite_pragma(dbapi_conn, _connection_record):  # noqa: ANN001, ANN202
-        """Configure SQLite for network filesystem compatibility."""
+        """Configure SQLite for network filesystem compatibility and fewer disk round-trips."""
         cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=DELETE")  # WAL not supported on SMB
+        # WAL needs working locks and shared memory, so SMB stays on DELETE
+        cursor.execute(f"PRAGMA journal_mode={'WAL' if SQLITE_FILE_LOCKING else 'DELETE'}")
+        cursor.execute(f"PRAGMA synchronous={_SQLITE_SYNCHRONOUS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache, up from 2 MB
+        cursor.execute(f"PRAGMA mmap_size={_SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={_SQLITE_BUSY_TIMEOUT_MS}")
         cursor.close()
 
 
@@ -128,6 +201,16 @@ class World(Base):
     """Story world / universe model."""
 
     __tablename__ = "worlds"
+    __table_args__ = (
+        # Public world list: built-in first, newest first. Predicate matches the query's
+        # rendered "visibility = ? OR is_builtin IS 1" so SQLite can use the partial index.
+        Index(
+            "ix_worlds_public",
+            "is_builtin",
+            "created_at",
+            sqlite_where=text("visibility = 'public' OR is_builtin IS 1"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # NULL for built-in
@@ -152,6 +235,25 @@ class Story(Base):
     """Story project model."""
 
     __tablename__ = "stories"
+    __table_args__ = (
+        # Public feed: ORDER BY net_score DESC, created_at DESC over public completed stories
+        Index(
+            "ix_stories_public_feed",
+            "net_score",
+            "created_at",
+            sqlite_where=text("visibility = 'public' AND status = 'completed'"),
+        ),
+        # Same feed filtered by language
+        Index(
+            "ix_stories_language_feed",
+            "language",
+            "net_score",
+            "created_at",
+            sqlite_where=text("visibility = 'public' AND status = 'completed'"),
+        ),
+        # Owner's story list: WHERE user_id = ? ORDER BY created_at DESC, read in index order
+        Index("ix_stories_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     public_id = Column(String(36), unique=True, nullable=False, index=True)
@@ -169,6 +271,7 @@ class Story(Base):
     share_code = Column(String(36), unique=True, nullable=True, index=True)
     upvotes = Column(Integer, default=0)
     downvotes = Column(Integer, default=0)
+    net_score = Column(Integer, Computed("upvotes - downvotes", persisted=False))  # Generated, read-only
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -185,6 +288,10 @@ class Chapter(Base):
     """Chapter model for a story."""
 
     __tablename__ = "chapters"
+    __table_args__ = (
+        # One row per chapter number; serves single-chapter lookups and story_id joins
+        Index("ix_chapter_story_number", "story_id", "chapter_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     story_id = Column(Integer, ForeignKey("stories.id"), nullable=False)
@@ -192,6 +299,7 @@ class Chapter(Base):
     title = Column(String(255), nullable=True)
     script_json = Column(Text, nullable=True)  # Base script
     enhanced_json = Column(Text, nullable=True)  # With emotion tags
+    speakers_json = Column(Text, nullable=True)  # Speakers of the effective script, in first-appearance order
     audio_path = Column(String(500), nullable=True)
     audio_duration = Column(Float, nullable=True)  # Duration in seconds
     line_audio_json = Column(Text, nullable=True)  # JSON: {"0": "42/ch1/line_0.mp3", ...}
@@ -213,10 +321,14 @@ class Vote(Base):
     """User vote on a story."""
 
     __tablename__ = "votes"
-    __table_args__ = (UniqueConstraint("user_id", "story_id", name="uq_user_story_vote"),)
+    __table_args__ = (
+        # On PostgreSQL the unique index also carries vote_type, so the viewer's vote on a
+        # story page is an index-only read. Its user_id prefix serves per-user lookups too.
+        UniqueConstraint("user_id", "story_id", name="uq_user_story_vote", postgresql_include=["vote_type"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     story_id = Column(Integer, ForeignKey("stories.id"), nullable=False, index=True)
     vote_type = Column(String(10), nullable=False)  # "up" or "down"
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -229,10 +341,11 @@ class Report(Base):
     """User report on a story."""
 
     __tablename__ = "reports"
+    # The unique index's user_id prefix serves per-user lookups
     __table_args__ = (UniqueConstraint("user_id", "story_id", name="uq_user_story_report"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     story_id = Column(Integer, ForeignKey("stories.id"), nullable=False, index=True)
     reason = Column(Text, nullable=False)
     status = Column(String(20), default="pending")
@@ -246,10 +359,11 @@ class Bookmark(Base):
     """User bookmark on a story."""
 
     __tablename__ = "bookmarks"
+    # The unique index's user_id prefix serves per-user lookups
     __table_args__ = (UniqueConstraint("user_id", "story_id", name="uq_user_story_bookmark"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     story_id = Column(Integer, ForeignKey("stories.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -261,10 +375,11 @@ class Follow(Base):
     """Follow relationship between users."""
 
     __tablename__ = "follows"
+    # The unique index's follower_id prefix serves per-follower lookups
     __table_args__ = (UniqueConstraint("follower_id", "following_id", name="uq_follower_following"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    follower_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    follower_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     following_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -273,10 +388,11 @@ class Block(Base):
     """Block relationship between users."""
 
     __tablename__ = "blocks"
+    # The unique index's blocker_id prefix serves per-blocker lookups
     __table_args__ = (UniqueConstraint("blocker_id", "blocked_id", name="uq_blocker_blocked"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    blocker_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    blocker_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     blocked_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -315,14 +431,8 @@ FREE_AUDIO_PER_USER = 5
 COST_PER_STORY = 0.05
 
 
-def _seed_paw_patrol_world(db: Session) -> None:
-    """Seed the built-in PAW Patrol world."""
-    import json
-
-    if db.query(World).filter(World.is_builtin.is_(True), World.name == "PAW Patrol").first():
-        return
-
-    characters = {
+_PAW_PATROL_CHARACTERS_JSON = json.dumps(
+    {
         "NARRATOR": "Tells the story",
         "RYDER": "The human leader of the PAW Patrol",
         "CHASE": "Police pup, brave and loyal",
@@ -333,7 +443,9 @@ def _seed_paw_patrol_world(db: Session) -> None:
         "ZUMA": "Water rescue pup, laid-back and cool",
         "EVEREST": "Snow rescue pup, adventurous",
     }
-    valid_speakers = [
+)
+_PAW_PATROL_SPEAKERS_JSON = json.dumps(
+    [
         "NARRATOR",
         "RYDER",
         "CHASE",
@@ -344,6 +456,14 @@ def _seed_paw_patrol_world(db: Session) -> None:
         "ZUMA",
         "EVEREST",
     ]
+)
+
+
+def _seed_paw_patrol_world(existing: AbstractSet[str]) -> World | None:
+    """Build the built-in PAW Patrol world, or None if a built-in world of that name is in *existing*."""
+    if "PAW Patrol" in existing:
+        return None
+
     prompt_template = (
         "Write a story aimed for 4-8 year old kids, which involves the PAW Patrol "
         "in a new adventure. They meet a new pup, who speaks a different language "
@@ -360,23 +480,16 @@ def _seed_paw_patrol_world(db: Session) -> None:
         description="The classic PAW Patrol language learning world with Ryder and all the pups.",
         is_builtin=True,
         prompt_template=prompt_template,
-        characters_json=json.dumps(characters),
-        valid_speakers_json=json.dumps(valid_speakers),
+        characters_json=_PAW_PATROL_CHARACTERS_JSON,
+        valid_speakers_json=_PAW_PATROL_SPEAKERS_JSON,
         voice_config_json=None,
         visibility="public",
     )
-    db.add(world)
-    db.commit()
-
+    return world
 
-def _seed_winnie_the_pooh_world(db: Session) -> None:
-    """Seed the built-in Winnie the Pooh world."""
-    import json
 
-    if db.query(World).filter(World.is_builtin.is_(True), World.name == "Winnie the Pooh").first():
-        return
-
-    characters = {
+_WINNIE_THE_POOH_CHARACTERS_JSON = json.dumps(
+    {
         "NARRATOR": "Tells the story in a warm, storybook tone",
         "WINNIE": "Winnie the Pooh, a lovable bear of very little brain who adores honey",
         "PIGLET": "Pooh's best friend, small and timid but brave when it counts",
@@ -388,7 +501,9 @@ def _seed_winnie_the_pooh_world(db: Session) -> None:
         "ROO": "Kanga's adventurous little joey",
         "CHRISTOPHER_ROBIN": "The human child who is friends with everyone in the Hundred Acre Wood",
     }
-    valid_speakers = [
+)
+_WINNIE_THE_POOH_SPEAKERS_JSON = json.dumps(
+    [
         "NARRATOR",
         "WINNIE",
         "PIGLET",
@@ -400,6 +515,14 @@ def _seed_winnie_the_pooh_world(db: Session) -> None:
         "ROO",
         "CHRISTOPHER_ROBIN",
     ]
+)
+
+
+def _seed_winnie_the_pooh_world(existing: AbstractSet[str]) -> World | None:
+    """Build the built-in Winnie the Pooh world, or None if a built-in world of that name is in *existing*."""
+    if "Winnie the Pooh" in existing:
+        return None
+
     prompt_template = (
         "Write a gentle, whimsical children's story set in the Hundred Acre Wood "
         "with Winnie the Pooh and friends. The characters meet a new visitor who "
@@ -422,23 +545,16 @@ def _seed_winnie_the_pooh_world(db: Session) -> None:
         ),
         is_builtin=True,
         prompt_template=prompt_template,
-        characters_json=json.dumps(characters),
-        valid_speakers_json=json.dumps(valid_speakers),
+        characters_json=_WINNIE_THE_POOH_CHARACTERS_JSON,
+        valid_speakers_json=_WINNIE_THE_POOH_SPEAKERS_JSON,
         voice_config_json=None,  # No default voice assignments yet
         visibility="public",
     )
-    db.add(world)
-    db.commit()
-
-
-def _seed_bluey_world(db: Session) -> None:
-    """Seed the built-in Bluey world."""
-    import json
+    return world
 
-    if db.query(World).filter(World.is_builtin.is_(True), World.name == "Bluey").first():
-        return
 
-    characters = {
+_BLUEY_CHARACTERS_JSON = json.dumps(
+    {
         "NARRATOR": "Tells the story in a bright, Australian-flavoured tone",
         "BLUEY": "A six-year-old Blue Heeler puppy, imaginative and full of energy",
         "BINGO": "Bluey's younger sister, sweet, creative, and a little more sensitive",
@@ -451,7 +567,9 @@ def _seed_bluey_world(db: Session) -> None:
         "MACKENZIE": "Bluey's school friend, a Greyhound with a New Zealand accent",
         "CALYPSO": "Bluey's wise and calm school teacher",
     }
-    valid_speakers = [
+)
+_BLUEY_SPEAKERS_JSON = json.dumps(
+    [
         "NARRATOR",
         "BLUEY",
         "BINGO",
@@ -464,6 +582,14 @@ def _seed_bluey_world(db: Session) -> None:
         "MACKENZIE",
         "CALYPSO",
     ]
+)
+
+
+def _seed_bluey_world(existing: AbstractSet[str]) -> World | None:
+    """Build the built-in Bluey world, or None if a built-in world of that name is in *existing*."""
+    if "Bluey" in existing:
+        return None
+
     prompt_template = (
         "Write a fun, heartfelt children's story featuring Bluey and her family "
         "and friends. In this adventure the Heeler family meets someone who speaks "
@@ -486,23 +612,16 @@ def _seed_bluey_world(db: Session) -> None:
         ),
         is_builtin=True,
         prompt_template=prompt_template,
-        characters_json=json.dumps(characters),
-        valid_speakers_json=json.dumps(valid_speakers),
+        characters_json=_BLUEY_CHARACTERS_JSON,
+        valid_speakers_json=_BLUEY_SPEAKERS_JSON,
         voice_config_json=None,
         visibility="public",
     )
-    db.add(world)
-    db.commit()
+    return world
 
 
-def _seed_peppa_pig_world(db: Session) -> None:
-    """Seed the built-in Peppa Pig world."""
-    import json
-
-    if db.query(World).filter(World.is_builtin.is_(True), World.name == "Peppa Pig").first():
-        return
-
-    characters = {
+_PEPPA_PIG_CHARACTERS_JSON = json.dumps(
+    {
         "NARRATOR": "Tells the story in a cheerful, simple narrator voice",
         "PEPPA": "Peppa Pig, a cheeky little pig who loves jumping in muddy puddles",
         "GEORGE": "Peppa's little brother, loves his dinosaur and says 'Dine-saw!' a lot",
@@ -517,7 +636,9 @@ def _seed_peppa_pig_world(db: Session) -> None:
         "GRANDPA_PIG": "Peppa's grandpa, loves his garden, his boat, and telling stories",
         "GRANNY_PIG": "Peppa's granny, loves her chickens and baking",
     }
-    valid_speakers = [
+)
+_PEPPA_PIG_SPEAKERS_JSON = json.dumps(
+    [
         "NARRATOR",
         "PEPPA",
         "GEORGE",
@@ -532,6 +653,14 @@ def _seed_peppa_pig_world(db: Session) -> None:
         "GRANDPA_PIG",
         "GRANNY_PIG",
     ]
+)
+
+
+def _seed_peppa_pig_world(existing: AbstractSet[str]) -> World | None:
+    """Build the built-in Peppa Pig world, or None if a built-in world of that name is in *existing*."""
+    if "Peppa Pig" in existing:
+        return None
+
     prompt_template = (
         "Write a simple, cheerful children's story featuring Peppa Pig and her "
         "family and friends. In this adventure, Peppa meets someone who speaks "
@@ -555,43 +684,24 @@ def _seed_peppa_pig_world(db: Session) -> None:
         ),
         is_builtin=True,
         prompt_template=prompt_template,
-        characters_json=json.dumps(characters),
-        valid_speakers_json=json.dumps(valid_speakers),
+        characters_json=_PEPPA_PIG_CHARACTERS_JSON,
+        valid_speakers_json=_PEPPA_PIG_SPEAKERS_JSON,
         voice_config_json=None,
         visibility="public",
     )
-    db.add(world)
-    db.commit()
+    return world
 
 
-def _seed_elara_and_arion_world(db: Session) -> None:
-    """Seed the built-in Elara and Arion world."""
-    import json
-
-    if db.query(World).filter(World.is_builtin.is_(True), World.name == "Elara and Arion").first():
-        return
-
-    characters = {
+_ELARA_AND_ARION_CHARACTERS_JSON = json.dumps(
+    {
         "NARRATOR": "Tells the story",
         "ELARA": "Elara, an energetic 4-year-old girl who is smart, kind, and very creative",
         "ARION": "Arion, a fun and energetic almost 2-year-old boy who loves cars, animals, and running around",
     }
-    valid_speakers = ["NARRATOR", "ELARA", "ARION"]
-    prompt_template = (
-        "Write a story aimed for 4-8 year old kids. It is built around the world of "
-        "Elara and Arion. Elara and Arion are siblings. Elara is an energetic 4yo girl. "
-        "She is smart and kind and very creative. Arion is a fun and energetic almost "
-        "2 year old boy. He loves cars and anything that moves, animals and running "
-        "around. Elara and Arion play a lot of games and go to playground, daycare/school, "
-        "swimming class, and they love each other and their mommy and daddies. Their mom "
-        "and dads also love them, and they have the most cozy, magical and amazing days "
-        "and nights.\n\nElara and Arion have lots of friends, and they play with them "
-        "all the time.\n\nThis story is about {theme}. The characters learn basic "
-        "{language} words and phrases. The plot is: {plot}. Keep the story in "
-        "{num_chapters} chapters."
-    )
-
-    voice_config = {
+)
+_ELARA_AND_ARION_SPEAKERS_JSON = json.dumps(["NARRATOR", "ELARA", "ARION"])
+_ELARA_AND_ARION_VOICE_CONFIG_JSON = json.dumps(
+    {
         "NARRATOR": {
             "voice_id": "8Es4wFxsDlHBmFWAOWRS",
             "stability": 0.5,
@@ -614,6 +724,27 @@ def _seed_elara_and_arion_world(db: Session) -> None:
             "use_speaker_boost": True,
         },
     }
+)
+
+
+def _seed_elara_and_arion_world(existing: AbstractSet[str]) -> World | None:
+    """Build the built-in Elara and Arion world, or None if a built-in world of that name is in *existing*."""
+    if "Elara and Arion" in existing:
+        return None
+
+    prompt_template = (
+        "Write a story aimed for 4-8 year old kids. It is built around the world of "
+        "Elara and Arion. Elara and Arion are siblings. Elara is an energetic 4yo girl. "
+        "She is smart and kind and very creative. Arion is a fun and energetic almost "
+        "2 year old boy. He loves cars and anything that moves, animals and running "
+        "around. Elara and Arion play a lot of games and go to playground, daycare/school, "
+        "swimming class, and they love each other and their mommy and daddies. Their mom "
+        "and dads also love them, and they have the most cozy, magical and amazing days "
+        "and nights.\n\nElara and Arion have lots of friends, and they play with them "
+        "all the time.\n\nThis story is about {theme}. The characters learn basic "
+        "{language} words and phrases. The plot is: {plot}. Keep the story in "
+        "{num_chapters} chapters."
+    )
 
     world = World(
         user_id=None,
@@ -626,13 +757,27 @@ def _seed_elara_and_arion_world(db: Session) -> None:
         ),
         is_builtin=True,
         prompt_template=prompt_template,
-        characters_json=json.dumps(characters),
-        valid_speakers_json=json.dumps(valid_speakers),
-        voice_config_json=json.dumps(voice_config),
+        characters_json=_ELARA_AND_ARION_CHARACTERS_JSON,
+        valid_speakers_json=_ELARA_AND_ARION_SPEAKERS_JSON,
+        voice_config_json=_ELARA_AND_ARION_VOICE_CONFIG_JSON,
         visibility="public",
     )
-    db.add(world)
-    db.commit()
+    return world
+
+
+# Built once; init_db reuses it so the statement's cache key is ready on every boot. Spelled
+# operators.is_ rather than .is_(): mypy defers a module-level method call on a legacy Column,
+# which leaves the type of every cached function below undetermined for importers.
+_BUILTIN_WORLD_NAMES: Select[tuple[str]] = select(World.name).where(operators.is_(World.is_builtin, True))
+
+# Built-in world name -> seeder building it
+_BUILTIN_WORLD_SEEDERS: dict[str, Callable[[AbstractSet[str]], World | None]] = {
+    "PAW Patrol": _seed_paw_patrol_world,
+    "Winnie the Pooh": _seed_winnie_the_pooh_world,
+    "Bluey": _seed_bluey_world,
+    "Peppa Pig": _seed_peppa_pig_world,
+    "Elara and Arion": _seed_elara_and_arion_world,
+}
 
 
 def _get_app_version() -> str:
@@ -695,14 +840,30 @@ def _copy_bundled_voices_config() -> None:
         logger.info("Copied default voices_config.json to %s", target)
 
 
+@functools.cache
+def _alembic_config() -> Config:
+    """Return the project's parsed alembic.ini."""
+    from pathlib import Path
+
+    from alembic.config import Config
+
+    return Config(str(Path(__file__).resolve().parent.parent.parent / "alembic.ini"))
+
+
+@functools.cache
+def alembic_head() -> str | None:
+    """Return the newest migration revision, scanning the versions directory once per process."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
 def init_db() -> None:
     """Initialize the database tables via Alembic and seed data."""
     import logging
-    from pathlib import Path
 
     import sqlalchemy
     from alembic import command
-    from alembic.config import Config
 
     logger = logging.getLogger(__name__)
 
@@ -713,23 +874,25 @@ def init_db() -> None:
     if skip_migrations:
         logger.info("Version unchanged (%s), skipping migrations and seeding", current_version)
     else:
-        alembic_cfg = Config(str(Path(__file__).resolve().parent.parent.parent / "alembic.ini"))
+        alembic_cfg = _alembic_config()
 
         inspector = sqlalchemy.inspect(engine)
         existing_tables = inspector.get_table_names()
         has_app_tables = "users" in existing_tables
 
         # Check if Alembic is tracking this DB (has a stamped revision)
-        has_alembic_stamp = False
+        stamped_revision = None
         if "alembic_version" in existing_tables:
             with engine.connect() as conn:
-                result = conn.execute(sqlalchemy.text("SELECT version_num FROM alembic_version"))
-                has_alembic_stamp = result.first() is not None
+                stamped_revision = conn.execute(sqlalchemy.text("SELECT version_num FROM alembic_version")).scalar()
 
-        if has_app_tables and not has_alembic_stamp:
+        if has_app_tables and stamped_revision is None:
             # Existing DB without Alembic tracking — stamp as current
             logger.info("Existing database detected without alembic tracking — stamping head")
             command.stamp(alembic_cfg, "head")
+        elif stamped_revision == alembic_head():
+            # Already at head (e.g. another worker migrated it) — skip loading env.py
+            logger.info("Database already at head %s, skipping migrations", stamped_revision)
         else:
             # Fresh DB or already tracked — run migrations
             command.upgrade(alembic_cfg, "head")
@@ -742,11 +905,12 @@ def init_db() -> None:
             db.commit()
 
         if not skip_migrations:
-            _seed_paw_patrol_world(db)
-            _seed_winnie_the_pooh_world(db)
-            _seed_bluey_world(db)
-            _seed_peppa_pig_world(db)
-            _seed_elara_and_arion_world(db)
+            # One lookup for every built-in world; the seeders only run when one is missing,
+            # and whatever they build is committed together
+            existing = set(db.scalars(_BUILTIN_WORLD_NAMES))
+            if not existing.issuperset(_BUILTIN_WORLD_SEEDERS):
+                db.add_all(world for seed in _BUILTIN_WORLD_SEEDERS.values() if (world := seed(existing)) is not None)
+                db.commit()
 
             # Write version file after successful init
             _write_version_file(current_version)
@@ -765,3 +929,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def upsert_insert(db: Session, entity: type[Base]) -> SQLiteInsert | PostgresInsert:
+    """Return an INSERT for the session's dialect that supports ON CONFLICT clauses.
+
+    SQLite and PostgreSQL share the on_conflict_do_nothing/do_update API, but each
+    dialect has its own Insert construct.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgres_insert(entity)
+    return sqlite_insert(entity)
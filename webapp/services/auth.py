@@ -106,6 +106,14 @@ def get_user_by_username(db: Session, username: str) -> User | None:
     return db.query(User).filter(User.username == username).first()
 
 
+def get_user_from_token(db: Session, token: str) -> User | None:
+    """Return the user a JWT belongs to, or None if the token is invalid."""
+    token_data = decode_token(token)
+    if token_data is None or token_data.user_id is None:
+        return None
+    return get_user_by_id(db, token_data.user_id)
+
+
 def get_user_by_id(db: Session, user_id: int) -> User | None:
     """Look up a user by ID."""
     return db.query(User).filter(User.id == user_id).first()
@@ -174,8 +182,4 @@ async def get_current_user_optional(
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         return None
-    token = auth_header[7:]
-    token_data = decode_token(token)
-    if token_data is None or token_data.user_id is None:
-        return None
-    return get_user_by_id(db, token_data.user_id)
+    return get_user_from_token(db, auth_header[7:])
@@ -0,0 +1,195 @@
+"""
+Combined-audio downloads — concatenate a story's chapter MP3s for download.
+
+ffmpeg writes the concatenated MP3 to stdout, which is streamed straight to
+the client, so the event loop is never blocked waiting for the transcode.
+Local copies of remote chapter files (S3, Azure) stay on disk until the
+response has been fully sent. If ffmpeg produces no output for
+``FFMPEG_TIMEOUT`` seconds it is killed and its files released; a slow client
+only paces the reads and never trips the timeout.
+
+While streaming, the bytes are also teed into a local cache file keyed by a
+hash of the chapter set (storage keys + each chapter's audio version). Later
+downloads of an unchanged story are served straight from that file without
+touching storage or spawning ffmpeg.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AbstractContextManager, ExitStack
+from pathlib import Path
+from typing import IO
+from urllib.parse import quote
+
+from fastapi import HTTPException, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from webapp.models.database import Chapter
+from webapp.services.storage import get_storage
+
+_CHUNK_SIZE = 64 * 1024
+
+FFMPEG_TIMEOUT = 120
+
+COMBINED_AUDIO_CACHE_DIR = Path(
+    os.getenv("COMBINED_AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "lingolou-combined-audio"))
+)
+
+
+def _content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header the same way FileResponse does."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _cache_path(story_id: int, keys: list[str], chapters: Sequence[Chapter]) -> Path:
+    """Return the cache file for this exact chapter set; any audio change yields a new name."""
+    parts = [
+        f"{key}:{ch.audio_path}:{ch.updated_at.isoformat() if ch.updated_at else ''}"
+        for key, ch in zip(keys, chapters, strict=True)
+    ]
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+    return COMBINED_AUDIO_CACHE_DIR / str(story_id) / f"{digest}.mp3"
+
+
+def _publish(tmp_path: Path, cache_path: Path) -> None:
+    """Atomically move a finished build into place and drop older builds for the story."""
+    tmp_path.replace(cache_path)
+    for stale in cache_path.parent.glob("*.mp3"):
+        if stale != cache_path:
+            stale.unlink(missing_ok=True)
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill ffmpeg if it is still running."""
+    if proc.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+
+
+async def _read(proc: asyncio.subprocess.Process) -> bytes:
+    """Read the next chunk of ffmpeg's stdout; raise TimeoutError if none arrives within FFMPEG_TIMEOUT."""
+    assert proc.stdout is not None
+    return await asyncio.wait_for(proc.stdout.read(_CHUNK_SIZE), timeout=FFMPEG_TIMEOUT)
+
+
+async def enter_local_paths(stack: ExitStack, keys: Sequence[str]) -> list[Path | None]:
+    """Resolve local copies of storage keys concurrently, in key order.
+
+    Each storage.get_path context is entered in a worker thread, so remote
+    downloads overlap instead of running back to back. Every entered context is
+    pushed onto ``stack`` and released when it closes, even if another key fails.
+    """
+    storage = get_storage()
+
+    def enter(key: str) -> tuple[AbstractContextManager[Path | None], Path | None]:
+        cm = storage.get_path(key)
+        return cm, cm.__enter__()
+
+    results = await asyncio.gather(*(asyncio.to_thread(enter, key) for key in keys), return_exceptions=True)
+    paths: list[Path | None] = []
+    for result in results:
+        if not isinstance(result, BaseException):
+            cm, path = result
+            stack.push(cm)
+            paths.append(path)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return paths
+
+
+async def _stream_stdout(
+    proc: asyncio.subprocess.Process,
+    first_chunk: bytes,
+    stack: ExitStack,
+    tee: IO[bytes],
+    cache_path: Path,
+) -> AsyncIterator[bytes]:
+    """Yield ffmpeg's stdout while teeing it to the cache, then reap the process and release files.
+
+    A stalled ffmpeg's TimeoutError aborts the response; ffmpeg is killed all the same.
+    """
+    completed = False
+    try:
+        chunk = first_chunk
+        while chunk:
+            tee.write(chunk)
+            yield chunk
+            chunk = await _read(proc)
+        completed = True
+    finally:
+        _kill(proc)
+        await proc.wait()
+        tee.close()
+        # Only a full, successful transcode becomes the cached copy
+        if completed and proc.returncode == 0:
+            _publish(Path(tee.name), cache_path)
+        stack.close()
+
+
+async def combined_audio_response(story_id: int, chapters: Sequence[Chapter], filename: str) -> Response:
+    """Return a download response for the chapters' audio files, in the given order.
+
+    A single file or a cached build is sent directly; otherwise the files are
+    concatenated by ffmpeg and streamed. Raises 404 if none of the files exist
+    and 500 if ffmpeg produces no output within the timeout.
+    """
+    # Use internal integer ID for storage keys
+    keys = [f"{story_id}/ch{ch.chapter_number}.mp3" for ch in chapters]
+    cache_path = _cache_path(story_id, keys, chapters)
+    if len(keys) > 1 and cache_path.exists():
+        return FileResponse(str(cache_path), media_type="audio/mpeg", filename=filename)
+
+    # Everything entered on the stack is released on error, or handed to the response on success
+    with ExitStack() as stack:
+        paths = [p for p in await enter_local_paths(stack, keys) if p]
+        if not paths:
+            raise HTTPException(status_code=404, detail="Audio file not found")
+
+        if len(paths) == 1:
+            return FileResponse(
+                str(paths[0]),
+                media_type="audio/mpeg",
+                filename=filename,
+                background=BackgroundTask(stack.pop_all().close),
+            )
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.writelines(f"file '{p}'\n" for p in paths)
+        stack.callback(os.unlink, f.name)
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tee = stack.enter_context(tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".part", delete=False))
+        stack.callback(Path(tee.name).unlink, missing_ok=True)
+
+        proc = await asyncio.create_subprocess_exec(
+            *["ffmpeg", "-f", "concat", "-safe", "0", "-i", f.name, "-c", "copy", "-f", "mp3", "pipe:1"],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stack.callback(_kill, proc)
+        # Read the first chunk before committing to a 200 so a failed concat is still a clean error
+        try:
+            first_chunk = await _read(proc)
+        except TimeoutError:
+            first_chunk = b""
+            _kill(proc)
+        if not first_chunk:
+            await proc.wait()
+            raise HTTPException(status_code=500, detail="Failed to combine audio files")
+
+        return StreamingResponse(
+            _stream_stdout(proc, first_chunk, stack.pop_all(), tee, cache_path),
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": _content_disposition(filename)},
+        )
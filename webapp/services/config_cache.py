@@ -0,0 +1,53 @@
+"""
+In-process cache for the small JSON config files read by API handlers.
+
+story_config.json and voices_config.json are tiny and rarely change, but were
+re-read and re-parsed on every request. Entries are keyed by path and
+validated against the file's mtime, so an edited file is picked up on the
+next request. Only the stat runs on the event loop; a miss reads and parses
+in a worker thread.
+
+Cached values are shared between requests — callers must not mutate them.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import anyio
+
+_CONFIG_CACHE: dict[Path, tuple[int, Any]] = {}
+
+
+def _read_json(path: Path) -> Any:
+    """Read and parse a JSON file (blocking)."""
+    with open(path) as f:
+        return json.load(f)
+
+
+async def load_json_cached(path: Path) -> Any | None:
+    """Return the parsed contents of a JSON file, or None if it does not exist."""
+    loaded = await load_json_versioned(path)
+    return loaded[1] if loaded else None
+
+
+async def load_json_versioned(path: Path) -> tuple[int, Any] | None:
+    """Return (mtime_ns, parsed contents) of a JSON file, or None if it does not exist.
+
+    The mtime doubles as a version key for conditional GETs.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        _CONFIG_CACHE.pop(path, None)
+        return None
+
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached
+
+    value = await anyio.to_thread.run_sync(_read_json, path)
+    _CONFIG_CACHE[path] = (mtime_ns, value)
+    return mtime_ns, value
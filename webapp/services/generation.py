@@ -6,15 +6,17 @@ Uses pluggable task store (in-memory or Redis) with FastAPI BackgroundTasks.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
 import os
 import subprocess
 import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -23,12 +25,27 @@ if TYPE_CHECKING:
 
 import urllib.request
 
+import orjson
+
 from webapp.models.database import Chapter, SessionLocal, Story, UsageLog, World
 from webapp.services.storage import get_storage
 from webapp.services.task_store import get_task_backend
 
 logger = logging.getLogger(__name__)
 
+# Story and audio generation run for minutes, so they get their own threads rather than
+# anyio's shared pool, where they would hold threads that request handling (sync
+# dependencies) and quick line regenerations need. Jobs beyond the limit wait as "pending".
+_GENERATION_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GENERATION_WORKERS", "8")), thread_name_prefix="generation"
+)
+
+
+async def run_in_generation_pool(func: Callable[..., None], /, **kwargs: Any) -> None:
+    """BackgroundTasks entry point running a long generation job on the dedicated pool."""
+    await asyncio.get_running_loop().run_in_executor(_GENERATION_POOL, functools.partial(func, **kwargs))
+
+
 # Keep-alive: prevent KEDA scale-to-zero during background tasks
 _keepalive_lock = threading.Lock()
 _keepalive_active = 0
@@ -65,6 +82,18 @@ def _stop_keepalive() -> None:
         _keepalive_active = max(0, _keepalive_active - 1)
 
 
+def script_speakers(script: Any) -> list[str]:
+    """Return the distinct speakers of a chapter script, in order of first appearance.
+
+    Stored in Chapter.speakers_json whenever a script is written, so readers that only
+    need the cast (e.g. the voice-config endpoint) never parse the full script. Anything
+    other than a list of entries has no speakers.
+    """
+    if not isinstance(script, list):
+        return []
+    return list(dict.fromkeys(s for entry in script if isinstance(entry, dict) and (s := entry.get("speaker"))))
+
+
 def generate_story(
     task_id: str,
     story_id: int,
@@ -105,9 +134,9 @@ def generate_story(
             world = db.query(World).filter(World.id == story.world_id).first()
             if world:
                 if world.characters_json:
-                    config["characters"] = json.loads(world.characters_json)
+                    config["characters"] = orjson.loads(world.characters_json)
                 if world.valid_speakers_json:
-                    config["valid_speakers"] = json.loads(world.valid_speakers_json)
+                    config["valid_speakers"] = orjson.loads(world.valid_speakers_json)
 
         # Inject language level from story model
         config["language_level"] = story.language_level or 3
@@ -117,7 +146,7 @@ def generate_story(
             config["target_language"] = {"name": story.language}
 
         if story.config_json:
-            override = json.loads(story.config_json)
+            override = orjson.loads(story.config_json)
             config.update(override)
 
         client = OpenAI(api_key=openai_api_key) if openai_api_key else OpenAI()
@@ -147,7 +176,7 @@ def generate_story(
 
             # Skip already-completed chapters (resume after restart)
             if chapter.script_json and chapter.status == "completed":
-                chapter_data = json.loads(chapter.script_json)
+                chapter_data = orjson.loads(chapter.script_json)
                 for entry in chapter_data:
                     if entry.get("type") == "line":
                         words_generated += len(entry.get("text", "").split())
@@ -198,7 +227,8 @@ def generate_story(
                 on_progress=_make_gen_cb(current_step, ch_num, words_generated),
             )
 
-            chapter.script_json = json.dumps(chapter_data, ensure_ascii=False)
+            chapter.script_json = orjson.dumps(chapter_data).decode()
+            chapter.speakers_json = orjson.dumps(script_speakers(chapter_data)).decode()
             chapter.title = next(
                 (e.get("title") for e in chapter_data if e.get("type") == "scene"), f"Chapter {ch_num}"
             )
@@ -244,7 +274,8 @@ def generate_story(
                     model,
                     on_progress=_make_enh_cb(current_step, ch_num, words_generated),
                 )
-                chapter.enhanced_json = json.dumps(enhanced_data, ensure_ascii=False)
+                chapter.enhanced_json = orjson.dumps(enhanced_data).decode()
+                chapter.speakers_json = orjson.dumps(script_speakers(enhanced_data)).decode()
                 db.commit()
                 current_step += 1
 
@@ -259,7 +290,7 @@ def generate_story(
         usage_log = UsageLog(
             user_id=user_id,
             action="story_generation",
-            details=json.dumps({"story_id": story_id, "num_chapters": num_chapters, "enhanced": enhance}),
+            details=orjson.dumps({"story_id": story_id, "num_chapters": num_chapters, "enhanced": enhance}).decode(),
         )
         db.add(usage_log)
 
@@ -332,7 +363,7 @@ def generate_audio(
         if story and story.world_id:
             world = db.query(World).filter(World.id == story.world_id).first()
             if world and world.voice_config_json:
-                world_voice_config = json.loads(world.voice_config_json)
+                world_voice_config = orjson.loads(world.voice_config_json)
 
         if world_voice_config:
             # Build voice map from world config, converting dicts to VoiceConfig
@@ -382,7 +413,7 @@ def generate_audio(
                 continue
             script_json = chapter.enhanced_json or chapter.script_json
             if script_json:
-                script = json.loads(script_json)
+                script = orjson.loads(script_json)
                 chapter_scripts[chapter_id] = script
                 total_entries += len(script)
         entries_done = 0
@@ -438,8 +469,8 @@ def generate_audio(
                 return _cb
 
             # Write temp script file
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                json.dump(script, f, ensure_ascii=False)
+            with tempfile.NamedTemporaryFile(mode="wb", suffix=".json", delete=False) as f:
+                f.write(orjson.dumps(script))
                 temp_script_path = f.name
 
             try:
@@ -487,7 +518,7 @@ def generate_audio(
                 chapter.audio_path = storage_key
                 chapter.audio_duration = duration
                 if line_audio_map:
-                    chapter.line_audio_json = json.dumps(line_audio_map)
+                    chapter.line_audio_json = orjson.dumps(line_audio_map).decode()
                 chapter.status = "completed"
                 db.commit()
 
@@ -498,7 +529,7 @@ def generate_audio(
         usage_log = UsageLog(
             user_id=user_id,
             action="audio_generation",
-            details=json.dumps({"story_id": story_id, "chapters": len(chapter_ids)}),
+            details=orjson.dumps({"story_id": story_id, "chapters": len(chapter_ids)}).decode(),
             characters_used=total_characters,
         )
         db.add(usage_log)
@@ -542,8 +573,8 @@ def rebuild_chapter_audio(story_id: int, chapter: Chapter, db: Session) -> None:
     if not script_json or not chapter.line_audio_json:
         return
 
-    script = json.loads(script_json)
-    line_map: dict[str, str] = json.loads(chapter.line_audio_json)
+    script = orjson.loads(script_json)
+    line_map: dict[str, str] = orjson.loads(chapter.line_audio_json)
 
     temp_dir = Path(tempfile.mkdtemp(prefix="rebuild_"))
     audio_files: list[str] = []
@@ -714,7 +745,7 @@ def regenerate_single_line(
         chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
         story = db.query(Story).filter(Story.id == story_id).first()
         script_json = (chapter.enhanced_json or chapter.script_json) if chapter else None
-        script = json.loads(script_json) if script_json else None
+        script = orjson.loads(script_json) if script_json else None
 
         fail_reason: str | None = None
         if not chapter or not chapter.line_audio_json:
@@ -741,7 +772,7 @@ def regenerate_single_line(
         if story.world_id:
             world = db.query(World).filter(World.id == story.world_id).first()
             if world and world.voice_config_json:
-                wvc = json.loads(world.voice_config_json)
+                wvc = orjson.loads(world.voice_config_json)
                 voice_map = {s: _dict_to_vc(v) for s, v in wvc.items() if isinstance(v, dict) and "voice_id" in v}
 
         if not voice_map:
@@ -786,9 +817,9 @@ def regenerate_single_line(
         storage.save(seg_key, audio_bytes)
 
         # Update line_audio_json map
-        line_map: dict[str, str] = json.loads(chapter.line_audio_json)
+        line_map: dict[str, str] = orjson.loads(chapter.line_audio_json)
         line_map[str(line_index)] = seg_key
-        chapter.line_audio_json = json.dumps(line_map)
+        chapter.line_audio_json = orjson.dumps(line_map).decode()
         db.commit()
 
         get_task_backend().update(task_id, "running", 60, "Rebuilding combined chapter audio...")
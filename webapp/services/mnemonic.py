@@ -39,6 +39,15 @@ def _get_reverse_maps() -> list[dict[str, int]]:
     return _REVERSE_MAPS
 
 
+def preload() -> None:
+    """Load the word lists ahead of first use.
+
+    Called on startup from a worker thread, so the first story created does not
+    read the JSON file on the event loop.
+    """
+    _get_reverse_maps()
+
+
 def encode(uuid_str: str) -> str:
     """Convert a UUID string to a 5-word mnemonic slug.
 
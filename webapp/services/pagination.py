@@ -0,0 +1,59 @@
+"""
+Keyset pagination shared by the list endpoints.
+
+Pages are ordered newest first on (created_at, id). A full page carries an
+X-Next-Cursor header holding the last row's position; clients pass it back as
+``cursor`` to continue after that row instead of re-reading the rows before it.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi import Query as QueryParam
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from webapp.models.database import Follow, Story, World
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """Decode a cursor from encode_cursor into (created_at, id), or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        ts_raw, id_raw = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts_raw), int(id_raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def page_headers(rows: Sequence[Follow | Story | World], limit: int) -> dict[str, str]:
+    """Return the X-Next-Cursor header for a full page (an empty dict on the last page)."""
+    if not rows or len(rows) < limit:
+        return {}
+    last = rows[-1]
+    return {"X-Next-Cursor": encode_cursor(last.created_at, last.id)}
+
+
+def seek(query: Query[Any], model: type[Story | World], position: tuple[datetime, int] | None) -> Query[Any]:
+    """Order newest first on (created_at, id) and continue after the cursor position, if any."""
+    if position:
+        ts, row_id = position
+        query = query.filter(or_(model.created_at < ts, and_(model.created_at == ts, model.id < row_id)))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def reject_skip(skip: int | None = QueryParam(None, include_in_schema=False)) -> None:
+    """Reject the old offset parameter, so a client still sending it doesn't get page one again."""
+    if skip is not None:
+        raise HTTPException(status_code=400, detail="skip is no longer supported; page with the X-Next-Cursor cursor")
@@ -0,0 +1,185 @@
+"""
+Read-through cache for serialized public API responses.
+
+Public read endpoints (budget, story/world lists, shared story/world pages)
+are hit on every page view. Their serialized JSON bodies are cached with short
+TTLs and dropped on writes that change public content, so a hit skips SQL,
+Pydantic and JSON encoding entirely. When REDIS_URL is set the cache lives in
+Redis and is shared by all instances; otherwise it is an in-process dict,
+which is correct for the single uvicorn process the app runs as.
+
+Cache failures never fail a request — a Redis error is logged and treated as
+a miss, so the endpoint falls through to the database.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import cast
+
+logger = logging.getLogger(__name__)
+
+# Every public response key starts with this; writes invalidate the whole namespace
+PUBLIC_PREFIX = "public:"
+
+_KEY_NAMESPACE = "respcache:"
+_MAX_CONNECTIONS = 20
+_MAX_MEMORY_ENTRIES = 1000
+
+
+class ResponseCache(ABC):
+    """Abstract interface for caching serialized response bodies."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for *key*, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Store *body* under *key* for *ttl* seconds."""
+
+    @abstractmethod
+    def invalidate(self, prefix: str) -> None:
+        """Drop every cached body whose key starts with *prefix*."""
+
+
+class NullResponseCache(ResponseCache):
+    """Disabled cache — every lookup misses (used by tests that read their own writes)."""
+
+    def get(self, key: str) -> bytes | None:
+        """Return None — the cache is disabled."""
+        return None
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Discard the body."""
+
+    def invalidate(self, prefix: str) -> None:
+        """Nothing to drop."""
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Bounded in-process cache — single-process only, lost on restart."""
+
+    def __init__(self, max_entries: int = _MAX_MEMORY_ENTRIES) -> None:
+        """Initialise an empty LRU store holding at most *max_entries* bodies."""
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for *key*, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Store *body* under *key* for *ttl* seconds, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefix: str) -> None:
+        """Drop every entry whose key starts with *prefix*."""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisResponseCache(ResponseCache):
+    """Redis-backed response cache shared by all app instances.
+
+    Each namespace (the key up to and including its first ":") has a
+    generation counter that is part of every stored key. Invalidation bumps the
+    counter with one INCR instead of scanning the keyspace; bodies stored under
+    the old generation are never read again and simply expire.
+    """
+
+    def __init__(self, redis_url: str) -> None:
+        """Create a bounded connection pool for the Redis instance at *redis_url*."""
+        import redis as _redis
+
+        pool = _redis.ConnectionPool.from_url(redis_url, max_connections=_MAX_CONNECTIONS)
+        self._r: _redis.Redis = _redis.Redis(connection_pool=pool)
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"{_KEY_NAMESPACE}gen:{namespace}"
+
+    def _versioned_key(self, key: str) -> str:
+        """Return the Redis key for *key* under its namespace's current generation."""
+        namespace = key.partition(":")[0] + ":"
+        generation = self._r.get(self._generation_key(namespace))
+        return f"{_KEY_NAMESPACE}{int(generation or 0)}:{key}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for *key*, or None on a miss or Redis error."""
+        import redis as _redis
+
+        try:
+            # Raw responses (no decode_responses), so hits are bytes
+            return cast("bytes | None", self._r.get(self._versioned_key(key)))
+        except _redis.RedisError:
+            logger.warning("Response cache read failed for %s", key, exc_info=True)
+            return None
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Store *body* under *key* for *ttl* seconds, ignoring Redis errors."""
+        import redis as _redis
+
+        try:
+            self._r.setex(self._versioned_key(key), ttl, body)
+        except _redis.RedisError:
+            logger.warning("Response cache write failed for %s", key, exc_info=True)
+
+    def invalidate(self, prefix: str) -> None:
+        """Start a new generation for the namespace *prefix*, ignoring Redis errors.
+
+        *prefix* must be a whole namespace such as ``PUBLIC_PREFIX``.
+        """
+        import redis as _redis
+
+        try:
+            self._r.incr(self._generation_key(prefix))
+        except _redis.RedisError:
+            logger.warning("Response cache invalidation failed for %s", prefix, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Singleton factory
+# ---------------------------------------------------------------------------
+
+_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the global ResponseCache singleton (lazy-initialised)."""
+    global _cache  # noqa: PLW0603
+    if _cache is None:
+        redis_url = os.environ.get("REDIS_URL")
+        _cache = RedisResponseCache(redis_url) if redis_url else InMemoryResponseCache()
+    return _cache
+
+
+def invalidate_public_responses() -> None:
+    """Drop all cached public responses after a write that changes public content."""
+    get_response_cache().invalidate(PUBLIC_PREFIX)
+
+
+def reset_response_cache() -> None:
+    """Reset the singleton — useful in tests."""
+    global _cache  # noqa: PLW0603
+    _cache = None
@@ -4,16 +4,27 @@ Pluggable task-status backends for background generation tasks.
 Provides an ABC with two implementations:
 - InMemoryTaskBackend  (default, for local dev)
 - RedisTaskBackend     (production, when REDIS_URL is set)
+
+Both publish every update so progress can be pushed to watchers (see
+TaskBackend.watch) instead of being polled.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
 import os
 import re
+import time
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, cast
+
+import orjson
+
+_ACTIVE_STATUSES = frozenset({"pending", "running"})
 
 
 class TaskBackend(ABC):
@@ -38,13 +49,35 @@ class TaskBackend(ABC):
         """Return the full task dict, or None if not found."""
 
     @abstractmethod
-    def find_active_for_story(self, story_id: int) -> dict[str, Any] | None:
-        """Return the most-recently-updated active (pending/running) task for *story_id*."""
+    def find_active_for_story(self, story_id: int, kind: str | None = None) -> dict[str, Any] | None:
+        """Return the most-recently-updated active (pending/running) task for *story_id*.
+
+        *kind* ("story" or "audio") restricts the search to that task type.
+        """
 
     @abstractmethod
     def cancel(self, task_id: str) -> bool:
         """Mark task as cancelled. Returns True if the task was pending/running."""
 
+    @abstractmethod
+    def _subscribe(self, task_id: str) -> AbstractAsyncContextManager[AsyncIterator[dict[str, Any]]]:
+        """Return a context manager yielding the task's entries as they are published."""
+
+    async def watch(self, task_id: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield the task's current entry, then each update until it is no longer active.
+
+        Subscribes before reading the current state, so no update can slip in between.
+        Yields nothing if the task does not exist.
+        """
+        async with self._subscribe(task_id) as updates:
+            entry = self.get(task_id)
+            while entry is not None:
+                finished = entry["status"] not in _ACTIVE_STATUSES
+                yield entry
+                if finished:
+                    return
+                entry = await anext(updates)
+
 
 # ---------------------------------------------------------------------------
 # In-memory implementation (default, matches previous behaviour)
@@ -57,6 +90,32 @@ class InMemoryTaskBackend(TaskBackend):
     def __init__(self) -> None:
         """Initialise empty in-memory store."""
         self._store: dict[str, dict[str, Any]] = {}
+        self._watchers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue[dict[str, Any]]]]] = {}
+
+    def _publish(self, task_id: str) -> None:
+        """Hand the task's entry to its watchers; updates may come from worker threads."""
+        entry = self._store[task_id]
+        for loop, queue in tuple(self._watchers.get(task_id, ())):
+            with contextlib.suppress(RuntimeError):  # watcher's loop already closed
+                loop.call_soon_threadsafe(queue.put_nowait, dict(entry))
+
+    @asynccontextmanager
+    async def _subscribe(self, task_id: str) -> AsyncIterator[AsyncIterator[dict[str, Any]]]:
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        watcher = (asyncio.get_running_loop(), queue)
+        self._watchers.setdefault(task_id, set()).add(watcher)
+
+        async def updates() -> AsyncIterator[dict[str, Any]]:
+            while True:
+                yield await queue.get()
+
+        try:
+            yield updates()
+        finally:
+            watchers = self._watchers.get(task_id, set())
+            watchers.discard(watcher)
+            if not watchers:
+                self._watchers.pop(task_id, None)
 
     def update(
         self,
@@ -80,14 +139,15 @@ class InMemoryTaskBackend(TaskBackend):
             "estimated_total_words": estimated_total_words,
             "updated_at": datetime.now(UTC).isoformat(),
         }
+        self._publish(task_id)
 
     def get(self, task_id: str) -> dict[str, Any] | None:
         """Return the full task dict, or None if not found."""
         return self._store.get(task_id)
 
-    def find_active_for_story(self, story_id: int) -> dict[str, Any] | None:
+    def find_active_for_story(self, story_id: int, kind: str | None = None) -> dict[str, Any] | None:
         """Return the most-recently-updated active task for *story_id*."""
-        prefixes = (f"story_{story_id}_", f"audio_{story_id}_")
+        prefixes = tuple(f"{k}_{story_id}_" for k in ((kind,) if kind else ("story", "audio")))
         active = [
             val
             for key, val in self._store.items()
@@ -104,6 +164,7 @@ class InMemoryTaskBackend(TaskBackend):
         if entry and entry["status"] in ("pending", "running"):
             entry["status"] = "cancelled"
             entry["message"] = "Task cancelled by user"
+            self._publish(task_id)
             return True
         return False
 
@@ -113,7 +174,12 @@ class InMemoryTaskBackend(TaskBackend):
 # ---------------------------------------------------------------------------
 
 _TASK_TTL_SECONDS = 3600  # 1 hour
-_ACTIVE_STATUSES = frozenset({"pending", "running"})
+
+# Local read-through cache for get(), which the UI polls every second or two.
+# Active entries are reused only briefly; finished ones no longer change.
+_ACTIVE_READ_TTL = 0.5
+_FINISHED_READ_TTL = 60.0
+_MAX_CACHED_READS = 10_000
 
 # Task-id patterns: story_{id}_{ts} or audio_{id}_{ts}
 _STORY_ID_RE = re.compile(r"^(?:story|audio)_(\d+)_")
@@ -135,7 +201,12 @@ class RedisTaskBackend(TaskBackend):
         """Connect to the Redis instance at *redis_url*."""
         import redis as _redis
 
+        self._url = redis_url
         self._r: _redis.Redis[str] = _redis.from_url(redis_url, decode_responses=True)
+        self._async_r: Any = None  # redis.asyncio client for pub/sub, created on first watch
+        self._recent: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Active task -> the status it was last added to its story set with
+        self._indexed: dict[str, str] = {}
 
     def ping(self) -> bool:
         """Check if Redis is reachable."""
@@ -152,11 +223,8 @@ class RedisTaskBackend(TaskBackend):
     def _story_set_key(self, story_id: int) -> str:
         return f"story_tasks:{story_id}"
 
-    def _register_task(self, task_id: str) -> None:
-        """Add *task_id* to the per-story index set."""
-        story_id = _extract_story_id(task_id)
-        if story_id is not None:
-            self._r.sadd(self._story_set_key(story_id), task_id)
+    def _channel(self, task_id: str) -> str:
+        return f"task_updates:{task_id}"
 
     # -- public API -------------------------------------------------------
 
@@ -181,47 +249,86 @@ class RedisTaskBackend(TaskBackend):
                 "status": status,
                 "progress": str(progress),
                 "message": message,
-                "result": json.dumps(result) if result is not None else "",
+                "result": orjson.dumps(result).decode() if result is not None else "",
                 "words_generated": str(words_generated) if words_generated is not None else "",
                 "estimated_total_words": str(estimated_total_words) if estimated_total_words is not None else "",
                 "updated_at": datetime.now(UTC).isoformat(),
             }
-            self._r.hset(key, mapping=data)  # type: ignore[arg-type]
-            self._r.expire(key, _TASK_TTL_SECONDS)
-            self._register_task(task_id)
+            # Progress updates fire per chapter/line: send the writes as one pipelined round-trip
+            pipe = self._r.pipeline(transaction=False)
+            pipe.hset(key, mapping=data)  # type: ignore[arg-type]
+            pipe.expire(key, _TASK_TTL_SECONDS)
+            # Index the task under its story so find_active_for_story can reach it. Re-added on
+            # each status change rather than every progress write, and the set's TTL is refreshed
+            # with the task's, so an evicted or expired set is rebuilt while the task still runs
+            story_id = _extract_story_id(task_id)
+            if story_id is not None:
+                set_key = self._story_set_key(story_id)
+                if self._indexed.get(task_id) != status:
+                    pipe.sadd(set_key, task_id)
+                pipe.expire(set_key, _TASK_TTL_SECONDS)
+            pipe.publish(self._channel(task_id), orjson.dumps(self._deserialize(data)))
+            pipe.execute()
         except _redis.ConnectionError as exc:
             raise RedisNotReadyError("Redis not ready") from exc
+        self._recent.pop(task_id, None)
+        if status in _ACTIVE_STATUSES:
+            self._indexed[task_id] = status
+        else:
+            self._indexed.pop(task_id, None)
 
     def get(self, task_id: str) -> dict[str, Any] | None:
-        """Return the full task dict, or None if not found."""
+        """Return the full task dict, or None if not found.
+
+        Repeat reads within a short window are answered from a local cache;
+        writes made through this backend drop their entry.
+        """
         import redis as _redis
 
+        now = time.monotonic()
+        cached = self._recent.get(task_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
         try:
             raw = self._r.hgetall(self._task_key(task_id))
         except _redis.ConnectionError as exc:
             raise RedisNotReadyError("Redis not ready") from exc
         if not raw:
             return None
-        return self._deserialize(raw)
-
-    def find_active_for_story(self, story_id: int) -> dict[str, Any] | None:
+        entry = self._deserialize(raw)
+        if len(self._recent) >= _MAX_CACHED_READS:
+            self._recent.clear()
+        ttl = _ACTIVE_READ_TTL if entry["status"] in _ACTIVE_STATUSES else _FINISHED_READ_TTL
+        self._recent[task_id] = (now + ttl, entry)
+        return entry
+
+    def find_active_for_story(self, story_id: int, kind: str | None = None) -> dict[str, Any] | None:
         """Return the most-recently-updated active task for *story_id*."""
         set_key = self._story_set_key(story_id)
-        members = self._r.smembers(set_key)
+        # decode_responses=True, so members are str
+        members = cast("set[str]", self._r.smembers(set_key))
+        if kind:
+            members = {m for m in members if m.startswith(f"{kind}_")}
+        task_ids = list(members)
         active: list[dict[str, Any]] = []
         stale: list[str] = []
 
-        for task_id in members:
-            entry = self.get(task_id)
-            if entry is None:
+        # Fetch every task hash in one pipelined round-trip
+        pipe = self._r.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(self._task_key(task_id))
+        for task_id, raw in zip(task_ids, pipe.execute(), strict=True):
+            if not raw:
                 stale.append(task_id)
                 continue
+            entry = self._deserialize(raw)
             if entry.get("status") in _ACTIVE_STATUSES:
                 active.append(entry)
 
         # Clean up expired/stale task ids from the set
-        for tid in stale:
-            self._r.srem(set_key, tid)
+        if stale:
+            self._r.srem(set_key, *stale)
 
         if not active:
             return None
@@ -233,10 +340,38 @@ class RedisTaskBackend(TaskBackend):
         key = self._task_key(task_id)
         current_status = self._r.hget(key, "status")
         if current_status and current_status in _ACTIVE_STATUSES:
-            self._r.hset(key, mapping={"status": "cancelled", "message": "Task cancelled by user"})
+            pipe = self._r.pipeline(transaction=False)
+            pipe.hset(key, mapping={"status": "cancelled", "message": "Task cancelled by user"})
+            pipe.hgetall(key)
+            raw = pipe.execute()[1]
+            self._r.publish(self._channel(task_id), orjson.dumps(self._deserialize(raw)))
+            self._recent.pop(task_id, None)
             return True
         return False
 
+    @asynccontextmanager
+    async def _subscribe(self, task_id: str) -> AsyncIterator[AsyncIterator[dict[str, Any]]]:
+        if self._async_r is None:
+            from redis import asyncio as _aioredis
+
+            self._async_r = _aioredis.from_url(self._url, decode_responses=True)
+        pubsub = self._async_r.pubsub(ignore_subscribe_messages=True)
+        channel = self._channel(task_id)
+        await pubsub.subscribe(channel)
+
+        async def updates() -> AsyncIterator[dict[str, Any]]:
+            async for message in pubsub.listen():
+                # The pushed entry supersedes anything this process has cached
+                entry: dict[str, Any] = orjson.loads(message["data"])
+                self._recent.pop(task_id, None)
+                yield entry
+
+        try:
+            yield updates()
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
     # -- serialisation helpers --------------------------------------------
 
     @staticmethod
@@ -251,7 +386,7 @@ class RedisTaskBackend(TaskBackend):
             "status": raw.get("status", ""),
             "progress": float(progress_str) if progress_str else 0,
             "message": raw.get("message", ""),
-            "result": json.loads(result_str) if result_str else None,
+            "result": orjson.loads(result_str) if result_str else None,
             "words_generated": int(wg) if wg else None,
             "estimated_total_words": int(etw) if etw else None,
             "updated_at": raw.get("updated_at", ""),
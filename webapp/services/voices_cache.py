@@ -1,43 +1,68 @@
 """
-Thread-safe in-memory cache for ElevenLabs voices list.
+In-memory cache for the ElevenLabs voices list.
 
 Avoids blocking the /api/stories/voices endpoint with a 1-5 second HTTP call
 on every request. The cache is warmed on startup and refreshed in the
-background every hour.
+background every hour. The upstream call goes through a shared
+httpx.AsyncClient, so it never ties up the event loop or a worker thread and
+reuses its keep-alive connection.
+
+All state is touched only from the event loop. At most one fetch is in flight;
+cold callers that arrive while it runs await that same fetch.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import os
-import threading
 import time
 from typing import Any
 
-import requests as http_requests
+import httpx
 
 logger = logging.getLogger(__name__)
 
 _CACHE_TTL_SECONDS = 3600  # 1 hour
+_ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+# Small pool: the cache makes at most one upstream call at a time, but keeps it warm
+_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
 
-_lock = threading.Lock()
+_client: httpx.AsyncClient | None = None
 _voices: list[dict[str, Any]] = []
 _last_fetched: float = 0.0
-_refreshing = False
+_refresh_task: asyncio.Task[None] | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared ElevenLabs HTTP client, creating it on first use.
+
+    Created lazily so it binds to the running event loop; all ElevenLabs calls
+    made from the API process should go through it to reuse pooled connections.
+    """
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = httpx.AsyncClient(base_url=_ELEVENLABS_BASE_URL, limits=_HTTP_LIMITS, timeout=10.0)
+    return _client
 
 
-def _fetch_voices() -> list[dict[str, Any]]:
-    """Fetch voices from ElevenLabs API (blocking HTTP call)."""
+async def close_client() -> None:
+    """Close the shared HTTP client (called on shutdown)."""
+    global _client  # noqa: PLW0603
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _fetch_voices() -> list[dict[str, Any]]:
+    """Fetch voices from ElevenLabs API."""
     api_key = os.environ.get("ELEVENLABS_API_KEY")
     if not api_key:
         logger.warning("ELEVENLABS_API_KEY not set, cannot fetch voices")
         return []
 
-    resp = http_requests.get(
-        "https://api.elevenlabs.io/v1/voices",
-        headers={"xi-api-key": api_key},
-        timeout=10,
-    )
+    resp = await _get_client().get("/v1/voices", headers={"xi-api-key": api_key})
     if resp.status_code != 200:
         logger.warning("ElevenLabs voices API returned %s", resp.status_code)
         return []
@@ -55,67 +80,63 @@ def _fetch_voices() -> list[dict[str, Any]]:
     ]
 
 
-def _background_refresh() -> None:
-    """Refresh the cache in a background thread."""
-    global _voices, _last_fetched, _refreshing  # noqa: PLW0603
+async def _refresh() -> None:
+    """Fetch the voices list and store it if non-empty."""
+    global _voices, _last_fetched, _refresh_task  # noqa: PLW0603
     try:
-        result = _fetch_voices()
+        result = await _fetch_voices()
         if result:
-            with _lock:
-                _voices = result
-                _last_fetched = time.monotonic()
+            _voices = result
+            _last_fetched = time.monotonic()
     except Exception:
         logger.exception("Failed to refresh voices cache")
     finally:
-        with _lock:
-            _refreshing = False
+        _refresh_task = None
 
 
-def get_voices() -> list[dict[str, Any]]:
+def _start_refresh() -> asyncio.Task[None]:
+    """Return the in-flight refresh, starting one if none is running."""
+    global _refresh_task  # noqa: PLW0603
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(_refresh())
+    return _refresh_task
+
+
+async def get_voices() -> list[dict[str, Any]]:
     """Return cached voices list, triggering a background refresh if stale.
 
     Returns empty list only on first cold call when ElevenLabs is unreachable.
     """
-    global _refreshing  # noqa: PLW0603
-    now = time.monotonic()
-
-    with _lock:
-        is_stale = (now - _last_fetched) > _CACHE_TTL_SECONDS
-        cached = list(_voices)
-        already_refreshing = _refreshing
-
-    if is_stale and not already_refreshing:
-        with _lock:
-            _refreshing = True
-        t = threading.Thread(target=_background_refresh, daemon=True)
-        t.start()
-
-        # If cache is empty (cold start), wait for the first fetch
-        if not cached:
-            t.join(timeout=15)
-            with _lock:
-                cached = list(_voices)
-
-    return cached
-
-
-def warm_cache() -> None:
-    """Populate the cache (called on startup). Safe to call from any thread."""
-    global _voices, _last_fetched  # noqa: PLW0603
-    result = _fetch_voices()
-    if result:
-        with _lock:
-            _voices = result
-            _last_fetched = time.monotonic()
-        logger.info("Voices cache warmed with %d voices", len(result))
+    is_stale = (time.monotonic() - _last_fetched) > _CACHE_TTL_SECONDS
+    if not is_stale:
+        return list(_voices)
+
+    task = _start_refresh()
+    # If cache is empty (cold start), wait for the first fetch
+    if not _voices:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(asyncio.shield(task), timeout=15)
+    return list(_voices)
+
+
+def cache_version() -> float:
+    """Return a key that changes whenever the cached list is replaced (0.0 while cold)."""
+    return _last_fetched
+
+
+async def warm_cache() -> None:
+    """Populate the cache (called on startup)."""
+    await _start_refresh()
+    if _voices:
+        logger.info("Voices cache warmed with %d voices", len(_voices))
     else:
         logger.warning("Voices cache warm-up returned no results")
 
 
 def reset_cache() -> None:
     """Reset cache state — for tests only."""
-    global _voices, _last_fetched, _refreshing  # noqa: PLW0603
-    with _lock:
-        _voices = []
-        _last_fetched = 0.0
-        _refreshing = False
+    global _voices, _last_fetched, _refresh_task, _client  # noqa: PLW0603
+    _voices = []
+    _last_fetched = 0.0
+    _refresh_task = None
+    _client = None
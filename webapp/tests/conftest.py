@@ -3,10 +3,11 @@ Shared test fixtures for Lingolou backend tests.
 """
 
 import os
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -25,6 +26,22 @@ os.environ.setdefault("VOICES_CONFIG_PATH", os.path.join(_test_version_dir, "voi
 from webapp.main import app
 from webapp.models.database import Base, PlatformBudget, User, World, get_db
 from webapp.services.auth import create_access_token, get_password_hash
+from webapp.services.response_cache import NullResponseCache
+from webapp.services.task_store import reset_task_backend
+
+
+@pytest.fixture(autouse=True)
+def _no_response_cache(monkeypatch):
+    """Disable the public response cache so tests always read their own writes."""
+    monkeypatch.setattr("webapp.services.response_cache._cache", NullResponseCache())
+
+
+@pytest.fixture(autouse=True)
+def _fresh_task_backend():
+    """Start each test with an empty task store; story ids repeat across per-test databases."""
+    reset_task_backend()
+    yield
+    reset_task_backend()
 
 
 @pytest.fixture()
@@ -50,6 +67,32 @@ def db():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture()
+def capture_queries(db):
+    """Return a context manager that collects the SQL statements issued on the test engine.
+
+    The session is expired on entry, so reads that rely on implicit lazy loads show
+    up as extra statements instead of being answered from the identity map.
+    """
+
+    @contextmanager
+    def _capture():
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        db.expire_all()
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    return _capture
+
+
 @pytest.fixture()
 def client(db):
     """TestClient with database dependency override."""
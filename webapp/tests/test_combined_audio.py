@@ -0,0 +1,262 @@
+"""Tests for webapp/services/combined_audio.py"""
+
+import asyncio
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+
+from webapp.services.combined_audio import combined_audio_response, enter_local_paths
+
+
+class FakeProcess:
+    """Stand-in for asyncio.subprocess.Process with canned stdout."""
+
+    def __init__(self, output: bytes):
+        self.stdout = asyncio.StreamReader()
+        if output:
+            self.stdout.feed_data(output)
+        self.stdout.feed_eof()
+        self.returncode = None if output else 1
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+    async def wait(self):
+        if self.returncode is None:
+            self.returncode = 0
+        return self.returncode
+
+
+def _chapters(*numbers, updated_at=datetime(2026, 1, 1, tzinfo=UTC)):
+    return [SimpleNamespace(chapter_number=n, audio_path=f"7/ch{n}.mp3", updated_at=updated_at) for n in numbers]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setattr("webapp.services.combined_audio.COMBINED_AUDIO_CACHE_DIR", cache)
+    return cache
+
+
+@pytest.fixture()
+def storage(tmp_path):
+    """Storage whose get_path yields real files and records which ones are still held."""
+    held = set()
+    files = {}
+    for n in (1, 2):
+        path = tmp_path / f"ch{n}.mp3"
+        path.write_bytes(f"chapter {n}".encode())
+        files[f"7/ch{n}.mp3"] = path
+
+    @contextmanager
+    def get_path(key):
+        held.add(key)
+        try:
+            yield files.get(key)
+        finally:
+            held.discard(key)
+
+    backend = MagicMock()
+    backend.get_path = get_path
+    backend.held = held
+    with patch("webapp.services.combined_audio.get_storage", return_value=backend):
+        yield backend
+
+
+async def _drain(response: StreamingResponse) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_streams_ffmpeg_stdout_and_releases_files(storage):
+    proc = FakeProcess(b"combined-mp3-bytes")
+
+    async def run():
+        with patch("asyncio.create_subprocess_exec", return_value=proc) as exec_mock:
+            response = await combined_audio_response(7, _chapters(1, 2), "My Story.mp3")
+            assert isinstance(response, StreamingResponse)
+            assert storage.held == {"7/ch1.mp3", "7/ch2.mp3"}
+            body = await _drain(response)
+        return response, body, exec_mock.call_args.args
+
+    response, body, args = asyncio.run(run())
+    assert body == b"combined-mp3-bytes"
+    assert args[-1] == "pipe:1"
+    assert response.headers["content-disposition"] == "attachment; filename*=utf-8''My%20Story.mp3"
+    assert storage.held == set()
+
+
+def test_ffmpeg_failure_is_500_and_releases_files(storage):
+    async def run():
+        with patch("asyncio.create_subprocess_exec", return_value=FakeProcess(b"")):
+            await combined_audio_response(7, _chapters(1, 2), "story.mp3")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run())
+    assert exc.value.status_code == 500
+    assert storage.held == set()
+
+
+class StalledProcess(FakeProcess):
+    """ffmpeg that writes output but never finishes."""
+
+    def __init__(self, output: bytes):
+        super().__init__(b"")
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(output)
+        self.returncode = None
+
+    def kill(self):
+        super().kill()
+        self.returncode = -9
+
+
+@pytest.mark.parametrize("output", [b"", b"partial"])
+def test_stalled_ffmpeg_is_killed_at_timeout(storage, cache_dir, monkeypatch, output):
+    monkeypatch.setattr("webapp.services.combined_audio.FFMPEG_TIMEOUT", 0.05)
+    procs = []
+
+    async def run():
+        procs.append(StalledProcess(output))
+        with patch("asyncio.create_subprocess_exec", return_value=procs[0]):
+            response = await combined_audio_response(7, _chapters(1, 2), "story.mp3")
+            await _drain(response)
+
+    # Before any output the download fails cleanly; mid-stream the response is aborted
+    with pytest.raises(HTTPException if not output else TimeoutError):
+        asyncio.run(run())
+    assert procs[0].killed
+    assert storage.held == set()
+    assert not (cache_dir / "7").exists() or list((cache_dir / "7").iterdir()) == []
+
+
+def test_slow_client_does_not_trip_the_timeout(storage, monkeypatch):
+    monkeypatch.setattr("webapp.services.combined_audio.FFMPEG_TIMEOUT", 0.05)
+    output = b"x" * (4 * 64 * 1024)
+
+    async def run():
+        with patch("asyncio.create_subprocess_exec", return_value=FakeProcess(output)):
+            response = await combined_audio_response(7, _chapters(1, 2), "story.mp3")
+            body = b""
+            async for chunk in response.body_iterator:
+                body += chunk
+                await asyncio.sleep(0.03)  # the whole download outlasts the timeout
+        return body
+
+    assert asyncio.run(run()) == output
+
+
+def test_single_file_served_directly(storage):
+    response = asyncio.run(combined_audio_response(7, _chapters(1, 3), "story.mp3"))
+    assert isinstance(response, FileResponse)
+    assert str(response.path).endswith("ch1.mp3")
+    # Released by the response's background task once the file has been sent
+    assert "7/ch1.mp3" in storage.held
+    asyncio.run(response.background())
+    assert storage.held == set()
+
+
+def test_no_files_is_404(storage):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(combined_audio_response(7, _chapters(3), "story.mp3"))
+    assert exc.value.status_code == 404
+
+
+def _build(chapters, output=b"combined-mp3-bytes"):
+    """Run one combined download through a fake ffmpeg; return (response, body, exec mock)."""
+
+    async def run():
+        with patch("asyncio.create_subprocess_exec", return_value=FakeProcess(output)) as exec_mock:
+            response = await combined_audio_response(7, chapters, "story.mp3")
+            body = await _drain(response) if isinstance(response, StreamingResponse) else None
+        return response, body, exec_mock
+
+    return asyncio.run(run())
+
+
+def test_completed_build_is_cached_and_reused(storage, cache_dir):
+    _response, body, _ = _build(_chapters(1, 2))
+    cached = list((cache_dir / "7").iterdir())
+    assert [p.suffix for p in cached] == [".mp3"]
+    assert cached[0].read_bytes() == body
+
+    response, _, exec_mock = _build(_chapters(1, 2))
+    assert isinstance(response, FileResponse)
+    assert response.path == str(cached[0])
+    exec_mock.assert_not_called()
+
+
+def test_changed_audio_rebuilds_and_prunes_old_copy(storage, cache_dir):
+    _build(_chapters(1, 2))
+    (old,) = (cache_dir / "7").iterdir()
+
+    response, _, exec_mock = _build(_chapters(1, 2, updated_at=datetime(2026, 2, 1, tzinfo=UTC)), b"new-bytes")
+    assert isinstance(response, StreamingResponse)
+    exec_mock.assert_called_once()
+    (new,) = (cache_dir / "7").iterdir()
+    assert new != old
+    assert new.read_bytes() == b"new-bytes"
+
+
+def test_abandoned_stream_is_not_cached(storage, cache_dir):
+    async def run():
+        with patch("asyncio.create_subprocess_exec", return_value=FakeProcess(b"partial")):
+            response = await combined_audio_response(7, _chapters(1, 2), "story.mp3")
+            # Client goes away after the first chunk
+            await anext(response.body_iterator)
+            await response.body_iterator.aclose()
+
+    asyncio.run(run())
+    assert list((cache_dir / "7").iterdir()) == []
+    assert storage.held == set()
+
+
+def test_local_paths_are_fetched_concurrently(tmp_path):
+    # Each download waits for the other to start, so a serial fetch would break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    held = set()
+
+    @contextmanager
+    def get_path(key):
+        barrier.wait()
+        held.add(key)
+        try:
+            yield tmp_path / key
+        finally:
+            held.discard(key)
+
+    async def run():
+        with ExitStack() as stack:
+            paths = await enter_local_paths(stack, ["a.mp3", "b.mp3"])
+            assert held == {"a.mp3", "b.mp3"}
+        return paths
+
+    with patch("webapp.services.combined_audio.get_storage", return_value=MagicMock(get_path=get_path)):
+        paths = asyncio.run(run())
+    assert paths == [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+    assert held == set()
+
+
+def test_failed_fetch_releases_the_others(storage):
+    real_get_path = storage.get_path
+
+    def get_path(key):
+        if key == "7/ch2.mp3":
+            raise OSError("download failed")
+        return real_get_path(key)
+
+    storage.get_path = get_path
+
+    async def run():
+        with ExitStack() as stack:
+            await enter_local_paths(stack, ["7/ch1.mp3", "7/ch2.mp3"])
+
+    with pytest.raises(OSError, match="download failed"):
+        asyncio.run(run())
+    assert storage.held == set()
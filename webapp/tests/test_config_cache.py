@@ -0,0 +1,34 @@
+"""Tests for webapp/services/config_cache.py"""
+
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+from webapp.services import config_cache
+from webapp.services.config_cache import load_json_cached
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert asyncio.run(load_json_cached(tmp_path / "missing.json")) is None
+
+
+def test_repeat_reads_hit_cache(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"a": 1}))
+
+    with patch.object(config_cache, "_read_json", wraps=config_cache._read_json) as read:
+        assert asyncio.run(load_json_cached(path)) == {"a": 1}
+        assert asyncio.run(load_json_cached(path)) == {"a": 1}
+    assert read.call_count == 1
+
+
+def test_changed_mtime_reloads(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"a": 1}))
+    assert asyncio.run(load_json_cached(path)) == {"a": 1}
+
+    path.write_text(json.dumps({"a": 2}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert asyncio.run(load_json_cached(path)) == {"a": 2}
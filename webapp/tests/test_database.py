@@ -1,11 +1,29 @@
 """Tests for webapp/models/database.py"""
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, or_, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
-
-from webapp.models.database import Base, Chapter, PlatformBudget, Report, Story, User, Vote
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.schema import CreateTable
+
+from webapp.models.database import (
+    Base,
+    Block,
+    Bookmark,
+    Chapter,
+    Follow,
+    PlatformBudget,
+    Report,
+    Story,
+    User,
+    Vote,
+    World,
+    _engine_kwargs,
+    _server_pool_kwargs,
+    _sqlite_pool_kwargs,
+)
 from webapp.services.mnemonic import generate as generate_mnemonic
 
 
@@ -131,3 +149,120 @@ def test_unique_username_constraint(fresh_db):
     with pytest.raises(IntegrityError):
         fresh_db.commit()
     fresh_db.rollback()
+
+
+def test_server_pool_kwargs_defaults_and_overrides(monkeypatch):
+    for var in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT"):
+        monkeypatch.delenv(var, raising=False)
+    kwargs = _server_pool_kwargs()
+    assert (kwargs["pool_size"], kwargs["max_overflow"], kwargs["pool_timeout"]) == (20, 20, 5)
+    assert kwargs["pool_pre_ping"] is True
+
+    monkeypatch.setenv("DB_POOL_SIZE", "8")
+    assert _server_pool_kwargs()["pool_size"] == 8
+
+
+def test_sqlite_pool_kwargs_follow_file_locking(monkeypatch):
+    monkeypatch.setattr("webapp.models.database.SQLITE_FILE_LOCKING", False)
+    assert _sqlite_pool_kwargs() == {"poolclass": StaticPool}
+
+    monkeypatch.setattr("webapp.models.database.SQLITE_FILE_LOCKING", True)
+    monkeypatch.delenv("SQLITE_POOL_SIZE", raising=False)
+    kwargs = _sqlite_pool_kwargs()
+    assert (kwargs["poolclass"], kwargs["pool_size"], kwargs["max_overflow"]) == (QueuePool, 8, 0)
+
+
+def test_engine_compiled_cache_size():
+    assert _engine_kwargs["query_cache_size"] == 1200
+
+
+def _query_plan(session, stmt):
+    """Return SQLite's EXPLAIN QUERY PLAN detail lines for stmt, with its bound parameters."""
+    compiled = stmt.compile(session.get_bind())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("stmt", "index"),
+    [
+        (
+            select(Story.id)
+            .where(Story.visibility == "public", Story.status == "completed")
+            .order_by(Story.net_score.desc(), Story.created_at.desc()),
+            "ix_stories_public_feed",
+        ),
+        (
+            select(Story.id)
+            .where(Story.visibility == "public", Story.status == "completed", Story.language == "Arabic")
+            .order_by(Story.net_score.desc(), Story.created_at.desc()),
+            "ix_stories_language_feed",
+        ),
+        (
+            select(World.id)
+            .where(or_(World.visibility == "public", World.is_builtin.is_(True)))
+            .order_by(World.is_builtin.desc(), World.created_at.desc()),
+            "ix_worlds_public",
+        ),
+    ],
+)
+def test_public_listings_use_partial_indexes(fresh_db, stmt, index):
+    assert index in _query_plan(fresh_db, stmt)
+
+
+def test_chapter_lookup_uses_story_number_index(fresh_db):
+    stmt = select(Chapter.id).where(Chapter.story_id == 1, Chapter.chapter_number == 2)
+    assert "ix_chapter_story_number" in _query_plan(fresh_db, stmt)
+
+
+def test_owner_story_list_reads_index_without_sort(fresh_db):
+    stmt = select(Story.id).where(Story.user_id == 1).order_by(Story.created_at.desc(), Story.id.desc()).limit(20)
+    plan = _query_plan(fresh_db, stmt)
+    assert "ix_stories_user_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize(
+    ("stmt", "table"),
+    [
+        (select(Report.id).where(Report.user_id == 1), "reports"),
+        (select(Bookmark.id).where(Bookmark.user_id == 1), "bookmarks"),
+        (select(Follow.id).where(Follow.follower_id == 1), "follows"),
+        (select(Block.id).where(Block.blocker_id == 1), "blocks"),
+    ],
+)
+def test_leading_column_lookups_use_unique_index(fresh_db, stmt, table):
+    assert f"sqlite_autoindex_{table}_1" in _query_plan(fresh_db, stmt)
+
+
+def test_vote_unique_index_covers_vote_type_on_postgres():
+    ddl = str(CreateTable(Vote.__table__).compile(dialect=postgresql.dialect()))
+    assert "UNIQUE (user_id, story_id) INCLUDE (vote_type)" in ddl
+
+
+def test_sqlite_engine_pragmas():
+    from webapp.models.database import DATABASE_URL, engine
+
+    if not DATABASE_URL.startswith("sqlite"):
+        pytest.skip("SQLite-only pragmas")
+    expected = {
+        "journal_mode": "delete",
+        "synchronous": 1,  # NORMAL
+        "temp_store": 2,  # MEMORY
+        "cache_size": -65536,
+        "busy_timeout": 5000,
+    }
+    with engine.connect() as conn:
+        assert {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in expected} == expected
+
+
+def test_world_seeders_build_only_missing_worlds(fresh_db):
+    from webapp.models.database import _seed_bluey_world, _seed_paw_patrol_world
+
+    assert _seed_paw_patrol_world({"PAW Patrol"}) is None
+    bluey = _seed_bluey_world({"PAW Patrol"})
+    assert bluey.name == "Bluey"
+    assert bluey.is_builtin
+    # Nothing is written until the caller adds the batch
+    assert fresh_db.query(World).count() == 0
@@ -1,5 +1,7 @@
 """Tests for ETag middleware."""
 
+import asyncio
+
 
 def test_etag_header_present_on_get_api(client, auth_headers):
     resp = client.get("/api/stories/", headers=auth_headers)
@@ -51,11 +53,68 @@ def test_non_200_response_not_affected(client, auth_headers):
     assert "etag" not in resp.headers
 
 
-def test_task_endpoint_skips_etag(client, auth_headers):
+def test_task_endpoint_etag_tracks_progress(client, auth_headers):
     from webapp.services.task_store import get_task_backend
 
     get_task_backend().update("etag_test_task", "running", 50, "In progress")
+    url = "/api/stories/tasks/etag_test_task"
 
-    resp = client.get("/api/stories/tasks/etag_test_task", headers=auth_headers)
+    resp = client.get(url, headers=auth_headers)
     assert resp.status_code == 200
+    # Versioned by the handler from the task state, never a body hash
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+    assert resp.headers["cache-control"] == "private, max-age=1"
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    get_task_backend().update("etag_test_task", "running", 60, "In progress")
+    resp = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["progress"] == 60
+
+
+def _wrapped(response):
+    """A bare app behind ETagMiddleware that answers every request with response."""
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    from webapp.middleware.etag import ETagMiddleware
+
+    async def endpoint(_request):
+        return response()
+
+    return TestClient(ETagMiddleware(Starlette(routes=[Route("/", endpoint)])))
+
+
+def test_non_json_html_bodies_pass_through():
+    from starlette.responses import Response
+
+    resp = _wrapped(lambda: Response(b"ID3", media_type="audio/mpeg")).get("/")
+    assert resp.content == b"ID3"
     assert "etag" not in resp.headers
+
+
+async def test_streamed_response_not_buffered():
+    """Each chunk reaches the server as it is produced rather than after the last one."""
+    from starlette.responses import StreamingResponse
+
+    from webapp.middleware.etag import ETagMiddleware
+
+    events = []
+
+    async def chunks():
+        for i in range(3):
+            events.append(f"chunk{i}")
+            yield b"{}"
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        events.append(message["type"])
+
+    app = StreamingResponse(chunks(), media_type="application/json")
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    await ETagMiddleware(app)(scope, receive, send)
+    assert events[:3] == ["http.response.start", "chunk0", "http.response.body"]
@@ -2,6 +2,8 @@
 
 from datetime import UTC, datetime, timedelta
 
+import pytest
+
 from webapp.models.database import Block, Chapter, Follow, Story, World
 from webapp.services.mnemonic import generate as generate_mnemonic
 
@@ -53,6 +55,33 @@ class TestFollowLists:
         assert len(data) == 1
         assert data[0]["username"] == "testuser"
 
+    def test_list_following_paginates(self, client, db, test_user, other_user, third_user, auth_headers):
+        older = Follow(follower_id=test_user.id, following_id=other_user.id)
+        older.created_at = datetime.now(tz=UTC) - timedelta(hours=1)
+        db.add(older)
+        db.add(Follow(follower_id=test_user.id, following_id=third_user.id))
+        db.commit()
+        first = client.get("/api/follows/following?limit=1", headers=auth_headers)
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/api/follows/following?limit=1&cursor={cursor}", headers=auth_headers)
+        assert [u["username"] for u in first.json()] == ["thirduser"]
+        assert [u["username"] for u in second.json()] == ["otheruser"]
+        last = client.get(
+            f"/api/follows/following?limit=1&cursor={second.headers['X-Next-Cursor']}", headers=auth_headers
+        )
+        assert last.json() == []
+        assert "X-Next-Cursor" not in last.headers
+
+    def test_list_following_rejects_bad_cursor(self, client, auth_headers):
+        resp = client.get("/api/follows/following?cursor=not-a-cursor", headers=auth_headers)
+        assert resp.status_code == 400
+
+    @pytest.mark.parametrize("path", ["following", "followers", "timeline", "timeline/worlds"])
+    def test_lists_reject_offset_skip(self, client, auth_headers, path):
+        resp = client.get(f"/api/follows/{path}?skip=20", headers=auth_headers)
+        assert resp.status_code == 400
+        assert "cursor" in resp.json()["detail"]
+
 
 class TestTimeline:
     def _create_story(self, db, user, *, visibility="public", status="completed"):
@@ -112,6 +141,63 @@ class TestTimeline:
         assert resp.status_code == 200
         assert resp.json() == []
 
+    def test_timeline_etag_304_until_feed_changes(self, client, db, test_user, other_user, auth_headers):
+        db.add(Follow(follower_id=test_user.id, following_id=other_user.id))
+        db.commit()
+        self._create_story(db, other_user, visibility="public")
+        resp = client.get("/api/follows/timeline", headers=auth_headers)
+        etag = resp.headers["etag"]
+        assert etag.startswith('W/"')
+
+        resp = client.get("/api/follows/timeline", headers={**auth_headers, "if-none-match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+
+        self._create_story(db, other_user, visibility="public")
+        resp = client.get("/api/follows/timeline", headers={**auth_headers, "if-none-match": etag})
+        assert resp.status_code == 200
+        assert len(resp.json()) == 2
+        assert resp.headers["etag"] != etag
+
+    def test_timeline_etag_changes_with_rendered_relations(self, client, db, test_user, other_user, auth_headers):
+        db.add(Follow(follower_id=test_user.id, following_id=other_user.id))
+        world = World(name="Old name", user_id=other_user.id, visibility="public")
+        db.add(world)
+        db.commit()
+        story = self._create_story(db, other_user)
+        story.world_id = world.id
+        db.commit()
+
+        def changes(mutate):
+            etag = client.get("/api/follows/timeline", headers=auth_headers).headers["etag"]
+            mutate()
+            db.commit()
+            resp = client.get("/api/follows/timeline", headers={**auth_headers, "if-none-match": etag})
+            return resp.status_code == 200
+
+        assert changes(lambda: setattr(other_user, "display_name", "Renamed"))
+        assert changes(lambda: setattr(world, "name", "New name"))
+        assert changes(lambda: db.add(Chapter(story_id=story.id, chapter_number=2, status="completed")))
+
+    def test_timeline_cursor_breaks_created_at_ties_by_id(self, client, db, test_user, other_user, auth_headers):
+        db.add(Follow(follower_id=test_user.id, following_id=other_user.id))
+        db.commit()
+        same_time = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+        stories = [self._create_story(db, other_user) for _ in range(3)]
+        for s in stories:
+            s.created_at = same_time
+        db.commit()
+
+        seen: list[str] = []
+        cursor = ""
+        while True:
+            resp = client.get(f"/api/follows/timeline?limit=2&cursor={cursor}", headers=auth_headers)
+            seen += [s["id"] for s in resp.json()]
+            if "X-Next-Cursor" not in resp.headers:
+                break
+            cursor = resp.headers["X-Next-Cursor"]
+        assert seen == [s.slug for s in reversed(stories)]
+
 
 class TestTimelineWorlds:
     def test_timeline_worlds(self, client, db, test_user, other_user, auth_headers):
@@ -126,9 +212,40 @@ class TestTimelineWorlds:
         db.commit()
         resp = client.get("/api/follows/timeline/worlds", headers=auth_headers)
         assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/json"
         data = resp.json()
         assert len(data) == 1
         assert data[0]["name"] == "Other's World"
+        assert datetime.fromisoformat(data[0]["created_at"])
+
+    def test_timeline_worlds_visibility_and_blocks(
+        self, client, db, test_user, other_user, third_user, auth_headers, capture_queries
+    ):
+        db.add_all(
+            [
+                Follow(follower_id=test_user.id, following_id=other_user.id),
+                Follow(follower_id=test_user.id, following_id=third_user.id),
+                Block(blocker_id=third_user.id, blocked_id=test_user.id),
+            ]
+        )
+        followers_world = World(user_id=other_user.id, name="Followers", visibility="followers")
+        db.add_all(
+            [
+                followers_world,
+                World(user_id=other_user.id, name="Private", visibility="private"),
+                World(user_id=third_user.id, name="Blocked", visibility="public"),
+            ]
+        )
+        db.flush()
+        db.add(Story(user_id=other_user.id, world_id=followers_world.id, title="S", slug="s-w", public_id="p-w"))
+        db.commit()
+
+        with capture_queries() as statements:
+            data = client.get("/api/follows/timeline/worlds", headers=auth_headers).json()
+
+        assert [(w["name"], w["story_count"]) for w in data] == [("Followers", 1)]
+        # Auth lookup plus the page itself: no follow/block prefetch, no per-world loads
+        assert len(statements) == 2
 
 
 class TestUserProfile:
@@ -393,3 +510,32 @@ class TestUserWorlds:
     def test_nonexistent_user_returns_404(self, client, test_user, auth_headers):
         resp = client.get("/api/follows/users/9999/worlds", headers=auth_headers)
         assert resp.status_code == 404
+
+
+def _route_paths(routes):
+    """Return every route path, looking inside included routers that FastAPI keeps whole (0.143+)."""
+    paths = []
+    for route in routes:
+        if (router := getattr(route, "original_router", None)) is not None:
+            paths += [sub.path for sub in router.routes]
+        else:
+            paths.append(getattr(route, "path", None))
+    return paths
+
+
+class TestRouterRegistration:
+    def test_follows_router_mounted_once(self):
+        from webapp.main import app
+
+        paths = _route_paths(app.routes)
+        assert paths.count("/api/follows/timeline") == 1
+
+    def test_route_paths_counts_a_double_mount(self):
+        from fastapi import FastAPI
+
+        from webapp.api.follows import router
+
+        app = FastAPI()
+        app.include_router(router)
+        app.include_router(router)
+        assert _route_paths(app.routes).count("/api/follows/timeline") == 2
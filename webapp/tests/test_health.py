@@ -33,3 +33,40 @@ def test_health_redis_error(client):
         resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.json()["redis"] == "error"
+
+
+def test_health_reports_alembic_head_resolved_at_startup(client):
+    """The migration head is read once in the lifespan, not per probe."""
+    with patch("alembic.script.ScriptDirectory.from_config") as from_config:
+        resp = client.get("/health")
+    from_config.assert_not_called()
+    assert resp.json()["alembic_head"] == client.app.state.alembic_head
+    assert resp.json()["alembic_head"]
+
+
+def test_startup_sizes_worker_threadpool(client):
+    """Background generation and sync dependencies get the configured thread count."""
+    from anyio import to_thread
+
+    assert client.portal.call(lambda: to_thread.current_default_thread_limiter().total_tokens) == 64
+
+
+def test_health_route_registered_before_routers(client):
+    """Probes match on an early route instead of scanning past every API route."""
+    # Included routers are entries of their own, without a path
+    paths = [getattr(route, "path", None) for route in client.app.routes]
+    assert paths.index("/health") < paths.index(None)
+    assert paths[-1] == "/{full_path:path}"
+
+
+def test_cors_wildcard_answers_without_credentials(client):
+    """The default wildcard origin never claims to allow credentials."""
+    resp = client.get("/health", headers={"Origin": "https://elsewhere.example", "Cookie": "a=b"})
+    assert resp.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in resp.headers
+
+
+def test_cors_exposes_next_cursor(client):
+    """Cross-origin clients can read the keyset pagination header."""
+    resp = client.get("/health", headers={"Origin": "https://elsewhere.example"})
+    assert resp.headers["access-control-expose-headers"] == "X-Next-Cursor"
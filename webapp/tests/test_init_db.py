@@ -1,7 +1,7 @@
 """Tests for version-based fast startup in init_db()."""
 
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 
 def _clean_env(tmp_path):
@@ -57,3 +57,32 @@ def test_init_db_full_flow(tmp_path):
 
         # Second boot — version matches
         assert _read_version_file() == current
+
+
+def test_upgrade_skipped_when_database_at_head(client, tmp_path):
+    """A version bump on an already-migrated database doesn't re-run alembic upgrade."""
+    with _clean_env(tmp_path), patch("alembic.command.upgrade") as upgrade:
+        from webapp.models.database import init_db
+
+        init_db()
+    upgrade.assert_not_called()
+
+
+def test_alembic_head_scanned_once(client):
+    """Startup and /health share one scan of the migration scripts."""
+    from webapp.models.database import alembic_head
+
+    with patch("alembic.script.ScriptDirectory.from_config") as from_config:
+        head = alembic_head()
+    from_config.assert_not_called()
+    assert head == client.app.state.alembic_head
+
+
+def test_seeders_skipped_when_builtin_worlds_exist(client, tmp_path):
+    """A version bump on a seeded database runs one lookup and none of the seeders."""
+    from webapp.models.database import _BUILTIN_WORLD_SEEDERS, init_db
+
+    seeder = MagicMock()
+    with _clean_env(tmp_path), patch.dict(_BUILTIN_WORLD_SEEDERS, dict.fromkeys(_BUILTIN_WORLD_SEEDERS, seeder)):
+        init_db()
+    seeder.assert_not_called()
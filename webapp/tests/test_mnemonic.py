@@ -3,6 +3,7 @@
 import json
 from pathlib import Path
 
+from webapp.services import mnemonic
 from webapp.services.mnemonic import decode_slug, encode, generate
 
 
@@ -75,3 +76,11 @@ def test_generate_returns_uuid_and_slug():
     assert "-" in slug
     parts = slug.split("-")
     assert len(parts) == 5
+
+
+def test_preload_fills_word_caches(monkeypatch):
+    monkeypatch.setattr(mnemonic, "_WORD_LISTS", None)
+    monkeypatch.setattr(mnemonic, "_REVERSE_MAPS", None)
+    mnemonic.preload()
+    assert mnemonic._WORD_LISTS is not None
+    assert mnemonic._REVERSE_MAPS is not None
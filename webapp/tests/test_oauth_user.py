@@ -0,0 +1,106 @@
+"""Tests for OAuth user lookup, account linking, and username generation."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from starlette.responses import PlainTextResponse
+
+from webapp.api.oauth import _get_or_create_oauth_user, _pick_username
+from webapp.models.database import User
+
+
+def _add_user(db, email, username, **kwargs):
+    user = User(email=email, username=username, hashed_password=None, **kwargs)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def test_matches_existing_oauth_identity(db):
+    existing = _add_user(db, "john@example.com", "john", oauth_provider="google", oauth_id="g-1")
+    user = _get_or_create_oauth_user(db, "google", "g-1", "john@example.com", "John")
+    assert user is not None
+    assert user.id == existing.id
+
+
+def test_oauth_identity_wins_over_email_match(db):
+    by_oauth = _add_user(db, "old@example.com", "old", oauth_provider="google", oauth_id="g-1")
+    _add_user(db, "new@example.com", "new")
+    user = _get_or_create_oauth_user(db, "google", "g-1", "new@example.com", None)
+    assert user is not None
+    assert user.id == by_oauth.id
+
+
+def test_links_existing_email_account(db):
+    existing = _add_user(db, "jane@example.com", "jane")
+    user = _get_or_create_oauth_user(db, "google", "g-2", "jane@example.com", "Jane Doe")
+    assert user is not None
+    assert user.id == existing.id
+    assert user.oauth_provider == "google"
+    assert user.oauth_id == "g-2"
+    assert user.display_name == "Jane Doe"
+
+
+def test_returns_none_without_email(db):
+    assert _get_or_create_oauth_user(db, "google", "g-3", None, "Nobody") is None
+
+
+def test_creates_user_with_first_free_suffix(db):
+    _add_user(db, "john@a.com", "john")
+    _add_user(db, "john@b.com", "john1")
+    _add_user(db, "john@c.com", "john3")
+    user = _get_or_create_oauth_user(db, "google", "g-4", "john@d.com", None)
+    assert user is not None
+    assert user.username == "john2"
+    assert user.display_name == "john2"
+
+
+def test_pick_username_escapes_like_wildcards(db):
+    _add_user(db, "axb@example.com", "axb")
+    # "a_b" must not treat "_" as a wildcard matching "axb"
+    assert _pick_username(db, "a_b") == "a_b"
+
+
+def test_retries_when_username_taken_concurrently(db):
+    from webapp.api import oauth
+
+    real_create = oauth._create_oauth_user
+    calls = []
+
+    def flaky_create(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed: users.username"))
+        return real_create(*args)
+
+    with patch.object(oauth, "_create_oauth_user", side_effect=flaky_create):
+        user = _get_or_create_oauth_user(db, "google", "g-5", "race@example.com", None)
+    assert user is not None
+    assert len(calls) == 2
+    assert user.username == "race"
+
+
+def test_email_conflict_is_not_retried(db):
+    from webapp.api import oauth
+
+    error = IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed: users.email"))
+    with patch.object(oauth, "_create_oauth_user", side_effect=error) as create, pytest.raises(IntegrityError):
+        _get_or_create_oauth_user(db, "google", "g-6", "dup@example.com", None)
+    create.assert_called_once()
+
+
+async def _echo_redirect_uri(request, redirect_uri):
+    request.session["state"] = "s"
+    return PlainTextResponse(redirect_uri)
+
+
+def test_login_gets_session_under_oauth_mount_only(client):
+    with patch("webapp.api.oauth.oauth.google.authorize_redirect", side_effect=_echo_redirect_uri):
+        resp = client.get("/api/auth/oauth/google/login")
+    assert resp.text == "http://testserver/api/auth/oauth/google/callback"
+    assert "path=/api/auth/oauth;" in resp.headers["set-cookie"]
+
+    # Requests outside the OAuth app never go through the session middleware
+    assert "set-cookie" not in client.get("/health").headers
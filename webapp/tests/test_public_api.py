@@ -2,7 +2,7 @@
 
 from unittest.mock import MagicMock, patch
 
-from webapp.models.database import Chapter, Follow, Story, Vote
+from webapp.models.database import Bookmark, Chapter, Follow, Story, Vote
 from webapp.services.mnemonic import generate as generate_mnemonic
 
 
@@ -53,6 +53,47 @@ def test_list_public_stories(client, db, test_user):
     assert resp.status_code == 200
     data = resp.json()
     assert len(data) == 2
+    assert all(s["chapter_count"] == 1 for s in data)
+
+
+def test_list_public_stories_query_count_independent_of_page_size(client, db, test_user, other_user, capture_queries):
+    _create_public_story(db, test_user, title="Story A")
+    with capture_queries() as statements:
+        client.get("/api/public/stories")
+    single = len(statements)
+
+    _create_public_story(db, other_user, title="Story B")
+    _create_public_story(db, other_user, title="Story C")
+    with capture_queries() as statements:
+        client.get("/api/public/stories")
+    several = len(statements)
+    assert several == single
+
+
+def test_list_public_stories_skips_large_columns(client, db, test_user, capture_queries):
+    _create_public_story(db, test_user)
+    with capture_queries() as statements:
+        client.get("/api/public/stories")
+    (list_sql,) = [sql for sql in statements if "FROM stories" in sql]
+    assert "stories.prompt" not in list_sql
+    assert "stories.config_json" not in list_sql
+    assert "users.hashed_password" not in list_sql
+
+
+def test_list_public_stories_ordered_by_net_score(client, db, test_user):
+    low = _create_public_story(db, test_user, title="Low")
+    high = _create_public_story(db, test_user, title="High")
+    low.upvotes, low.downvotes = 5, 4
+    high.upvotes, high.downvotes = 3, 0
+    db.commit()
+    assert (low.net_score, high.net_score) == (1, 3)
+
+    data = client.get("/api/public/stories").json()
+    assert [s["title"] for s in data] == ["High", "Low"]
+
+
+def test_budget_cache_control(client):
+    assert client.get("/api/public/budget").headers["cache-control"] == "public, max-age=5"
 
 
 def test_list_public_stories_filters_private(client, db, test_user):
@@ -108,6 +149,83 @@ def test_get_public_story_with_user_vote(client, db, test_user, other_user, othe
     resp = client.get(f"/api/public/stories/{story.slug}", headers=other_auth_headers)
     data = resp.json()
     assert data["user_vote"] == "up"
+    assert data["is_bookmarked"] is False
+
+
+def test_get_shared_story_with_vote_and_bookmark(client, db, test_user, other_user, other_auth_headers):
+    story = _create_public_story(db, test_user)
+    db.add(Vote(user_id=other_user.id, story_id=story.id, vote_type="down"))
+    db.add(Bookmark(user_id=other_user.id, story_id=story.id))
+    db.commit()
+
+    data = client.get(f"/api/public/share/{story.share_code}", headers=other_auth_headers).json()
+    assert data["user_vote"] == "down"
+    assert data["is_bookmarked"] is True
+
+
+def test_story_detail_loads_viewer_state_with_story(client, db, test_user, other_auth_headers, capture_queries):
+    story = _create_public_story(db, test_user)
+    url = f"/api/public/stories/{story.slug}"
+    with capture_queries() as statements:
+        client.get(url, headers=other_auth_headers)
+    viewer_queries = [sql for sql in statements if "votes" in sql or "bookmarks" in sql]
+    assert len(viewer_queries) == 1
+    assert "FROM stories" in viewer_queries[0]
+
+
+def test_get_public_chapter_script(client, db, test_user):
+    story = _create_public_story(db, test_user)
+
+    resp = client.get(f"/api/public/stories/{story.slug}/chapters/1/script")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == [{"type": "line", "text": "hello", "emotion": "happy"}]
+
+    resp = client.get(f"/api/public/stories/{story.slug}/chapters/1/script?enhanced=false")
+    assert resp.json() == [{"type": "line", "text": "hello"}]
+
+
+def test_get_public_story_etag_304_until_story_changes(client, db, test_user, other_auth_headers):
+    story = _create_public_story(db, test_user)
+    resp = client.get(f"/api/public/stories/{story.slug}")
+    etag = resp.headers["etag"]
+    assert etag.startswith("W/")
+    assert resp.headers["cache-control"] == "public, max-age=30, stale-while-revalidate=300"
+    assert "Authorization" in resp.headers["vary"]
+
+    resp = client.get(f"/api/public/stories/{story.slug}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+    client.post(f"/api/votes/stories/{story.slug}", json={"vote_type": "up"}, headers=other_auth_headers)
+    resp = client.get(f"/api/public/stories/{story.slug}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["upvotes"] == 1
+
+
+def test_get_public_story_signed_in_is_private(client, db, test_user, other_auth_headers):
+    story = _create_public_story(db, test_user)
+    resp = client.get(f"/api/public/stories/{story.slug}", headers=other_auth_headers)
+    assert resp.headers["cache-control"] == "private, no-cache"
+    anonymous = client.get(f"/api/public/stories/{story.slug}")
+    assert anonymous.headers["etag"] != resp.headers["etag"]
+
+
+def test_get_public_chapter_script_etag_304(client, db, test_user):
+    story = _create_public_story(db, test_user)
+    url = f"/api/public/stories/{story.slug}/chapters/1/script"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"{url}?enhanced=false", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_chapter_script_probe_skips_full_story_row(client, db, test_user, capture_queries):
+    story = _create_public_story(db, test_user, visibility="private")
+    url = f"/api/public/stories/{story.slug}/chapters/1/script"
+    with capture_queries() as statements:
+        client.get(url)
+    assert len(statements) == 1
+    assert "stories.prompt" not in statements[0]
+    assert "stories.visibility IN" in statements[0]
 
 
 def test_get_private_story_returns_404(client, db, test_user):
@@ -149,6 +267,42 @@ def test_fork_public_story(client, db, test_user, other_user, other_auth_headers
     assert data["chapters"][0]["audio_path"] is None
 
 
+def test_fork_copies_all_chapters(client, db, test_user, other_auth_headers):
+    story = _create_public_story(db, test_user, title="Long Story")
+    db.add(Chapter(story_id=story.id, chapter_number=3, title="Three", status="completed", script_json="[3]"))
+    db.add(Chapter(story_id=story.id, chapter_number=2, title="Two", status="completed", audio_path="x.mp3"))
+    db.commit()
+
+    resp = client.post(f"/api/public/stories/{story.slug}/fork", headers=other_auth_headers)
+    assert resp.status_code == 201
+    chapters = sorted(resp.json()["chapters"], key=lambda c: c["chapter_number"])
+    assert [c["chapter_number"] for c in chapters] == [1, 2, 3]
+    assert [c["title"] for c in chapters] == [None, "Two", "Three"]
+    assert all(c["status"] == "completed" and c["audio_path"] is None for c in chapters)
+
+    fork = db.query(Story).filter(Story.slug == resp.json()["id"]).one()
+    copied = {c.chapter_number: c.script_json for c in fork.chapters}
+    assert copied[3] == "[3]"
+    assert all(c.created_at and c.updated_at for c in fork.chapters)
+
+
+def test_fork_does_not_reload_after_insert(client, db, test_user, other_auth_headers, capture_queries):
+    story = _create_public_story(db, test_user, title="Original Story")
+    with capture_queries() as statements:
+        client.post(f"/api/public/stories/{story.slug}/fork", headers=other_auth_headers)
+    first_insert = next(i for i, sql in enumerate(statements) if sql.startswith("INSERT"))
+    assert not [sql for sql in statements[first_insert:] if sql.lstrip().startswith("SELECT")]
+
+
+def test_fork_keeps_world_name(client, db, test_user, other_auth_headers, builtin_world):
+    story = _create_public_story(db, test_user)
+    story.world_id = builtin_world.id
+    db.commit()
+
+    resp = client.post(f"/api/public/stories/{story.slug}/fork", headers=other_auth_headers)
+    assert resp.json()["world_name"] == builtin_world.name
+
+
 def test_fork_story_not_public(client, db, test_user, other_auth_headers):
     story = _create_public_story(db, test_user, visibility="private")
 
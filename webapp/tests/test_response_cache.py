@@ -0,0 +1,166 @@
+"""Tests for webapp/services/response_cache.py and its use by the public API."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from webapp.models.database import Chapter, Story
+from webapp.services.mnemonic import generate as generate_mnemonic
+from webapp.services.response_cache import (
+    InMemoryResponseCache,
+    RedisResponseCache,
+    ResponseCache,
+    get_response_cache,
+    reset_response_cache,
+)
+
+
+class FakeRedis:
+    """Minimal Redis mock covering the string commands the cache uses."""
+
+    def __init__(self):
+        self._data = {}
+        self._ttls = {}
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def setex(self, key, ttl, value):
+        self._data[key] = value
+        self._ttls[key] = ttl
+
+    def incr(self, key):
+        self._data[key] = int(self._data.get(key, 0)) + 1
+        return self._data[key]
+
+
+class DictResponseCache(ResponseCache):
+    """In-process cache used to exercise the endpoint wiring."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, body, ttl):
+        self.store[key] = body
+
+    def invalidate(self, prefix):
+        for key in [k for k in self.store if k.startswith(prefix)]:
+            del self.store[key]
+
+
+@pytest.fixture()
+def backend():
+    cache = RedisResponseCache.__new__(RedisResponseCache)
+    cache._r = FakeRedis()
+    return cache
+
+
+class TestRedisResponseCache:
+    def test_set_and_get(self, backend):
+        backend.set("public:budget", b'{"a":1}', 5)
+        assert backend.get("public:budget") == b'{"a":1}'
+        assert backend._r._ttls["respcache:0:public:budget"] == 5
+
+    def test_get_missing(self, backend):
+        assert backend.get("public:nope") is None
+
+    def test_invalidate_prefix(self, backend):
+        backend.set("public:stories:0:20:", b"[]", 30)
+        backend.set("public:worlds", b"[]", 60)
+        backend.set("other:key", b"x", 60)
+        backend.invalidate("public:")
+        assert backend.get("public:stories:0:20:") is None
+        assert backend.get("public:worlds") is None
+        assert backend.get("other:key") == b"x"
+
+    def test_invalidate_bumps_generation_without_deleting(self, backend):
+        backend.set("public:worlds", b"[]", 60)
+        backend.invalidate("public:")
+        backend.set("public:worlds", b"[1]", 60)
+        assert backend._r._data["respcache:gen:public:"] == 1
+        assert backend._r._data["respcache:0:public:worlds"] == b"[]"
+        assert backend.get("public:worlds") == b"[1]"
+
+    def test_redis_errors_fall_through(self, backend):
+        backend._r = MagicMock()
+        backend._r.get.side_effect = redis.ConnectionError
+        backend._r.setex.side_effect = redis.ConnectionError
+        backend._r.incr.side_effect = redis.ConnectionError
+        assert backend.get("public:budget") is None
+        backend.set("public:budget", b"{}", 5)
+        backend.invalidate("public:")
+
+
+class TestInMemoryResponseCache:
+    def test_set_get_and_expiry(self, monkeypatch):
+        cache = InMemoryResponseCache()
+        now = [100.0]
+        monkeypatch.setattr("webapp.services.response_cache.time.monotonic", lambda: now[0])
+        cache.set("public:budget", b"{}", 5)
+        assert cache.get("public:budget") == b"{}"
+        now[0] += 5
+        assert cache.get("public:budget") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", b"1", 60)
+        cache.set("b", b"2", 60)
+        cache.get("a")
+        cache.set("c", b"3", 60)
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+
+    def test_invalidate_prefix(self):
+        cache = InMemoryResponseCache()
+        cache.set("public:worlds", b"[]", 600)
+        cache.set("other:key", b"x", 60)
+        cache.invalidate("public:")
+        assert cache.get("public:worlds") is None
+        assert cache.get("other:key") == b"x"
+
+
+def test_get_response_cache_in_memory_without_redis(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    reset_response_cache()
+    assert isinstance(get_response_cache(), InMemoryResponseCache)
+
+
+def _create_public_story(db, user):
+    _pid, _slug = generate_mnemonic()
+    story = Story(user_id=user.id, title="Cached", status="completed", visibility="public", public_id=_pid, slug=_slug)
+    db.add(story)
+    db.flush()
+    db.add(Chapter(story_id=story.id, chapter_number=1, status="completed"))
+    db.commit()
+    return story
+
+
+class TestPublicEndpointCaching:
+    @pytest.fixture()
+    def cache(self):
+        cache = DictResponseCache()
+        with patch("webapp.services.response_cache._cache", cache):
+            yield cache
+
+    def test_list_served_from_cache_until_vote(self, client, db, test_user, other_auth_headers, cache):
+        story = _create_public_story(db, test_user)
+        first = client.get("/api/public/stories")
+        assert len(first.json()) == 1
+
+        # A story added behind the cache's back is not visible yet
+        _create_public_story(db, test_user)
+        assert client.get("/api/public/stories").json() == first.json()
+
+        client.post(f"/api/votes/stories/{story.slug}", json={"vote_type": "up"}, headers=other_auth_headers)
+        assert len(client.get("/api/public/stories").json()) == 2
+
+    def test_story_detail_cached_for_anonymous_only(self, client, db, test_user, auth_headers, cache):
+        story = _create_public_story(db, test_user)
+        client.get(f"/api/public/stories/{story.slug}")
+        client.get(f"/api/public/stories/{story.slug}", headers=auth_headers)
+        assert list(cache.store) == [f"public:story:{story.slug}"]
@@ -0,0 +1,75 @@
+"""Tests for serving the SPA index from webapp/main.py"""
+
+import pytest
+
+from webapp.main import _load_index, _scan_frontend, app
+
+
+@pytest.fixture
+def built_index(client, tmp_path):
+    """Load a built index.html into the running app, restoring the real one afterwards."""
+    index = tmp_path / "index.html"
+    index.write_text("<!doctype html><div id=root></div>")
+    state = dict(app.state._state)
+    _load_index(app, index)
+    yield index
+    app.state._state = state
+
+
+def test_index_served_from_memory(client, built_index):
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.text == built_index.read_text()
+    assert resp.headers["content-type"].startswith("text/html")
+    assert resp.headers["cache-control"] == "no-cache"
+
+    # Later edits on disk aren't re-read; the index is loaded once at startup
+    built_index.write_text("changed")
+    assert client.get("/stories/abc").text == resp.text
+
+
+def test_index_304_on_matching_if_none_match(client, built_index):
+    etag = client.get("/").headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = client.get("/worlds", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+def test_spa_without_build(client, tmp_path):
+    state = dict(app.state._state)
+    _load_index(app, tmp_path / "missing.html")
+    try:
+        assert client.get("/").json()["name"] == "Lingolou API"
+        assert client.get("/stories/abc").status_code == 404
+    finally:
+        app.state._state = state
+
+
+@pytest.mark.parametrize("path", ["/api/nope", "/assets/old-hash.js", "/docs/extra", "/health/live"])
+def test_non_spa_prefixes_404_without_index(client, built_index, path):
+    resp = client.get(path)
+    assert resp.status_code == 404
+    assert resp.json() == {"detail": "Not found"}
+
+
+def test_scan_frontend_skips_index_and_assets(tmp_path):
+    (tmp_path / "index.html").write_text("<html>")
+    (tmp_path / "favicon.svg").write_text("<svg/>")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "app.js").write_text("")
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "logo.png").write_bytes(b"png")
+
+    files = _scan_frontend(tmp_path)
+    assert files == {"favicon.svg": str(tmp_path / "favicon.svg"), "img/logo.png": str(tmp_path / "img" / "logo.png")}
+
+
+def test_spa_serves_scanned_build_files_only(client, built_index, monkeypatch):
+    favicon = built_index.parent / "favicon.svg"
+    favicon.write_text("<svg/>")
+    monkeypatch.setattr(app.state, "frontend_files", _scan_frontend(built_index.parent))
+
+    assert client.get("/favicon.svg").text == "<svg/>"
+    # Anything else falls back to the index, never to an arbitrary file on disk
+    assert client.get("/..%2Fmain.py").text == built_index.read_text()
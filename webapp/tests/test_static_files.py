@@ -0,0 +1,53 @@
+"""Tests for webapp/middleware/static.py"""
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from webapp.middleware.static import IMMUTABLE_CACHE_CONTROL, PrecompressedStaticFiles
+
+_JS = b"console.log('hello');" * 20
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "app.js").write_bytes(_JS)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(_JS))
+    (tmp_path / "plain.css").write_bytes(b"body{}")
+    app = Starlette(
+        routes=[
+            Mount("/assets", PrecompressedStaticFiles(directory=str(tmp_path), immutable=True)),
+            Mount("/static", PrecompressedStaticFiles(directory=str(tmp_path))),
+        ]
+    )
+    return TestClient(app)
+
+
+def test_serves_gzip_sibling_when_accepted(assets):
+    resp = assets.get("/assets/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.headers["content-type"].startswith("text/javascript")
+    assert resp.content == _JS  # decoded by the client
+
+
+def test_serves_original_without_accepted_encoding(assets):
+    resp = assets.get("/assets/app.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.content == _JS
+
+
+def test_serves_original_without_sibling(assets):
+    resp = assets.get("/assets/plain.css", headers={"Accept-Encoding": "br, gzip"})
+    assert "content-encoding" not in resp.headers
+    assert resp.content == b"body{}"
+
+
+def test_immutable_cache_control_only_where_configured(assets):
+    assert assets.get("/assets/plain.css").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert "cache-control" not in assets.get("/static/plain.css").headers
@@ -1,7 +1,15 @@
 """Tests for webapp/api/stories.py"""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import threading
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+from fastapi import Response
+
+from webapp.api.stories import _get_owned_chapter
+from webapp.main import app
 from webapp.models.database import Chapter, PlatformBudget, Story
 from webapp.services.crypto import encrypt_key
 
@@ -34,6 +42,29 @@ def test_create_story(client, auth_headers):
     assert len(data["id"].split("-")) == 5
 
 
+def test_create_story_inserts_chapters_in_one_statement(client, auth_headers, capture_queries):
+    with capture_queries() as statements:
+        resp = _create_story(client, auth_headers, num_chapters=5)
+
+    assert [ch["chapter_number"] for ch in resp.json()["chapters"]] == [1, 2, 3, 4, 5]
+    assert sum(s.startswith("INSERT INTO chapters") for s in statements) == 1
+    # The response is built from the inserted objects, not reloaded
+    assert not any(s.startswith("SELECT") and "FROM stories" in s for s in statements)
+    assert not any(s.startswith("SELECT") and "FROM chapters" in s for s in statements)
+
+
+def test_create_story_in_world(client, auth_headers, builtin_world):
+    resp = _create_story(client, auth_headers, world_id=builtin_world.id)
+    assert resp.status_code == 200
+    assert resp.json()["world_name"] == builtin_world.name
+
+
+def test_create_story_unknown_world_is_404(client, auth_headers):
+    resp = _create_story(client, auth_headers, world_id=999999)
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "World not found"
+
+
 def test_list_stories(client, auth_headers):
     _create_story(client, auth_headers, title="Story 1")
     _create_story(client, auth_headers, title="Story 2")
@@ -44,6 +75,21 @@ def test_list_stories(client, auth_headers):
     assert len(data) == 2
 
 
+def test_list_stories_query_count_independent_of_page_size(client, auth_headers, builtin_world, capture_queries):
+    def count_list_queries():
+        with capture_queries() as statements:
+            data = client.get("/api/stories/", headers=auth_headers).json()
+        return len(statements), data
+
+    _create_story(client, auth_headers, title="Story 1", world_id=builtin_world.id)
+    single, _ = count_list_queries()
+    for i in range(3):
+        _create_story(client, auth_headers, title=f"More {i}", world_id=builtin_world.id)
+    several, data = count_list_queries()
+    assert several == single
+    assert all(s["chapter_count"] == 2 and s["world_name"] == builtin_world.name for s in data)
+
+
 def test_list_stories_only_own(client, auth_headers, other_auth_headers):
     _create_story(client, auth_headers, title="My Story")
     _create_story(client, other_auth_headers, title="Other Story")
@@ -58,9 +104,35 @@ def test_list_stories_pagination(client, auth_headers):
     for i in range(5):
         _create_story(client, auth_headers, title=f"Story {i}")
 
-    resp = client.get("/api/stories/?skip=2&limit=2", headers=auth_headers)
-    data = resp.json()
-    assert len(data) == 2
+    titles = []
+    resp = client.get("/api/stories/?limit=2", headers=auth_headers)
+    while True:
+        assert len(resp.json()) <= 2
+        titles += [s["title"] for s in resp.json()]
+        if "X-Next-Cursor" not in resp.headers:
+            break
+        resp = client.get(f"/api/stories/?limit=2&cursor={resp.headers['X-Next-Cursor']}", headers=auth_headers)
+
+    # Same-second created_at ties are broken by id, so no story is skipped or repeated
+    assert titles == [f"Story {i}" for i in reversed(range(5))]
+
+
+def test_owned_chapter_lookup_caches_per_column_set(client, auth_headers, db, test_user, capture_queries):
+    slug = _create_story(client, auth_headers).json()["id"]
+
+    # The lambda_stmt cache must key on the load_only columns, not just the lambda's code
+    with capture_queries() as statements:
+        for only in [(), (Chapter.audio_path,), ()]:
+            assert _get_owned_chapter(db, slug, test_user.id, 1, *only)[1] is not None
+            db.expire_all()
+
+    lookups = [sql for sql in statements if sql.startswith("SELECT stories.id")]
+    assert ["chapters.script_json" in sql for sql in lookups] == [True, False, True]
+
+
+def test_list_stories_invalid_cursor(client, auth_headers):
+    resp = client.get("/api/stories/?cursor=not-a-cursor", headers=auth_headers)
+    assert resp.status_code == 400
 
 
 def test_get_story(client, auth_headers):
@@ -72,6 +144,81 @@ def test_get_story(client, auth_headers):
     assert resp.json()["id"] == story_id
 
 
+def test_get_story_selectin_loads_chapters(client, auth_headers, capture_queries):
+    story_id = _create_story(client, auth_headers, num_chapters=3).json()["id"]
+    with capture_queries() as statements:
+        resp = client.get(f"/api/stories/{story_id}", headers=auth_headers)
+
+    assert len(resp.json()["chapters"]) == 3
+    chapter_selects = [s for s in statements if s.startswith("SELECT") and "FROM chapters" in s]
+    assert len(chapter_selects) == 1
+    assert "chapters.story_id IN" in chapter_selects[0]
+    # Script bodies aren't part of ChapterResponse, so they aren't fetched
+    assert "chapters.script_json" not in chapter_selects[0]
+    assert "chapters.enhanced_json" not in chapter_selects[0]
+    assert "chapters.line_audio_json" in chapter_selects[0]
+
+
+def test_get_story_etag_304_until_chapter_changes(client, db, auth_headers):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    url = f"/api/stories/{story_id}"
+
+    resp = client.get(url, headers=auth_headers)
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+    assert resp.headers["cache-control"] == "private, no-cache"
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    chapter = next(c for c in _get_story_by_slug(db, story_id).chapters if c.chapter_number == 1)
+    chapter.title = "Renamed"
+    db.commit()
+    resp = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+def test_get_chapter_script_etag_tracks_variant(client, db, auth_headers):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    chapter = next(c for c in _get_story_by_slug(db, story_id).chapters if c.chapter_number == 1)
+    chapter.script_json = '[{"type": "line", "text": "hi"}]'
+    chapter.enhanced_json = '[{"type": "line", "text": "hi", "emotion": "happy"}]'
+    db.commit()
+    url = f"/api/stories/{story_id}/chapters/1/script"
+
+    etag = client.get(url, headers=auth_headers).headers["etag"]
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+    resp = client.get(f"{url}?enhanced=false", headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json() == [{"type": "line", "text": "hi"}]
+
+
+def test_get_chapter_script_sends_stored_json_verbatim(client, db, auth_headers):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    stored = '[{"type": "line",  "text": "spacing kept"}]'
+    chapter = next(c for c in _get_story_by_slug(db, story_id).chapters if c.chapter_number == 1)
+    chapter.script_json = stored
+    db.commit()
+
+    resp = client.get(f"/api/stories/{story_id}/chapters/1/script", headers=auth_headers)
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.text == stored
+
+
+@pytest.mark.parametrize("script", [5, {"lines": []}, "text"])
+def test_update_chapter_script_stores_non_list_json(client, db, auth_headers, script):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    resp = client.put(f"/api/stories/{story_id}/chapters/1/script", json=script, headers=auth_headers)
+    assert resp.status_code == 200
+    chapter = next(c for c in _get_story_by_slug(db, story_id).chapters if c.chapter_number == 1)
+    assert chapter.speakers_json == "[]"
+
+
+def test_list_stories_rejects_offset_skip(client, auth_headers):
+    resp = client.get("/api/stories/?skip=20", headers=auth_headers)
+    assert resp.status_code == 400
+    assert "X-Next-Cursor" in resp.json()["detail"]
+
+
 def test_get_story_not_found(client, auth_headers):
     resp = client.get("/api/stories/999", headers=auth_headers)
     assert resp.status_code == 404
@@ -130,6 +277,20 @@ def test_update_story_visibility(client, auth_headers):
     data = resp.json()
     assert data["visibility"] == "public"
     assert data["share_code"] is not None
+    # token_urlsafe(16): 22 URL-safe characters, no hyphenated UUID
+    assert len(data["share_code"]) == 22
+
+
+def test_update_story_writes_with_returning(client, auth_headers, capture_queries):
+    url = f"/api/stories/{_create_story(client, auth_headers).json()['id']}"
+    with capture_queries() as statements:
+        resp = client.patch(url, json={"title": "Renamed"}, headers=auth_headers)
+
+    assert resp.json()["title"] == "Renamed"
+    assert len(resp.json()["chapters"]) == 2
+    story_statements = [sql for sql in statements if "FROM stories" in sql or "stories SET" in sql]
+    assert len(story_statements) == 1
+    assert story_statements[0].startswith("UPDATE stories") and "RETURNING" in story_statements[0]
 
 
 def test_update_story_invalid_visibility(client, auth_headers):
@@ -212,6 +373,101 @@ def test_generate_story_free_tier(mock_gen, client, auth_headers, db, test_user)
     assert test_user.free_stories_used == 1
 
 
+@patch("webapp.api.stories.generate_story")
+def test_generate_story_runs_on_generation_pool(mock_gen, client, auth_headers):
+    threads = []
+    mock_gen.side_effect = lambda **_: threads.append(threading.current_thread().name)
+    story_id = _create_story(client, auth_headers).json()["id"]
+
+    resp = client.post(
+        f"/api/stories/{story_id}/generate",
+        json={"title": "Test", "prompt": "Tell a story", "num_chapters": 2},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    # Not one of anyio's shared worker threads
+    assert len(threads) == 1
+    assert threads[0].startswith("generation")
+
+
+@patch("webapp.api.stories.generate_story")
+def test_generate_story_adds_only_missing_chapters(mock_gen, client, auth_headers, db):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    story.chapters[0].script_json = "[]"
+    db.commit()
+
+    resp = client.post(
+        f"/api/stories/{story_id}/generate",
+        json={"title": "Test", "prompt": "Tell a story", "num_chapters": 4},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+
+    db.expire_all()
+    chapters = db.query(Chapter).filter(Chapter.story_id == story.id).order_by(Chapter.chapter_number).all()
+    assert [(ch.chapter_number, ch.status, ch.script_json) for ch in chapters] == [
+        (n, "pending", None) for n in range(1, 5)
+    ]
+
+
+@patch("webapp.api.stories.generate_story")
+def test_generate_story_drops_extra_chapters_and_resets_the_rest(mock_gen, client, auth_headers, db):
+    story_id = _create_story(client, auth_headers, num_chapters=4).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    for ch in story.chapters:
+        ch.audio_path = f"{story.id}/ch{ch.chapter_number}.mp3"
+        ch.status = "completed"
+    db.commit()
+
+    resp = client.post(
+        f"/api/stories/{story_id}/generate",
+        json={"title": "Test", "prompt": "Tell a story", "num_chapters": 2},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+
+    db.expire_all()
+    chapters = db.query(Chapter).filter(Chapter.story_id == story.id).order_by(Chapter.chapter_number).all()
+    assert [(ch.chapter_number, ch.status, ch.audio_path) for ch in chapters] == [
+        (1, "pending", None),
+        (2, "pending", None),
+    ]
+
+
+@patch("webapp.api.stories.generate_story")
+def test_generate_story_repeat_request_joins_active_task(mock_gen, client, auth_headers, db, test_user):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    payload = {"title": "Test", "prompt": "Tell a story", "num_chapters": 2}
+
+    first = client.post(f"/api/stories/{story_id}/generate", json=payload, headers=auth_headers)
+    second = client.post(f"/api/stories/{story_id}/generate", json=payload, headers=auth_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["task_id"] == first.json()["task_id"]
+    assert mock_gen.call_count == 1
+    db.refresh(test_user)
+    assert test_user.free_stories_used == 1
+
+
+@patch("webapp.api.stories.generate_audio")
+def test_generate_audio_repeat_request_joins_active_task(mock_gen, client, auth_headers, db, test_user, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "platform-key")
+    story_id = _create_story(client, auth_headers).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    for ch in story.chapters:
+        ch.script_json = '[{"type": "line", "text": "hello"}]'
+    db.commit()
+
+    first = client.post(f"/api/stories/{story_id}/generate-audio", json={"story_id": story_id}, headers=auth_headers)
+    second = client.post(f"/api/stories/{story_id}/generate-audio", json={"story_id": story_id}, headers=auth_headers)
+
+    assert second.json()["task_id"] == first.json()["task_id"]
+    assert mock_gen.call_count == 1
+    db.refresh(test_user)
+    assert test_user.free_audio_used == 1
+
+
 @patch("webapp.api.stories.generate_story")
 def test_generate_story_free_tier_exhausted(mock_gen, client, auth_headers, db, test_user):
     test_user.free_stories_used = 20
@@ -324,6 +580,31 @@ def test_generate_audio_with_platform_key(mock_gen, client, auth_headers, db, mo
     assert resp.status_code == 200
 
 
+@patch("webapp.api.stories.generate_audio")
+def test_generate_audio_filters_chapters_in_sql(mock_gen, client, auth_headers, db, monkeypatch, capture_queries):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "platform-key")
+    story_id = _create_story(client, auth_headers, num_chapters=4).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    for ch in story.chapters:
+        if ch.chapter_number in (1, 3):
+            ch.script_json = '[{"type": "line", "text": "hello"}]'
+    chapter_ids = {ch.chapter_number: ch.id for ch in story.chapters}
+    db.commit()
+
+    url = f"/api/stories/{story_id}/generate-audio"
+    missing = client.post(url, json={"story_id": story_id, "chapter_numbers": [9]}, headers=auth_headers)
+    assert missing.status_code == 400
+    assert missing.json()["detail"] == "No chapters to generate"
+
+    with capture_queries() as statements:
+        resp = client.post(url, json={"story_id": story_id, "chapter_numbers": [3, 1]}, headers=auth_headers)
+
+    assert resp.status_code == 200
+    assert mock_gen.call_args.kwargs["chapter_ids"] == [chapter_ids[1], chapter_ids[3]]
+    # Scripts are checked for presence in SQL, never loaded
+    assert not any("chapters.script_json AS" in sql for sql in statements)
+
+
 def test_generate_audio_no_key(client, auth_headers, db, monkeypatch):
     monkeypatch.delenv("ELEVENLABS_API_KEY", raising=False)
 
@@ -372,6 +653,35 @@ def test_get_task_status(client, auth_headers):
     assert data["progress"] == 50
 
 
+def test_watch_task_pushes_updates_until_finished(client, auth_headers):
+    from webapp.services.task_store import get_task_backend
+
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    get_task_backend().update("test_task_ws", "running", 20, "Working")
+
+    with client.websocket_connect(f"/api/stories/tasks/test_task_ws/ws?token={token}") as ws:
+        assert ws.receive_json()["progress"] == 20
+        get_task_backend().update("test_task_ws", "completed", 100, "Done", result={"story_id": 1})
+        final = ws.receive_json()
+        assert final["status"] == "completed"
+        assert final["result"] == {"story_id": 1}
+        assert ws.receive()["code"] == 1000
+
+
+def test_watch_task_not_found(client, auth_headers):
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    with client.websocket_connect(f"/api/stories/tasks/missing/ws?token={token}") as ws:
+        assert ws.receive()["code"] == 4404
+
+
+def test_watch_task_rejects_bad_token(client):
+    from starlette.websockets import WebSocketDisconnect
+
+    with pytest.raises(WebSocketDisconnect) as exc_info, client.websocket_connect("/api/stories/tasks/t/ws?token=bad"):
+        pass
+    assert exc_info.value.code == 1008
+
+
 def test_get_task_status_not_found(client, auth_headers):
     resp = client.get("/api/stories/tasks/nonexistent", headers=auth_headers)
     assert resp.status_code == 404
@@ -434,6 +744,16 @@ def test_duplicate_story_not_owner(client, auth_headers, other_auth_headers):
     assert resp.status_code == 404
 
 
+def test_owned_story_dependency_shares_user_lookup(client, auth_headers, capture_queries):
+    url = f"/api/stories/{_create_story(client, auth_headers).json()['id']}/duplicate"
+    with capture_queries() as statements:
+        resp = client.post(url, headers=auth_headers)
+
+    assert resp.status_code == 201
+    # get_owned_story and the handler both take the current user; it is resolved once
+    assert sum("FROM users" in sql for sql in statements) == 1
+
+
 def test_duplicate_story_chapters_copied(client, auth_headers, db):
     create_resp = _create_story(client, auth_headers, num_chapters=3)
     story_id = create_resp.json()["id"]
@@ -466,6 +786,27 @@ def test_duplicate_story_chapters_copied(client, auth_headers, db):
         assert ch.audio_path is None
 
 
+def test_duplicate_story_copies_chapters_in_one_statement(client, auth_headers, db, capture_queries):
+    story_id = _create_story(client, auth_headers, num_chapters=3).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    next(c for c in story.chapters if c.chapter_number == 1).script_json = '[{"chapter": 1}]'
+    db.commit()
+
+    with capture_queries() as statements:
+        resp = client.post(f"/api/stories/{story_id}/duplicate", headers=auth_headers)
+
+    data = resp.json()
+    assert data["status"] == "completed"
+    assert [(c["chapter_number"], c["status"]) for c in data["chapters"]] == [
+        (1, "completed"),
+        (2, "pending"),
+        (3, "pending"),
+    ]
+    assert sum(s.startswith("INSERT INTO chapters") for s in statements) == 1
+    first_insert = next(i for i, s in enumerate(statements) if s.startswith("INSERT"))
+    assert not [s for s in statements[first_insert:] if s.startswith("SELECT")]
+
+
 def test_create_story_with_language_level(client, auth_headers):
     """Story creation with explicit language_level stores it correctly."""
     resp = _create_story(client, auth_headers, language_level=7)
@@ -555,6 +896,91 @@ def test_get_chapter_audio_other_user(client, auth_headers, other_auth_headers,
     assert resp.status_code == 404
 
 
+def test_download_combined_audio_streams_chapters_in_order(client, auth_headers, db):
+    create_resp = _create_story(client, auth_headers, num_chapters=3)
+    story_id = create_resp.json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    for ch in story.chapters:
+        if ch.chapter_number != 2:
+            ch.audio_path = f"{story.id}/ch{ch.chapter_number}.mp3"
+    db.commit()
+
+    with patch("webapp.api.stories.combined_audio_response", new=AsyncMock(return_value=Response(b"mp3"))) as combined:
+        resp = client.get(f"/api/stories/{story_id}/audio/combined", headers=auth_headers)
+
+    assert resp.status_code == 200
+    assert resp.content == b"mp3"
+    assert combined.await_args is not None
+    story_pk, chapters, filename = combined.await_args.args
+    assert story_pk == story.id
+    assert [ch.chapter_number for ch in chapters] == [1, 3]
+    assert filename == "Test Story.mp3"
+
+
+async def test_download_combined_audio_streams_through_app(client, auth_headers, db, tmp_path, monkeypatch):
+    """The full middleware stack forwards ffmpeg's first chunk before ffmpeg has finished."""
+    story_id = _create_story(client, auth_headers).json()["id"]
+    story = _get_story_by_slug(db, story_id)
+    files = {}
+    for ch in story.chapters:
+        ch.audio_path = f"{story.id}/ch{ch.chapter_number}.mp3"
+        files[ch.audio_path] = tmp_path / f"ch{ch.chapter_number}.mp3"
+        files[ch.audio_path].write_bytes(b"chapter")
+    db.commit()
+
+    @contextmanager
+    def get_path(key):
+        yield files.get(key)
+
+    monkeypatch.setattr("webapp.services.combined_audio.get_storage", lambda: MagicMock(get_path=get_path))
+    monkeypatch.setattr("webapp.services.combined_audio.COMBINED_AUDIO_CACHE_DIR", tmp_path / "cache")
+    # A buffered response would stall ffmpeg's output until this fires
+    monkeypatch.setattr("webapp.services.combined_audio.FFMPEG_TIMEOUT", 2)
+
+    stdout = asyncio.StreamReader()
+    stdout.feed_data(b"first-")
+    proc = MagicMock(stdout=stdout, returncode=None, wait=AsyncMock(return_value=0))
+    events = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        events.append(message)
+        if message["type"] == "http.response.start":
+            # ffmpeg only finishes once the client has started receiving
+            stdout.feed_data(b"rest")
+            stdout.feed_eof()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/api/stories/{story_id}/audio/combined",
+        "raw_path": f"/api/stories/{story_id}/audio/combined".encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"authorization", auth_headers["Authorization"].encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=proc)):
+        await app(scope, receive, send)
+
+    start, *bodies = events
+    assert start["status"] == 200
+    assert b"".join(m.get("body", b"") for m in bodies) == b"first-rest"
+    assert bodies[0]["body"] == b"first-"
+
+
+def test_download_combined_audio_without_audio_is_404(client, auth_headers):
+    story_id = _create_story(client, auth_headers).json()["id"]
+    resp = client.get(f"/api/stories/{story_id}/audio/combined", headers=auth_headers)
+    assert resp.status_code == 404
+
+
 def test_language_level_prompt_advanced():
     """Advanced level (>5) includes ADVANCED LEVEL in system prompt."""
     from generate_story import _build_language_level_instruction
@@ -565,3 +991,39 @@ def test_language_level_prompt_advanced():
     assert "70%" in instruction
     assert "ADVANCED LEVEL" in instruction
     assert "Spanish" in instruction
+
+
+def test_story_defaults_conditional_get(client, auth_headers):
+    resp = client.get("/api/stories/defaults", headers=auth_headers)
+    assert resp.status_code == 200
+    assert "num_chapters" in resp.json()
+    assert resp.headers["cache-control"] == "private, max-age=60"
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = client.get("/api/stories/defaults", headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+
+def test_voices_conditional_get(client, auth_headers, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test-key")
+    voices = [{"voice_id": "v1", "name": "One", "category": "", "labels": {}, "preview_url": ""}]
+    with (
+        patch("webapp.services.voices_cache.get_voices", new=AsyncMock(return_value=voices)),
+        patch("webapp.services.voices_cache.cache_version", return_value=42.0),
+    ):
+        resp = client.get("/api/stories/voices", headers=auth_headers)
+        assert resp.json() == voices
+        etag = resp.headers["etag"]
+
+        resp = client.get("/api/stories/voices", headers={**auth_headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+
+
+def test_voices_cold_cache_is_not_cached(client, auth_headers, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test-key")
+    with patch("webapp.services.voices_cache.get_voices", new=AsyncMock(return_value=[])):
+        resp = client.get("/api/stories/voices", headers=auth_headers)
+    assert resp.json() == []
+    assert resp.headers["cache-control"] == "no-store"
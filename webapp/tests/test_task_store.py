@@ -1,5 +1,6 @@
 """Tests for webapp/services/task_store.py — InMemory and Redis backends."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -86,6 +87,15 @@ class TestInMemoryTaskBackend:
         # Should be the most recently updated active task
         assert result["task_id"] in ("story_5_100", "story_5_200")
 
+    def test_find_active_for_story_by_kind(self):
+        be = _make_memory_backend()
+        be.update("story_5_100", "running", 10, "a")
+        be.update("audio_5_200", "pending", 0, "b")
+
+        assert be.find_active_for_story(5, "audio")["task_id"] == "audio_5_200"
+        assert be.find_active_for_story(5, "story")["task_id"] == "story_5_100"
+        assert be.find_active_for_story(6, "story") is None
+
     def test_find_active_for_story_none(self):
         be = _make_memory_backend()
         be.update("story_5_100", "completed", 100, "done")
@@ -113,6 +123,35 @@ class TestInMemoryTaskBackend:
         be = _make_memory_backend()
         assert be.cancel("nope") is False
 
+    async def test_watch_streams_updates_until_finished(self):
+        be = _make_memory_backend()
+        be.update("t1", "running", 10, "a")
+
+        seen = []
+        async for entry in be.watch("t1"):
+            seen.append((entry["status"], entry["progress"]))
+            if len(seen) == 1:
+                be.update("t1", "running", 60, "b")
+                be.update("t1", "completed", 100, "done")
+
+        assert seen == [("running", 10), ("running", 60), ("completed", 100)]
+        assert be._watchers == {}
+
+    async def test_watch_ends_on_cancel(self):
+        be = _make_memory_backend()
+        be.update("t1", "pending", 0, "queued")
+
+        statuses = []
+        async for entry in be.watch("t1"):
+            statuses.append(entry["status"])
+            be.cancel("t1")
+
+        assert statuses == ["pending", "cancelled"]
+
+    async def test_watch_missing_task_yields_nothing(self):
+        be = _make_memory_backend()
+        assert [entry async for entry in be.watch("nope")] == []
+
 
 # ---------------------------------------------------------------------------
 # RedisTaskBackend (with mock redis)
@@ -126,6 +165,11 @@ class FakeRedis:
         self._hashes = {}
         self._sets = {}
         self._ttls = {}
+        self.pipelines_executed = 0
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
 
     def hset(self, key, mapping=None, **kwargs):
         if key not in self._hashes:
@@ -151,6 +195,9 @@ class FakeRedis:
     def smembers(self, key):
         return self._sets.get(key, set())
 
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
     def srem(self, key, *values):
         s = self._sets.get(key)
         if s:
@@ -158,12 +205,33 @@ class FakeRedis:
                 s.discard(v)
 
 
+class FakePipeline:
+    """Queues FakeRedis calls and runs them on execute(), returning their results in order."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        self._redis.pipelines_executed += 1
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
 class TestRedisTaskBackend:
     @pytest.fixture()
     def backend(self):
         fake = FakeRedis()
         be = RedisTaskBackend.__new__(RedisTaskBackend)
         be._r = fake
+        be._recent = {}
+        be._indexed = {}
         return be
 
     def test_update_and_get(self, backend):
@@ -195,10 +263,58 @@ class TestRedisTaskBackend:
         assert result is not None
         assert result["task_id"] in ("story_5_100", "story_5_200")
 
+    def test_find_active_for_story_by_kind(self, backend):
+        backend.update("story_5_100", "running", 10, "a")
+        backend.update("audio_5_200", "pending", 0, "b")
+
+        assert backend.find_active_for_story(5, "audio")["task_id"] == "audio_5_200"
+        assert backend.find_active_for_story(5, "story")["task_id"] == "story_5_100"
+
     def test_find_active_for_story_none(self, backend):
         backend.update("story_5_100", "completed", 100, "done")
         assert backend.find_active_for_story(5) is None
 
+    def test_update_is_one_round_trip(self, backend):
+        backend.update("story_5_100", "running", 10, "a")
+        assert backend._r.pipelines_executed == 1
+        assert "story_5_100" in backend._r.smembers("story_tasks:5")
+
+    def test_update_reindexes_active_task_on_status_change(self, backend):
+        backend.update("story_5_100", "pending", 0, "queued")
+        backend._r._sets.clear()  # e.g. evicted
+        backend.update("story_5_100", "running", 10, "a")
+        assert backend._r.smembers("story_tasks:5") == {"story_5_100"}
+
+        backend._r._sets.clear()
+        backend._r._ttls.clear()
+        backend.update("story_5_100", "running", 20, "b")
+        # Progress writes skip the SADD but keep the set alive as long as the task
+        assert backend._r.smembers("story_tasks:5") == set()
+        assert backend._r._ttls["story_tasks:5"] == backend._r._ttls["task:story_5_100"]
+
+        backend.update("story_5_100", "completed", 100, "done")
+        assert "story_5_100" not in backend._indexed
+
+    def test_update_and_cancel_publish_entry(self, backend):
+        backend.update("t1", "running", 40, "busy", words_generated=10)
+        channel, entry = backend._r.published[-1]
+        assert channel == "task_updates:t1"
+        assert entry["progress"] == 40.0
+        assert entry["words_generated"] == 10
+        assert backend._r.pipelines_executed == 1
+
+        backend.cancel("t1")
+        assert backend._r.published[-1][1]["status"] == "cancelled"
+
+    def test_find_active_fetches_tasks_in_one_round_trip(self, backend):
+        for i in range(5):
+            backend.update(f"story_5_{i}", "completed", 100, "done")
+        backend.update("story_5_9", "running", 10, "a")
+        backend._r.pipelines_executed = 0
+
+        assert backend.find_active_for_story(5)["task_id"] == "story_5_9"
+        assert backend._r.pipelines_executed == 1
+
     def test_find_active_cleans_stale(self, backend):
         # Register a task in the story set, but don't create the hash
         backend._r.sadd("story_tasks:5", "story_5_expired")
@@ -209,6 +325,26 @@ class TestRedisTaskBackend:
         # The stale entry should have been cleaned up
         assert "story_5_expired" not in backend._r.smembers("story_tasks:5")
 
+    def test_get_reuses_recent_read(self, backend):
+        backend.update("t1", "running", 10, "a")
+        assert backend.get("t1")["progress"] == 10.0
+
+        # Written behind this backend's back: a poll inside the window still sees the cached copy
+        backend._r.hset("task:t1", mapping={"progress": "20"})
+        assert backend.get("t1")["progress"] == 10.0
+
+        backend._recent["t1"] = (0.0, backend._recent["t1"][1])  # window elapsed
+        assert backend.get("t1")["progress"] == 20.0
+
+    def test_update_and_cancel_drop_cached_read(self, backend):
+        backend.update("t1", "running", 10, "a")
+        backend.get("t1")
+        backend.update("t1", "running", 40, "b")
+        assert backend.get("t1")["progress"] == 40.0
+
+        assert backend.cancel("t1") is True
+        assert backend.get("t1")["status"] == "cancelled"
+
     def test_cancel_running_task(self, backend):
         backend.update("t1", "running", 50, "busy")
         assert backend.cancel("t1") is True
@@ -143,3 +143,57 @@ def test_copy_bundled_voices_config(tmp_path):
     else:
         # If running in CI without the bundled file, skip
         pytest.skip("No bundled voices_config.json found")
+
+
+def test_voice_config_speakers_in_chapter_order(client, db, auth_headers, test_user):
+    """Speakers are collected in chapter order, preferring the enhanced script."""
+    _pid, _slug = generate_mnemonic()
+    story = Story(user_id=test_user.id, title="Order", status="completed", public_id=_pid, slug=_slug)
+    db.add(story)
+    db.commit()
+
+    db.add_all(
+        [
+            Chapter(
+                story_id=story.id,
+                chapter_number=2,
+                script_json=json.dumps([{"speaker": "RYDER", "text": "Hi"}]),
+                status="completed",
+            ),
+            Chapter(
+                story_id=story.id,
+                chapter_number=1,
+                script_json=json.dumps([{"speaker": "IGNORED", "text": "Hi"}]),
+                enhanced_json=json.dumps([{"speaker": "NARRATOR", "text": "Hi"}, {"speaker": "RYDER", "text": "Yo"}]),
+                status="completed",
+            ),
+        ]
+    )
+    db.commit()
+
+    resp = client.get(f"/api/stories/{story.slug}/voice-config", headers=auth_headers)
+    assert resp.json()["speakers"] == ["NARRATOR", "RYDER"]
+
+
+def test_voice_config_reads_stored_speakers_after_script_edit(client, db, auth_headers, test_user):
+    """Editing a script records its speakers; the endpoint then uses that list, not the script."""
+    _pid, _slug = generate_mnemonic()
+    story = Story(user_id=test_user.id, title="Edit", status="completed", public_id=_pid, slug=_slug)
+    db.add(story)
+    db.commit()
+    db.add(Chapter(story_id=story.id, chapter_number=1, script_json="[]", status="completed"))
+    db.commit()
+
+    script = [{"speaker": "SKYE", "text": "Hi"}, {"type": "scene"}, {"speaker": "CHASE", "text": "Yo"}]
+    resp = client.put(f"/api/stories/{story.slug}/chapters/1/script", json=script, headers=auth_headers)
+    assert resp.status_code == 200
+
+    chapter = db.query(Chapter).filter(Chapter.story_id == story.id).one()
+    db.refresh(chapter)
+    assert json.loads(chapter.speakers_json) == ["SKYE", "CHASE"]
+
+    # Stored list wins over the script body
+    chapter.speakers_json = json.dumps(["MARSHALL"])
+    db.commit()
+    resp = client.get(f"/api/stories/{story.slug}/voice-config", headers=auth_headers)
+    assert resp.json()["speakers"] == ["MARSHALL"]
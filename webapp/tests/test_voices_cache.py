@@ -1,10 +1,13 @@
 """Tests for the ElevenLabs voices cache."""
 
+import asyncio
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import httpx
 import pytest
 
+from webapp.services import voices_cache
 from webapp.services.voices_cache import get_voices, reset_cache, warm_cache
 
 FAKE_VOICES_RESPONSE = {
@@ -40,18 +43,27 @@ def _set_api_key():
         yield
 
 
-def _mock_response(status_code=200, json_data=None):
-    mock = MagicMock()
-    mock.status_code = status_code
-    mock.json.return_value = json_data or FAKE_VOICES_RESPONSE
-    return mock
+def _upstream(status_code=200, json_data=None, calls=None):
+    """Point the shared client at a mock transport; record each request in ``calls``."""
+
+    async def handler(request):
+        if calls is not None:
+            calls.append(request)
+        await asyncio.sleep(0)
+        return httpx.Response(status_code, json=json_data or FAKE_VOICES_RESPONSE)
+
+    client = httpx.AsyncClient(base_url=voices_cache._ELEVENLABS_BASE_URL, transport=httpx.MockTransport(handler))
+    return patch.object(voices_cache, "_get_client", return_value=client)
 
 
 @pytest.mark.usefixtures("_set_api_key")
 def test_warm_cache_populates_cache():
-    with patch("webapp.services.voices_cache.http_requests.get", return_value=_mock_response()):
-        warm_cache()
-        voices = get_voices()
+    async def run():
+        await warm_cache()
+        return await get_voices()
+
+    with _upstream():
+        voices = asyncio.run(run())
     assert len(voices) == 2
     assert voices[0]["voice_id"] == "abc123"
     assert voices[1]["name"] == "Another Voice"
@@ -59,36 +71,59 @@ def test_warm_cache_populates_cache():
 
 @pytest.mark.usefixtures("_set_api_key")
 def test_cached_data_returned_on_second_call():
-    mock_get = MagicMock(return_value=_mock_response())
-    with patch("webapp.services.voices_cache.http_requests.get", mock_get):
-        warm_cache()
-        first = get_voices()
-        second = get_voices()
-
-    # warm_cache calls fetch once; get_voices may trigger background refresh
-    # but returns cached data immediately
+    calls: list[httpx.Request] = []
+
+    async def run():
+        await warm_cache()
+        return await get_voices(), await get_voices()
+
+    with _upstream(calls=calls):
+        first, second = asyncio.run(run())
+
     assert first == second
-    assert mock_get.call_count == 1  # Only warm_cache fetched
+    assert len(calls) == 1  # Only warm_cache fetched
+    assert str(calls[0].url) == "https://api.elevenlabs.io/v1/voices"
+    assert calls[0].headers["xi-api-key"] == "test-key"
 
 
 @pytest.mark.usefixtures("_set_api_key")
 def test_graceful_degradation_on_elevenlabs_error():
-    with patch("webapp.services.voices_cache.http_requests.get", return_value=_mock_response(status_code=500)):
-        warm_cache()
-        voices = get_voices()
+    async def run():
+        await warm_cache()
+        return await get_voices()
+
+    with _upstream(status_code=500):
+        voices = asyncio.run(run())
     assert voices == []
 
 
 @pytest.mark.usefixtures("_set_api_key")
 def test_empty_list_on_cold_call_when_elevenlabs_down():
-    with patch("webapp.services.voices_cache.http_requests.get", return_value=_mock_response(status_code=502)):
-        voices = get_voices()
+    with _upstream(status_code=502):
+        voices = asyncio.run(get_voices())
     assert voices == []
 
 
 def test_no_api_key_returns_empty():
+    async def run():
+        await warm_cache()
+        return await get_voices()
+
     with patch.dict(os.environ, {}, clear=False):
         os.environ.pop("ELEVENLABS_API_KEY", None)
-        warm_cache()
-        voices = get_voices()
+        voices = asyncio.run(run())
     assert voices == []
+
+
+@pytest.mark.usefixtures("_set_api_key")
+def test_concurrent_cold_calls_share_one_fetch():
+    calls: list[httpx.Request] = []
+
+    async def run():
+        return await asyncio.gather(get_voices(), get_voices(), get_voices())
+
+    with _upstream(calls=calls):
+        results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [len(r) for r in results] == [2, 2, 2]
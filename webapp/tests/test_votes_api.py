@@ -1,6 +1,6 @@
 """Tests for webapp/api/votes.py"""
 
-from webapp.models.database import Story
+from webapp.models.database import Story, Vote
 from webapp.services.mnemonic import generate as generate_mnemonic
 
 
@@ -105,6 +105,28 @@ def test_remove_vote(client, db, test_user, other_user, other_auth_headers):
     assert data["user_vote"] is None
 
 
+def test_repeat_vote_is_not_counted_twice(client, db, test_user, other_user, other_auth_headers):
+    story = _create_public_story(db, test_user)
+    url = f"/api/votes/stories/{story.slug}"
+
+    client.post(url, json={"vote_type": "up"}, headers=other_auth_headers)
+    data = client.post(url, json={"vote_type": "up"}, headers=other_auth_headers).json()
+    assert data["upvotes"] == 1
+    assert data["downvotes"] == 0
+
+    vote = db.query(Vote).filter(Vote.story_id == story.id).one()
+    assert vote.vote_type == "up"
+    assert vote.created_at is not None
+
+
+def test_remove_missing_vote_is_noop(client, db, test_user, other_user, other_auth_headers):
+    story = _create_public_story(db, test_user)
+
+    resp = client.post(f"/api/votes/stories/{story.slug}", json={"vote_type": None}, headers=other_auth_headers)
+    assert resp.status_code == 200
+    assert resp.json() == {"upvotes": 0, "downvotes": 0, "user_vote": None}
+
+
 def test_vote_own_story(client, db, test_user, auth_headers):
     story = _create_public_story(db, test_user)
 
@@ -2,7 +2,7 @@
 
 import json
 
-from webapp.models.database import Chapter, Story
+from webapp.models.database import Chapter, Follow, Story, World
 from webapp.services.mnemonic import generate as generate_mnemonic
 
 
@@ -43,17 +43,77 @@ class TestWorldCRUD:
         assert "Test World" in names
         assert "Built-in World" in names
 
+    def test_list_worlds_visibility_rules(self, client, db, auth_headers, test_user, other_user, third_user):
+        db.add(Follow(follower_id=test_user.id, following_id=other_user.id))
+        db.add_all(
+            [
+                World(user_id=test_user.id, name="Own Public", visibility="public"),
+                World(user_id=other_user.id, name="Followed Followers", visibility="followers"),
+                World(user_id=other_user.id, name="Followed Private", visibility="private"),
+                World(user_id=third_user.id, name="Unfollowed Followers", visibility="followers"),
+            ]
+        )
+        db.commit()
+
+        names = [w["name"] for w in client.get("/api/worlds/", headers=auth_headers).json()]
+        # An own public world matches two rules but is listed once
+        assert sorted(names) == ["Followed Followers", "Own Public"]
+
     def test_list_worlds_excludes_other_private(self, client, other_auth_headers, test_world):
         resp = client.get("/api/worlds/", headers=other_auth_headers)
         assert resp.status_code == 200
         names = {w["name"] for w in resp.json()}
         assert "Test World" not in names
 
+    def test_list_worlds_story_count_in_one_query(
+        self, client, db, auth_headers, test_user, test_world, capture_queries
+    ):
+        for _ in range(3):
+            _pid, _slug = generate_mnemonic()
+            db.add(Story(user_id=test_user.id, world_id=test_world.id, title="S", public_id=_pid, slug=_slug))
+        db.commit()
+
+        with capture_queries() as statements:
+            resp = client.get("/api/worlds/", headers=auth_headers)
+
+        counts = {w["name"]: w["story_count"] for w in resp.json()}
+        assert counts["Test World"] == 3
+        # Counts and owners come with the world rows — no per-world lazy loads
+        assert sum("FROM worlds" in s for s in statements) == 1
+        assert not any(s.startswith("SELECT stories") for s in statements)
+
     def test_get_world_owner(self, client, auth_headers, test_world):
         resp = client.get(f"/api/worlds/{test_world.id}", headers=auth_headers)
         assert resp.status_code == 200
         assert resp.json()["name"] == "Test World"
 
+    def test_get_world_loads_count_and_owner_with_world(
+        self, client, db, auth_headers, test_user, test_world, capture_queries
+    ):
+        _pid, _slug = generate_mnemonic()
+        db.add(Story(user_id=test_user.id, world_id=test_world.id, title="S", public_id=_pid, slug=_slug))
+        url = f"/api/worlds/{test_world.id}"
+        db.commit()
+        with capture_queries() as statements:
+            resp = client.get(url, headers=auth_headers)
+        assert resp.json()["story_count"] == 1
+        assert resp.json()["owner_name"] == "testuser"
+        # The current-user lookup, then the world with its count and owner — nothing lazy
+        assert len(statements) == 2
+        assert "FROM worlds" in statements[1]
+
+    def test_get_world_etag_tracks_story_count(self, client, db, auth_headers, test_user, test_world):
+        url = f"/api/worlds/{test_world.id}"
+        etag = client.get(url, headers=auth_headers).headers["etag"]
+        assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+        _pid, _slug = generate_mnemonic()
+        db.add(Story(user_id=test_user.id, world_id=test_world.id, title="S", public_id=_pid, slug=_slug))
+        db.commit()
+        resp = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["story_count"] == 1
+
     def test_get_world_not_found(self, client, auth_headers):
         resp = client.get("/api/worlds/9999", headers=auth_headers)
         assert resp.status_code == 404
@@ -79,6 +139,22 @@ class TestWorldCRUD:
         assert data["visibility"] == "public"
         assert data["share_code"] is not None
 
+    def test_update_world_writes_with_returning(self, client, auth_headers, test_world, capture_queries):
+        url = f"/api/worlds/{test_world.id}"
+        with capture_queries() as statements:
+            resp = client.patch(url, json={"description": "New"}, headers=auth_headers)
+
+        assert resp.json()["description"] == "New"
+        world_statements = [sql for sql in statements if "worlds" in sql and not sql.startswith("SELECT count")]
+        assert len(world_statements) == 1
+        assert world_statements[0].startswith("UPDATE worlds") and "RETURNING" in world_statements[0]
+
+    def test_update_world_keeps_existing_share_code(self, client, auth_headers, test_world):
+        url = f"/api/worlds/{test_world.id}"
+        first = client.patch(url, json={"visibility": "public"}, headers=auth_headers).json()["share_code"]
+        again = client.patch(url, json={"visibility": "link_only"}, headers=auth_headers).json()["share_code"]
+        assert again == first
+
     def test_update_world_not_owner(self, client, other_auth_headers, test_world):
         resp = client.patch(
             f"/api/worlds/{test_world.id}",
@@ -139,6 +215,15 @@ class TestWorldPublicEndpoints:
         names = {w["name"] for w in resp.json()}
         assert "Built-in World" in names
 
+    def test_list_public_worlds_story_count(self, client, db, test_user, builtin_world):
+        for _ in range(2):
+            _pid, _slug = generate_mnemonic()
+            db.add(Story(user_id=test_user.id, world_id=builtin_world.id, title="S", public_id=_pid, slug=_slug))
+        db.commit()
+        resp = client.get("/api/public/worlds")
+        counts = {w["name"]: w["story_count"] for w in resp.json()}
+        assert counts["Built-in World"] == 2
+
     def test_list_public_worlds_excludes_private(self, client, test_world):
         resp = client.get("/api/public/worlds")
         assert resp.status_code == 200
@@ -150,6 +235,21 @@ class TestWorldPublicEndpoints:
         assert resp.status_code == 200
         assert resp.json()["name"] == "Built-in World"
 
+    def test_get_public_world_etag_tracks_story_count(self, client, db, test_user, builtin_world):
+        url = f"/api/public/worlds/{builtin_world.id}"
+        etag = client.get(url).headers["etag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        _pid, _slug = generate_mnemonic()
+        db.add(Story(user_id=test_user.id, world_id=builtin_world.id, title="S", public_id=_pid, slug=_slug))
+        db.commit()
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["story_count"] == 1
+
+    def test_list_public_worlds_cache_control(self, client, builtin_world):
+        assert client.get("/api/public/worlds").headers["cache-control"] == "public, max-age=300"
+
     def test_get_private_world_404(self, client, test_world):
         resp = client.get(f"/api/public/worlds/{test_world.id}")
         assert resp.status_code == 404